@@ -0,0 +1,677 @@
+#Micro-benchmarks for the server hot path.
+#The remoteApi C entry points are replaced by in-process fakes, so no running V-REP is needed.
+#usage: python benchmark.py [benchmark name ...]
+
+import io
+import os
+import contextlib
+import sys
+import time
+import struct
+import subprocess
+import tempfile
+import ctypes as ct
+import numpy as np
+
+import vrep
+
+
+def measure(fn, repeat=200):
+    fn()  # warm up
+    start = time.perf_counter()
+    for i in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def report(name, seconds):
+    print("%-40s %10.1f us" % (name, seconds * 1e6))
+
+
+def fake_vision_sensor(resolution_x, resolution_y):
+    pixels = (ct.c_byte * (resolution_x * resolution_y * 3))()
+    ct.memmove(pixels, np.random.randint(0, 256, len(pixels), dtype=np.uint8).tobytes(), len(pixels))
+
+    def c_GetVisionSensorImage(clientID, sensorHandle, resolution, c_image, options, operationMode):
+        resolution[0] = resolution_x
+        resolution[1] = resolution_y
+        c_image._obj.contents = ct.c_byte.from_buffer(pixels)
+        return vrep.simx_return_ok
+
+    return c_GetVisionSensorImage
+
+
+def bench_camera():
+    for resolution_x, resolution_y in [(32, 32), (128, 128), (256, 256)]:
+        vrep.c_GetVisionSensorImage = fake_vision_sensor(resolution_x, resolution_y)
+        ret, reso, image_list = vrep.simxGetVisionSensorImage(0, 0, 0, vrep.simx_opmode_buffer)
+        ret, reso, image_array = vrep.simxGetVisionSensorImageNumpy(0, 0, 0, vrep.simx_opmode_buffer)
+        assert image_array.shape == (resolution_y, resolution_x, 3)
+        assert np.array_equal(image_array.reshape(-1), np.array(image_list, dtype=np.int8).view(np.uint8))
+
+        def list_frame():
+            ret, reso, image = vrep.simxGetVisionSensorImage(0, 0, 0, vrep.simx_opmode_buffer)
+            return np.array(image, dtype=np.int8).view(np.uint8).tobytes()
+
+        def numpy_frame():
+            ret, reso, image = vrep.simxGetVisionSensorImageNumpy(0, 0, 0, vrep.simx_opmode_buffer)
+            return image.tobytes()
+
+        size = "%dx%d" % (resolution_x, resolution_y)
+        report("camera frame list  " + size, measure(list_frame, 20))
+        report("camera frame numpy " + size, measure(numpy_frame, 200))
+
+
+def fake_script_function(out_ints, out_floats, out_strings, out_buffer):
+    c_ints = (ct.c_int * (len(out_ints) + 1))(*out_ints)
+    c_floats = (ct.c_float * (len(out_floats) + 1))(*out_floats)
+    blob = b''.join(a.encode('utf-8') + b'\0' for a in out_strings)
+    c_strings = ct.create_string_buffer(blob, len(blob) + 1)
+    c_buffer = (ct.c_ubyte * (len(out_buffer) + 1))(*out_buffer)
+
+    def c_CallScriptFunction(clientID, scriptDescription, options, functionName, inIntCount, inInts, inFloatCount,
+                             inFloats, inStringCount, inStrings, inBufferSize, inBuffer, intDataC, intDataP,
+                             floatDataC, floatDataP, stringDataC, stringDataP, bufferS, bufferP, operationMode):
+        intDataC._obj.value = len(out_ints)
+        intDataP._obj.contents = ct.c_int.from_buffer(c_ints)
+        floatDataC._obj.value = len(out_floats)
+        floatDataP._obj.contents = ct.c_float.from_buffer(c_floats)
+        stringDataC._obj.value = len(out_strings)
+        stringDataP._obj.contents = ct.c_char.from_buffer(c_strings)
+        bufferS._obj.value = len(out_buffer)
+        bufferP._obj.contents = ct.c_ubyte.from_buffer(c_buffer)
+        return vrep.simx_return_ok
+
+    return c_CallScriptFunction
+
+
+def legacy_script_function_decode(intDataC, intDataP, floatDataC, floatDataP, stringDataC, stringDataP, bufferS,
+                                  bufferP):
+    # the per-element decoder simxCallScriptFunction used before the bulk copies
+    intDataOut = []
+    floatDataOut = []
+    stringDataOut = []
+    bufferOut = bytearray()
+    for i in range(intDataC.value):
+        intDataOut.append(intDataP[i])
+    for i in range(floatDataC.value):
+        floatDataOut.append(floatDataP[i])
+    s = 0
+    for i in range(stringDataC.value):
+        a = bytearray()
+        while stringDataP[s] != b'\0':
+            a.append(int.from_bytes(stringDataP[s], 'big'))
+            s += 1
+        s += 1
+        stringDataOut.append(str(a, 'utf-8'))
+    for i in range(bufferS.value):
+        bufferOut.append(bufferP[i])
+    return intDataOut, floatDataOut, stringDataOut, bufferOut
+
+
+def bench_script_call():
+    for size in [1, 16, 1024]:
+        out_ints = list(range(size))
+        out_floats = [i * 0.5 for i in range(size)]
+        out_strings = ['team_%d' % i for i in range(size)]
+        out_buffer = bytes(range(256)) * (size // 256 + 1)
+        fake = fake_script_function(out_ints, out_floats, out_strings, out_buffer)
+        vrep.c_CallScriptFunction = fake
+
+        outputs = [ct.c_int(), ct.POINTER(ct.c_int)(), ct.c_int(), ct.POINTER(ct.c_float)(), ct.c_int(),
+                   ct.POINTER(ct.c_char)(), ct.c_int(), ct.POINTER(ct.c_ubyte)()]
+        fake(0, None, 0, None, 0, None, 0, None, 0, None, 0, None, *[ct.byref(o) for o in outputs], 0)
+
+        ret, ints, floats, strings, buffer = vrep.simxCallScriptFunction(0, 'Game_manager',
+                                                                         vrep.sim_scripttype_childscript,
+                                                                         'remote_get_sim_status', [], [], [],
+                                                                         bytearray(), vrep.simx_opmode_blocking)
+        assert (ints, floats, strings, buffer) == legacy_script_function_decode(*outputs)
+        assert strings == out_strings and buffer == bytearray(out_buffer)
+
+        report("script call decode legacy %d" % size, measure(lambda: legacy_script_function_decode(*outputs), 50))
+        report("script call decode bulk   %d" % size,
+               measure(lambda: (outputs[1][:outputs[0].value], outputs[3][:outputs[2].value],
+                                vrep._unpackStrings(outputs[5], outputs[4].value),
+                                vrep._unpackBuffer(outputs[7], outputs[6].value)), 500))
+        report("simxCallScriptFunction    %d" % size,
+               measure(lambda: vrep.simxCallScriptFunction(0, 'Game_manager', vrep.sim_scripttype_childscript,
+                                                           'remote_get_sim_status', [1], [], [], bytearray(),
+                                                           vrep.simx_opmode_blocking), 500))
+
+
+def bench_prepared_call():
+    received = []
+    fake = fake_script_function([1], [], [], b'')
+
+    def c_CallScriptFunction(clientID, scriptDescription, options, functionName, inIntCount, inInts, inFloatCount,
+                             inFloats, inStringCount, inStrings, inBufferSize, inBuffer, *outputs):
+        received[:] = [functionName, inInts[:inIntCount], ct.string_at(inStrings)]
+        return fake(clientID, scriptDescription, options, functionName, inIntCount, inInts, inFloatCount, inFloats,
+                    inStringCount, inStrings, inBufferSize, inBuffer, *outputs)
+
+    vrep.c_CallScriptFunction = c_CallScriptFunction
+    score_call = vrep.PreparedScriptFunction('Game_manager', vrep.sim_scripttype_childscript, 'remote_set_score',
+                                             intCount=1)
+    for team_score in ['12.5', '-3.0']:
+        assert score_call(0, [7], [], [team_score], bytearray(), vrep.simx_opmode_oneshot) == \
+            vrep.simxCallScriptFunction(0, 'Game_manager', vrep.sim_scripttype_childscript, 'remote_set_score', [7],
+                                        [], [team_score], bytearray(), vrep.simx_opmode_oneshot)
+        score_call(0, [7], [], [team_score], bytearray(), vrep.simx_opmode_oneshot)
+        assert received[:2] == [b'remote_set_score', [7]]
+        assert received[2] == team_score.encode('utf-8')
+
+    report("simxCallScriptFunction set_score",
+           measure(lambda: vrep.simxCallScriptFunction(0, 'Game_manager', vrep.sim_scripttype_childscript,
+                                                       'remote_set_score', [7], [], ['12.5'], bytearray(),
+                                                       vrep.simx_opmode_oneshot), 2000))
+    report("PreparedScriptFunction set_score",
+           measure(lambda: score_call(0, [7], [], ['12.5'], bytearray(), vrep.simx_opmode_oneshot), 2000))
+
+
+def bench_import():
+    # numpy is imported first, it is a dependency of every server module anyway
+    code = ("import time, numpy; start = time.perf_counter(); import %s; imported = time.perf_counter(); "
+            "import vrep; vrep.simxBindRemoteApi(); "
+            "print(imported - start, time.perf_counter() - imported)")
+    for module in ['vrep', 'robotApi']:
+        timings = [subprocess.check_output([sys.executable, '-c', code % module]).split() for i in range(5)]
+        report("import %s" % module, min(float(t[0]) for t in timings))
+    report("bind remote API after import", min(float(t[1]) for t in timings))
+
+
+def legacy_pack(values, fmt):
+    # the per-value struct packing simxPackInts and simxPackFloats used before the numpy path
+    s = bytes()
+    for i in range(len(values)):
+        s = s + struct.pack(fmt, values[i])
+    return bytearray(s)
+
+
+def legacy_unpack(packed, fmt):
+    b = []
+    for i in range(int(len(packed) / 4)):
+        b.append(struct.unpack(fmt, packed[4 * i:4 * (i + 1)])[0])
+    return b
+
+
+def bench_pack():
+    size = 10000
+    ints = np.random.randint(-2 ** 31, 2 ** 31, size).tolist()
+    floats = np.random.uniform(-10, 10, size).astype(np.float32).tolist()
+    packed_ints = legacy_pack(ints, '<i')
+    packed_floats = legacy_pack(floats, '<f')
+    assert vrep.simxPackInts(ints) == packed_ints and vrep.simxPackFloats(floats) == packed_floats
+    assert vrep.simxUnpackInts(packed_ints) == ints and vrep.simxUnpackFloats(packed_floats) == floats
+    assert np.array_equal(vrep.simxUnpackFloatsNumpy(packed_floats), floats)
+
+    int_array = np.array(ints, dtype=np.int32)
+    float_array = np.array(floats, dtype=np.float32)
+    report("pack 10k ints legacy", measure(lambda: legacy_pack(ints, '<i'), 5))
+    report("pack 10k ints list", measure(lambda: vrep.simxPackInts(ints), 50))
+    report("pack 10k ints numpy", measure(lambda: vrep.simxPackInts(int_array), 500))
+    report("unpack 10k ints legacy", measure(lambda: legacy_unpack(packed_ints, '<i'), 5))
+    report("unpack 10k ints list", measure(lambda: vrep.simxUnpackInts(packed_ints), 50))
+    report("unpack 10k ints numpy", measure(lambda: vrep.simxUnpackIntsNumpy(packed_ints), 500))
+    report("pack 10k floats legacy", measure(lambda: legacy_pack(floats, '<f'), 5))
+    report("pack 10k floats list", measure(lambda: vrep.simxPackFloats(floats), 50))
+    report("pack 10k floats numpy", measure(lambda: vrep.simxPackFloats(float_array), 500))
+    report("unpack 10k floats legacy", measure(lambda: legacy_unpack(packed_floats, '<f'), 5))
+    report("unpack 10k floats list", measure(lambda: vrep.simxUnpackFloats(packed_floats), 50))
+    report("unpack 10k floats numpy", measure(lambda: vrep.simxUnpackFloatsNumpy(packed_floats), 500))
+
+
+class FakeUnaryCall:
+    # a unary stub method: call it to block, or call .future to get the reply on a worker thread like grpc does
+    def __init__(self, respond):
+        self.respond = respond
+        self.executor = None
+
+    def __call__(self, request, timeout=None):
+        return self.respond(request)
+
+    def future(self, request, timeout=None):
+        if self.executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self.executor = ThreadPoolExecutor(max_workers=1)
+        return self.executor.submit(self.respond, request)
+
+
+class FakeStub:
+    # answers Action like a player that drives forward, turns and reports a victim now and then
+    def __init__(self, simplus_pb2, think_time=0.0):
+        self.simplus_pb2 = simplus_pb2
+        self.think_time = think_time
+        self.cycle = 0
+        self.Action = FakeUnaryCall(self.action)
+
+    def action(self, observations):
+        if self.think_time > 0:
+            time.sleep(self.think_time)
+        self.cycle += 1
+        pb = self.simplus_pb2
+        actions = [pb.Action(x=0.0, y=0.0, z=0.0, type='find_victim')] if self.cycle % 50 == 0 else []
+        return pb.Commands(commands=[pb.Command(id=0, linear=0.05, angular=0.1 * (self.cycle % 3 - 1),
+                                                LED=['red', 'green', 'blue', ''][self.cycle % 4], actions=actions)])
+
+
+def mock_game(latency_ms=0.0, robots=None):
+    os.environ['SIMPLUS_REMOTE_API'] = 'mock'
+    import robotApi
+    import server
+    import vrepMock
+    assert robotApi.vrep is vrepMock
+    vrepMock.configure(latency_ms=latency_ms)
+    if robots is not None:
+        scene = vrepMock.MockScene(robots=robots)
+        for config_file in ['serverconfig.txt', 'trapconfig.txt']:
+            scene.add_config_objects(config_file)
+        scene.step()
+        vrepMock.configure(new_scene=scene)
+    vapi = robotApi.VrepApi()
+    return server, vapi.init_robotApi(), vapi.init_serverApi()
+
+
+def bench_game_loop():
+    for synchronous in [False, True]:
+        for latency_ms in [0.0, 1.0]:
+            server, ra, sa = mock_game(latency_ms)
+            ra.precompute()
+            sa.setSynchronous(synchronous)
+            stub = FakeStub(server.simplus_pb2)
+            cycles = 200
+            start = time.perf_counter()
+            server.play(ra, sa, stub, cycles, 0, synchronous=synchronous)
+            report("game loop cycle, %.0f ms latency, synchronous=%s" % (latency_ms, synchronous),
+                   (time.perf_counter() - start) / cycles)
+            sa.setSynchronous(False)
+
+
+def bench_pipeline():
+    # cycle period of the serial and the pipelined loop for a player that thinks 2 ms per cycle
+    for synchronous in [False, True]:
+        for latency_ms in [0.0, 1.0]:
+            for game in ['play', 'play_pipelined']:
+                server, ra, sa = mock_game(latency_ms)
+                ra.precompute()
+                sa.setSynchronous(synchronous)
+                stub = FakeStub(server.simplus_pb2, think_time=0.002)
+                cycles = 100
+                with contextlib.redirect_stdout(io.StringIO()):
+                    start = time.perf_counter()
+                    i, team_score = getattr(server, game)(ra, sa, stub, cycles, 0, synchronous=synchronous)
+                    elapsed = time.perf_counter() - start
+                assert stub.cycle == cycles and i == cycles - 1
+                report("%s, %.0f ms latency, sync=%s" % (game, latency_ms, synchronous), elapsed / cycles)
+                sa.setSynchronous(False)
+
+
+class FakeAioStub:
+    # grpc.aio flavour of FakeStub: Action returns an awaitable that fails with DEADLINE_EXCEEDED when the
+    # player thinks longer than the timeout. every stall_every-th reply takes stall_time
+    def __init__(self, simplus_pb2, think_time=0.0, stall_every=0, stall_time=0.0):
+        self.player = FakeStub(simplus_pb2)
+        self.think_time = think_time
+        self.stall_every = stall_every
+        self.stall_time = stall_time
+        self.calls = 0
+
+    async def think(self, observations):
+        import asyncio
+        self.calls += 1
+        stalled = self.stall_every > 0 and self.calls % self.stall_every == 0
+        await asyncio.sleep(self.stall_time if stalled else self.think_time)
+        return self.player.action(observations)
+
+    async def Action(self, observations, timeout=None):
+        import asyncio
+        import grpc
+        try:
+            return await asyncio.wait_for(self.think(observations), timeout)
+        except asyncio.TimeoutError:
+            raise grpc.aio.AioRpcError(grpc.StatusCode.DEADLINE_EXCEEDED, grpc.aio.Metadata(), grpc.aio.Metadata())
+
+
+def bench_asyncio():
+    # a player that thinks 2 ms and stalls for 100 ms every 20th cycle, with a 20 ms cycle deadline
+    import asyncio
+    cycles = 100
+    for latency_ms in [0.0, 1.0]:
+        server, ra, sa = mock_game(latency_ms)
+        ra.precompute()
+        stub = FakeAioStub(server.simplus_pb2, think_time=0.002, stall_every=20, stall_time=0.1)
+        with contextlib.redirect_stdout(io.StringIO()) as log:
+            start = time.perf_counter()
+            i, team_score = asyncio.run(server.play_async(ra, sa, stub, cycles, 0, cycle_deadline=0.02))
+            elapsed = time.perf_counter() - start
+        assert stub.calls == cycles and "late responses = %d" % (cycles // 20) in log.getvalue()
+        report("play_async, %.0f ms latency" % latency_ms, elapsed / cycles)
+        # the blocking loop waits for every stalled reply
+        server, ra, sa = mock_game(latency_ms)
+        ra.precompute()
+        stub.calls = 0
+        blocking = FakeStub(server.simplus_pb2)
+        blocking.Action = FakeUnaryCall(lambda observations: asyncio.run(stub.think(observations)))
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            server.play(ra, sa, blocking, cycles, 0)
+            elapsed = time.perf_counter() - start
+        report("play, %.0f ms latency" % latency_ms, elapsed / cycles)
+
+
+def bench_scheduler():
+    # pacing on a simulated clock: 2 ms cycles at 100 Hz with one 35 ms overrun, which skips two deadlines
+    os.environ['SIMPLUS_REMOTE_API'] = 'mock'
+    import server
+    now = [0.0]
+
+    def sleep(seconds):
+        now[0] += seconds
+
+    scheduler = server.CycleScheduler(100, clock=lambda: now[0], sleep=sleep)
+    starts = []
+    for i in range(10):
+        scheduler.wait()
+        starts.append(now[0])
+        now[0] += 0.035 if i == 4 else 0.002
+    assert scheduler.skipped == 2 and len([s for s in scheduler.slack if s < 0]) == 1
+    assert np.allclose(np.diff(starts), [0.01] * 4 + [0.035, 0.005] + [0.01] * 3)
+    # wall clock pacing of the mock game loop, keeping hold of the scheduler play creates
+    original = server.CycleScheduler
+    for rate in [100, 200, 500]:
+        server, ra, sa = mock_game()
+        ra.precompute()
+        stub = FakeStub(server.simplus_pb2)
+        scheduler = original(rate)
+        server.CycleScheduler = lambda rate, scheduler=scheduler: scheduler
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                server.play(ra, sa, stub, 200, 0, rate=rate)
+        finally:
+            server.CycleScheduler = original
+        summary = scheduler.summary()
+        print("%-40s %s, skipped %d" % ("cycle period ms at %d Hz" % rate,
+                                        " ".join("%s=%.2f" % item for item in summary["period_ms"].items()),
+                                        summary["skipped"]))
+
+
+def bench_metrics():
+    # cost of timing every phase of the serial loop, then the summary and the Prometheus endpoint of one match
+    import urllib.request
+    from simplus_metrics import CycleMetrics
+    cycles = 300
+    for instrumented in [False, True, False, True]:
+        server, ra, sa = mock_game()
+        ra.precompute()
+        metrics = CycleMetrics() if instrumented else server.NULL_METRICS
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            server.play(ra, sa, FakeStub(server.simplus_pb2), cycles, 0, metrics=metrics)
+            elapsed = time.perf_counter() - start
+        report("game loop cycle, metrics=%s" % instrumented, elapsed / cycles)
+    laps = CycleMetrics()
+    laps.start()
+    report("metrics lap", measure(lambda: laps.lap('pose'), repeat=10000))
+    metrics.report()
+    port = metrics.serve(0)
+    try:
+        text = urllib.request.urlopen("http://localhost:%d/metrics" % port).read().decode('utf-8')
+    finally:
+        metrics.shutdown()
+    assert 'simplus_cycle_seconds_count %d' % cycles in text
+    assert 'simplus_cycle_phase_seconds_bucket{phase="camera",le="+Inf"} %d' % cycles in text
+    print("%-40s %10d B" % ("prometheus text", len(text)))
+
+
+def bench_observations():
+    server, ra, sa = mock_game()
+    ra.precompute()
+    ra.startSnapshot()  # both sources on one robot, to compare them
+    sa.get_status(isOneshot=False)
+    server.get_observations(ra, 0)
+    assert server.get_observations(ra, 0, snapshot=True) == server.get_observations(ra, 0)
+    for snapshot in [False, True]:
+        report("observations, snapshot=%s" % snapshot,
+               measure(lambda: server.get_observations(ra, 0, snapshot=snapshot), repeat=2000))
+
+
+def bench_actuators():
+    # remote API writes per cycle for a player that changes its command every 10 cycles
+    server, ra, sa = mock_game()
+    import vrepMock
+    calls = []
+
+    def counting(name, original):
+        def counted(*args, **kwargs):
+            calls.append(name)
+            return original(*args, **kwargs)
+        counted.original = original
+        return counted
+
+    for name in ['simxSetJointTargetVelocity', 'simxCallScriptFunction', 'simxPauseCommunication']:
+        setattr(vrepMock, name, counting(name, getattr(vrepMock, name)))
+    pb = server.simplus_pb2
+    cycles = 200
+    try:
+        start = time.perf_counter()
+        for i in range(cycles):
+            command = pb.Command(id=0, linear=0.05, angular=0.1 * (i // 10 % 3 - 1), LED=['red', 'green'][i // 20 % 2])
+            server.apply_commands(ra, sa, pb.Commands(commands=[command]))
+        elapsed = time.perf_counter() - start
+    finally:
+        for name in ['simxSetJointTargetVelocity', 'simxCallScriptFunction', 'simxPauseCommunication']:
+            setattr(vrepMock, name, getattr(vrepMock, name).original)
+    report("apply_commands", elapsed / cycles)
+    print("%-40s %10.2f" % ("remote API calls per cycle", len(calls) / float(cycles)))
+
+
+def bench_colors():
+    server, ra, sa = mock_game()
+    ra.precompute()
+    ra.color_from_aux = True
+    ra.precompute()
+    sa.get_status(isOneshot=False)
+    aux = ra.getColorSensors()
+    ra.color_from_aux = False
+    assert (aux == ra.getColorSensors()).all()
+    # the mock computes the aux packet in python, so compare what crosses the wire instead of the time
+    for resolution in [4, 16, 64]:
+        print("%-40s %10d B" % ("color sensor image, %dx%d" % (resolution, resolution), resolution * resolution * 3))
+    print("%-40s %10d B" % ("color sensor aux packet", 15 * 4))
+
+
+def bench_fleet():
+    # sensor reads of one fleet observation against the same reads through one robotApi per robot. the
+    # protobuf messages are left out, they cost the same either way
+    for robots in [1, 2, 4]:
+        server, ra, sa = mock_game(robots=robots)
+        for snapshot in [True, False]:
+            fleet = server.RobotFleet(ra.clientID, robots=robots, trapConfig='trapconfig.txt', snapshot=snapshot)
+            fleet.precompute()
+            sa.get_status(isOneshot=False)
+            report("fleet reads, %d robots%s" % (robots, ", snapshot" if snapshot else ""),
+                   measure(fleet.observe, repeat=500))
+        # the robots of the fleet without snapshot, whose sensors are streamed one by one
+        report("robotApi reads, %d robots" % robots,
+               measure(lambda: [(robot.getCameraImage(), robot.getColorSensors(), robot.getProximitySensors(),
+                                 robot.getRobotPose()) for robot in fleet.robots], repeat=500))
+
+
+def bench_startup():
+    # robotApi and serverApi construction with 1 ms per blocking call, without and with a warm cache
+    server, ra, sa = mock_game(latency_ms=1.0)
+    cache_file = os.path.join(tempfile.mkdtemp(), 'simplus_cache.json')
+    for name, cache in [("no cache", None), ("cold cache", cache_file), ("warm cache", cache_file)]:
+        start = time.perf_counter()
+        vapi = server.VrepApi(cache_file=cache)
+        vapi.init_robotApi()
+        vapi.init_serverApi()
+        report("startup, %s" % name, time.perf_counter() - start)
+
+
+def legacy_nearest(positions, x, y, z):
+    target_distances = []
+    for i in range(0, len(positions)):
+        s = pow(positions[i][0] - x, 2) + pow(positions[i][1] - y, 2) + pow(positions[i][2] - z, 2)
+        target_distances.append(pow(s, 0.5))
+    index_min = np.argmin(np.array(target_distances))
+    return index_min, target_distances[index_min]
+
+
+def bench_scoring():
+    # nearest object search of actionClass.applyAction and trapClass.checkTrap, per query
+    import robotApi
+    random = np.random.RandomState(0)
+    for count in [10, 100, 10000]:
+        positions = random.uniform(-1, 1, (count, 3)) * [1, 1, 0.05]
+        position_list = positions.tolist()
+        points = random.uniform(-1, 1, (50, 3)).tolist()
+        grid = robotApi.objectGrid(positions, 0.1)
+        for x, y, z in points:
+            index_min, squared_distance = robotApi.nearest_object(positions, x, y, z)
+            assert (index_min, pow(squared_distance, 0.5)) == legacy_nearest(position_list, x, y, z)
+            in_range = (index_min, squared_distance) if squared_distance <= 0.1 * 0.1 else (None, None)
+            assert grid.nearest_within(x, y, z, 0.1) == in_range
+        repeat = 20 if count > 1000 else 500
+        report("nearest object, %d objects, loop" % count,
+               measure(lambda: legacy_nearest(position_list, *points[0]), repeat=repeat))
+        report("nearest object, %d objects, numpy" % count,
+               measure(lambda: robotApi.nearest_object(positions, *points[0]), repeat=repeat))
+        report("nearest object in range, %d objects, grid" % count,
+               measure(lambda: grid.nearest_within(points[0][0], points[0][1], points[0][2], 0.1), repeat=500))
+
+
+def bench_tracking():
+    # one tracker update per cycle, with every object still and after a victim was pushed
+    server, ra, sa = mock_game()
+    import vrepMock
+    tracked = server.VrepApi().init_serverApi(track_objects=True)
+    sa.get_status(isOneshot=False)
+    tracked.tracker.update()
+    report("tracker update, nothing moved", measure(tracked.tracker.update, repeat=2000))
+    ac = tracked.actions_dict['find_victim']
+    handle = int(ac.objects_handles[0])
+    vrepMock.scene.positions[handle - 1] += [0.5, 0.0, 0.0]
+    x, y, z = vrepMock.scene.positions[handle - 1]
+    assert tracked.tracker.update()
+    assert tracked.callAction('find_victim', x, y, z) == ac.success_score
+
+    def move():
+        vrepMock.scene.positions[handle - 1] += [0.001, 0.0, 0.0]
+        tracked.tracker.update()
+    report("tracker update, one victim moved", measure(move, repeat=500))
+
+
+class FakeScene:
+    def __init__(self, positions):
+        self.positions = positions
+
+    def lookup(self, names):
+        return np.arange(len(names), dtype=np.int32), self.positions
+
+
+def legacy_check_trap(activated, positions, x, y, z, trap, max_range, bandgap_range, penalty):
+    index_min, distance = legacy_nearest(positions, x, y, z)
+    if not activated[0]:
+        if distance <= max_range:
+            print("TRAP: ", trap, " Passed point : ", x, y, z, "---- Distance from center of trap: ", distance,
+                  "---- Recieved score: ", penalty)
+            activated[0] = True
+            return penalty
+        return 0
+    if distance >= max_range + bandgap_range:
+        activated[0] = False
+    return 0
+
+
+def bench_traps():
+    # per robot trap hysteresis: every robot walks its own path, the vectorized pass over all robots has to give
+    # the penalties and log lines of one scalar trap per robot
+    import robotApi
+    random = np.random.RandomState(1)
+    for count, robots in [(10, 1), (10, 4), (1000, 4)]:
+        positions = random.uniform(-1, 1, (count, 3)) * [1, 1, 0]
+        trap = robotApi.trapClass(remoteApi=0, trap='black', max_range=0.1, bandgap_range=0.05, penalty=-5.0,
+                                  obejcts_names=['object'] * count, scene=FakeScene(positions))
+        starts = positions[random.randint(count, size=robots)] + [0.05, 0, 0]
+        paths = starts + np.cumsum(random.normal(0, 0.02, (200, robots, 3)) * [1, 1, 0], axis=0)
+        states = [[False] for r in range(robots)]
+        legacy_log, log = io.StringIO(), io.StringIO()
+        for points in paths:
+            with contextlib.redirect_stdout(legacy_log):
+                expected = [legacy_check_trap(states[r], positions.tolist(), *points[r].tolist(), trap='black',
+                                              max_range=0.1, bandgap_range=0.05, penalty=-5.0) for r in range(robots)]
+            with contextlib.redirect_stdout(log):
+                assert trap.checkTraps(points).tolist() == expected
+        assert log.getvalue() == legacy_log.getvalue()
+        assert log.getvalue().count("TRAP") >= robots
+        report("trap pass, %d objects, %d robots" % (count, robots),
+               measure(lambda: trap.checkTraps(paths[-1]), repeat=500))
+
+
+def bench_status():
+    # a paused game that is started from another thread after 200 ms: CPU time and script calls spent waiting
+    server, ra, sa = mock_game()
+    import threading
+    import vrepMock
+    calls = []
+    original = vrepMock.simxCallScriptFunction
+
+    def counted(*args, **kwargs):
+        calls.append(args[3])
+        return original(*args, **kwargs)
+
+    def legacy_wait():
+        is_started = sa.get_status(isOneshot=True)
+        while not is_started:
+            is_started = sa.get_status(isOneshot=True)
+
+    vrepMock.simxCallScriptFunction = counted
+    try:
+        for name, wait in [("spin on get_status", legacy_wait), ("waitForStart", sa.waitForStart)]:
+            wait()
+            vrepMock.simxPauseSimulation(sa.clientID, vrepMock.simx_opmode_blocking)
+            sa.get_status(isOneshot=True)  # the next oneshot reply is the paused state
+            timer = threading.Timer(0.2, vrepMock.simxStartSimulation, (sa.clientID, vrepMock.simx_opmode_blocking))
+            del calls[:]
+            start = time.process_time()
+            timer.start()
+            wait()
+            cpu = time.process_time() - start
+            timer.join()
+            print("%-40s %10.1f ms CPU, %d script calls" % ("paused 200 ms, " + name, cpu * 1e3, len(calls)))
+    finally:
+        vrepMock.simxCallScriptFunction = original
+    # synchronous, so the mock scene does not step on every check
+    sa.setSynchronous(True)
+    report("running check, get_status oneshot", measure(lambda: sa.get_status(isOneshot=True), repeat=2000))
+    report("running check, isStarted", measure(sa.isStarted, repeat=2000))
+    sa.setSynchronous(False)
+
+
+BENCHMARKS = {
+    'camera': bench_camera,
+    'script_call': bench_script_call,
+    'prepared_call': bench_prepared_call,
+    'import': bench_import,
+    'game_loop': bench_game_loop,
+    'pack': bench_pack,
+    'observations': bench_observations,
+    'actuators': bench_actuators,
+    'colors': bench_colors,
+    'fleet': bench_fleet,
+    'startup': bench_startup,
+    'scoring': bench_scoring,
+    'tracking': bench_tracking,
+    'traps': bench_traps,
+    'status': bench_status,
+    'pipeline': bench_pipeline,
+    'asyncio': bench_asyncio,
+    'scheduler': bench_scheduler,
+    'metrics': bench_metrics,
+}
+
+if __name__ == '__main__':
+    names = sys.argv[1:] or list(BENCHMARKS.keys())
+    for name in names:
+        BENCHMARKS[name]()
@@ -1,5 +1,10 @@
+import os
+
 try:
-    import vrep
+    if os.environ.get('SIMPLUS_REMOTE_API') == 'mock':
+        import vrepMock as vrep  # in-memory scene, see vrepMock.py
+    else:
+        import vrep
 except:
     print('--------------------------------------------------------------')
     print('"vrep.py" could not be imported. This means very probably that')
@@ -10,66 +15,332 @@ except:
     print('')
 
 import time
+import copy
+import threading
+import weakref
+import json
+import hashlib
 import numpy as np
 # from matplotlib import pyplot as plt
 import math
 
-#scratch
-import simplus_scratch
-#endscratch
+# robot widths stay the same while the same scene is loaded, so they are kept on disk between server starts.
+# the key is the loaded scene file plus the config files; as the scene can be edited without saving it, the
+# names and handles of the scene objects are read once per start, with one bulk call, and the widths are only
+# trusted when the scene still has the objects they were written for. handles are always taken from that read
+# and positions are always read from the scene, neither is stored
+class sceneCache:
+    version = 3
+
+
+    def __init__(self, remoteApi, config_files=(), path='simplus_cache.json'):
+        self.clientID = remoteApi
+        self.path = path
+        self.entries = {}
+        self.dirty = False
+        self.key = self.sceneKey(config_files)
+        self.objects = self.sceneObjectHandles()
+        self.index = dict(zip(self.objects["names"], self.objects["handles"])) if self.objects is not None else {}
+        self.fingerprint = self.objectsDigest(self.objects)
+        if self.key is not None and os.path.exists(self.path):
+            try:
+                with open(self.path, 'r') as fp:
+                    stored = json.load(fp)
+                if stored.get("key") == self.key:
+                    if stored.get("objects") == self.fingerprint:
+                        self.entries = stored["entries"]
+                    else:
+                        print("the scene changed since", self.path, "was written, rebuilding it")
+            except (IOError, ValueError, KeyError):
+                print("ignoring unreadable cache", self.path)
+        self.hit = bool(self.entries)
+
+
+    def sceneKey(self, config_files):
+        returnCode, scene_path = vrep.simxGetStringParameter(self.clientID, vrep.sim_stringparam_scene_path_and_name,
+                                                             vrep.simx_opmode_blocking)
+        if (returnCode != 0 or not scene_path):
+            return None  # unsaved scene, nothing to key the cache on
+        digest = hashlib.sha1(scene_path.encode('utf-8'))
+        if os.path.exists(scene_path):
+            digest.update(repr(os.path.getmtime(scene_path)).encode('utf-8'))
+        for config_file in config_files:
+            with open(config_file, 'rb') as fp:
+                digest.update(fp.read())
+        return str(self.version) + ':' + digest.hexdigest()
+
+    # names and handles of every scene object, one simxGetObjectGroupData call
+    def sceneObjectHandles(self):
+        returnCode, handles, ints, floats, names = vrep.simxGetObjectGroupDataNumpy(
+            self.clientID, vrep.sim_appobj_object_type, 0, vrep.simx_opmode_blocking)
+        if (returnCode != 0 or len(names) != len(handles)):
+            return None
+        return {"names": list(names), "handles": handles.tolist()}
+
+    @staticmethod
+    def objectsDigest(objects):
+        if objects is None:
+            return None
+        return hashlib.sha1(json.dumps(objects).encode('utf-8')).hexdigest()
+
+
+    # cached value of name, computed and remembered on a miss. None results are not cached
+    def get(self, name, compute):
+        if name not in self.entries:
+            value = compute()
+            if value is None:
+                return None
+            self.entries[name] = value
+            self.dirty = True
+        return self.entries[name]
+
+    # handle of the named object from the bulk read, or from the scene when the read did not return it
+    def handle(self, name):
+        handle = self.index.get(name)
+        if handle is None:
+            returnCode, handle = vrep.simxGetObjectHandle(self.clientID, name, vrep.simx_opmode_blocking)
+            if returnCode != 0:
+                return None
+            self.index[name] = handle
+        return handle
+
+    def save(self):
+        if (self.key is None or self.fingerprint is None or not self.dirty):
+            return
+        with open(self.path, 'w') as fp:
+            json.dump({"key": self.key, "objects": self.fingerprint, "entries": self.entries}, fp)
+        self.dirty = False
 
 class VrepApi:
+    # each subsystem talks to V-REP over its own connection (lane) so it never waits behind another one's
+    # commands. a lane connects to server_port + its offset; the scene has to start a remote API server on
+    # that port, otherwise the lane falls back to the control connection
+    lane_port_offsets = {"control": 0, "scratch": 1, "scorer": 2}
+
     def __init__(self, server_ip='127.0.0.1', server_port=19999, waitUntilConnected=True,
-                 doNotReconnectOnceDisconnected=True, timeOutInMs=5000, commThreadCycleInMs=5):
+                 doNotReconnectOnceDisconnected=True, timeOutInMs=5000, commThreadCycleInMs=5, lanes=("control",),
+                 laneTimeOutInMs=1000, cache_file=None, config_files=(r'trapconfig.txt', r'serverconfig.txt')):
+        vrep.simxBindRemoteApi()  # load the remoteApi library before connecting, not on the first call in the game loop
         vrep.simxFinish(-1)  # just in case, close all opened connections
+        self.server_ip = server_ip
+        self.server_port = server_port
+        self.waitUntilConnected = waitUntilConnected
+        self.doNotReconnectOnceDisconnected = doNotReconnectOnceDisconnected
+        self.commThreadCycleInMs = commThreadCycleInMs
+        self.laneTimeOutInMs = laneTimeOutInMs
         self.clientID = vrep.simxStart(server_ip, server_port, waitUntilConnected, doNotReconnectOnceDisconnected,
                                        timeOutInMs, commThreadCycleInMs)  # Connect to V-REP
         print("client id", self.clientID)
+        self.lanes = {"control": self.clientID}
+        for lane in lanes:
+            self.lane(lane)
+        # with a cache file, robot widths are measured in the scene only on the first start
+        self.cache = sceneCache(self.clientID, config_files, cache_file) if cache_file else None
         self.robot_api = None
         self.server_api = None
 
+    def lane(self, name="control"):
+        if name not in self.lanes:
+            port = self.server_port + self.lane_port_offsets.get(name, len(self.lanes))
+            clientID = vrep.simxStart(self.server_ip, port, self.waitUntilConnected,
+                                      self.doNotReconnectOnceDisconnected, self.laneTimeOutInMs,
+                                      self.commThreadCycleInMs)
+            if clientID == -1:
+                print("no remote API server on port", port, "for lane", name, "- sharing the control connection")
+                clientID = self.clientID
+            self.lanes[name] = clientID
+        return self.lanes[name]
+
+    def close(self):
+        for clientID in set(self.lanes.values()):
+            vrep.simxFinish(clientID)
+
     def init_robotApi(self, trapConfig=r'trapconfig.txt', robot_base='ePuck_base', robot_namespace="ePuck_",
                       robot_motors={"left": 'leftJoint', "right": 'rightJoint', "radius": 0.02},
                       proximity_sensor={"num": 8, "name": 'proxSensor'}, camera={"name": 'camera', "joint": None},
-                      color_sensor={"num": 1, "name": 'lightSensor'}, gps_enabled=True):
-        return robotApi(remoteApi=self.clientID, trapConfig=trapConfig, robot_base=robot_base,
-                        robot_namespace=robot_namespace, robot_motors=robot_motors, proximity_sensor=proximity_sensor,
-                        camera=camera, color_sensor=color_sensor, gps_enabled=gps_enabled)
+                      color_sensor={"num": 1, "name": 'lightSensor'}, gps_enabled=True, lane="control",
+                      track_objects=False, snapshot=False):
+        ra = robotApi(remoteApi=self.lane(lane), trapConfig=trapConfig, robot_base=robot_base,
+                      robot_namespace=robot_namespace, robot_motors=robot_motors, proximity_sensor=proximity_sensor,
+                      camera=camera, color_sensor=color_sensor, gps_enabled=gps_enabled, cache=self.cache,
+                      track_objects=track_objects, snapshot=snapshot)
+        self.save_cache()
+        return ra
+
+    def init_robotFleet(self, robots=1, trapConfig=r'trapconfig.txt', lane="control", **kwargs):
+        fleet = RobotFleet(remoteApi=self.lane(lane), robots=robots, trapConfig=trapConfig, cache=self.cache, **kwargs)
+        self.save_cache()
+        return fleet
 
     def init_serverApi(self,
-                       serverConfig=r'serverconfig.txt'):
-        return serverApi(remoteApi=self.clientID, serverConfig=serverConfig)
+                       serverConfig=r'serverconfig.txt', lane="control", track_objects=False):
+        sa = serverApi(remoteApi=self.lane(lane), serverConfig=serverConfig, cache=self.cache,
+                       track_objects=track_objects)
+        self.save_cache()
+        return sa
+
+    def save_cache(self):
+        if self.cache is not None:
+            self.cache.save()
+
+
+# names, handles and absolute positions of every scene object, fetched with two simxGetObjectGroupData
+# calls instead of a handle and a position round trip per object
+class sceneObjects:
+    def __init__(self, remoteApi, cache=None):
+        self.clientID = remoteApi
+        self.names = []
+        self.handles = np.empty(0, dtype=np.int32)
+        self.positions = np.empty((0, 3), dtype=np.float64)
+        self.index = {}
+
+        if cache is not None and cache.objects is not None:
+            # the cache has just read the names and handles, only positions are read
+            self.__fetchPositions__(cache.objects["names"], np.array(cache.objects["handles"], dtype=np.int32))
+        else:
+            self.__fetch__()
+
+
+    def __store__(self, names, handles, positions):
+        self.names = names
+        self.handles = handles
+        self.positions = positions
+        self.index = {name: i for i, name in enumerate(names)}
+
+    def __fetch__(self):
+        ret_names, name_handles, ints, floats, names = vrep.simxGetObjectGroupDataNumpy(
+            self.clientID, vrep.sim_appobj_object_type, 0, vrep.simx_opmode_blocking)
+        if ret_names != 0 or len(names) != len(name_handles):
+            return
+        self.__fetchPositions__(names, name_handles)
+
+    def __fetchPositions__(self, names, name_handles):
+        ret_pos, pos_handles, ints, floats, strings = vrep.simxGetObjectGroupDataNumpy(
+            self.clientID, vrep.sim_appobj_object_type, 3, vrep.simx_opmode_blocking)
+        if ret_pos != 0 or len(floats) != 3 * len(pos_handles):
+            return
+
+        positions = floats.reshape(-1, 3).astype(np.float64)
+        if not np.array_equal(name_handles, pos_handles):
+            # objects without a position row are left out, lookup() resolves them one by one
+            rows, found = group_rows(pos_handles, name_handles)
+            names = [name for name, ok in zip(names, found) if ok]
+            name_handles = name_handles[found]
+            positions = positions[rows[found]]
+        self.__store__(names, name_handles, positions)
+
+
+    # handles and (N, 3) positions of the named objects; objects missing from the bulk fetch are resolved one by one
+    def lookup(self, names):
+        handles = np.empty(len(names), dtype=np.int32)
+        positions = np.empty((len(names), 3), dtype=np.float64)
+        for i, name in enumerate(names):
+            row = self.index.get(name)
+            if row is not None:
+                handles[i] = self.handles[row]
+                positions[i] = self.positions[row]
+            else:
+                temp1, handles[i] = vrep.simxGetObjectHandle(self.clientID, name, vrep.simx_opmode_blocking)
+                response = vrep.simxGetObjectPosition(self.clientID, int(handles[i]), -1, vrep.simx_opmode_blocking)
+                positions[i] = response[1][0:3]
+        return handles, positions
+
+
+# index of the object closest to (x, y, z) among (N, 3) positions and its squared distance. the squares are summed
+# in the same order as the scalar formula, so the distance logged from it is the one the loop computed
+def nearest_object(positions, x, y, z):
+    squared_distances = ((positions - (x, y, z)) ** 2).sum(axis=1)
+    index_min = np.argmin(squared_distances)
+    return index_min, float(squared_distances[index_min])
+
+
+# uniform grid over the x, y positions of a set of objects, built once when the config is parsed. a range query
+# only looks at the few cells that the search radius covers, so its cost does not grow with the size of the map.
+# small sets are scanned directly, which is cheaper than visiting cells
+class objectGrid:
+    scan_below = 32
+
+    def __init__(self, positions, cell_size):
+        self.positions = positions
+        self.cell_size = max(float(cell_size), 1e-6)
+        self.cells = None
+        if len(positions) >= self.scan_below:
+            cells = {}
+            for i, cell in enumerate(np.floor(positions[:, 0:2] / self.cell_size).astype(int).tolist()):
+                cells.setdefault(tuple(cell), []).append(i)
+            self.cells = dict((cell, np.array(members)) for cell, members in cells.items())
+
+    # index and squared distance of the object closest to (x, y, z) if it is within radius, else (None, None).
+    # candidates are visited in index order, so ties resolve like nearest_object
+    def nearest_within(self, x, y, z, radius):
+        if self.cells is None:
+            candidates = None
+        else:
+            x0, x1 = int(math.floor((x - radius) / self.cell_size)), int(math.floor((x + radius) / self.cell_size))
+            y0, y1 = int(math.floor((y - radius) / self.cell_size)), int(math.floor((y + radius) / self.cell_size))
+            found = [self.cells[(i, j)] for i in range(x0, x1 + 1) for j in range(y0, y1 + 1) if (i, j) in self.cells]
+            if not found:
+                return None, None
+            candidates = np.sort(np.concatenate(found)) if len(found) > 1 else found[0]
+        positions = self.positions if candidates is None else self.positions[candidates]
+        if len(positions) == 0:
+            return None, None
+        index_min, squared_distance = nearest_object(positions, x, y, z)
+        if squared_distance > radius * radius:
+            return None, None
+        return (index_min if candidates is None else candidates[index_min]), squared_distance
+
+    # nearest_within for (R, 3) points at once: indices (-1 where nothing is within radius) and squared distances
+    def nearest_within_many(self, points, radius):
+        index = np.full(len(points), -1, dtype=int)
+        squared_distances = np.full(len(points), np.inf)
+        if (self.cells is None):
+            if (len(self.positions) > 0 and len(points) > 0):
+                squared = ((self.positions[None, :, :] - points[:, None, :]) ** 2).sum(axis=2)
+                nearest = np.argmin(squared, axis=1)
+                squared_distances = squared[np.arange(len(points)), nearest]
+                index = np.where(squared_distances <= radius * radius, nearest, -1)
+        else:
+            for r, (x, y, z) in enumerate(points.tolist()):
+                index_min, squared_distance = self.nearest_within(x, y, z, radius)
+                if index_min is not None:
+                    index[r], squared_distances[r] = index_min, squared_distance
+        return index, squared_distances
 
 
 class actionClass:
-    def __init__(self, remoteApi, action, max_range=1.0, success_score=1.0, failure_score=-0.5, obejcts_names=[]):
+    def __init__(self, remoteApi, action, max_range=1.0, success_score=1.0, failure_score=-0.5, obejcts_names=[],
+                 scene=None):
         self.action = action
         self.clientID = remoteApi
         self.range = float(max_range)
         self.success_score = float(success_score)
         self.failure_score = float(failure_score)
         self.obejcts_names = obejcts_names
-        self.objects_distances = []
-        self.seen_list=[]
-        for i in self.obejcts_names:
-            temp1, oh = vrep.simxGetObjectHandle(self.clientID, i, vrep.simx_opmode_blocking)
-            response = vrep.simxGetObjectPosition(self.clientID, oh, -1, vrep.simx_opmode_blocking)
-            self.objects_distances.append([response[1][0], response[1][1], response[1][2]])
-
-    def applyAction(self, x, y, z):
-        target_distances = []
-#         print("Seen=",self.seen_list)
-        for i in range(0, len(self.objects_distances)):
-            s = pow(self.objects_distances[i][0] - x, 2) + pow(self.objects_distances[i][1] - y, 2) + pow(
-                self.objects_distances[i][2] - z, 2)
-            target_distances.append(pow(s, 0.5))
-        index_min = np.argmin(np.array(target_distances))
-        if target_distances[index_min] <= self.range and not(index_min in self.seen_list):
-            self.logAction(x, y, z, index_min, target_distances[index_min], self.success_score)
-            self.seen_list.append(index_min)
+        self.seen = {}  # team id -> indices of the objects that team already scored
+        if scene is None:
+            scene = sceneObjects(self.clientID)
+        # (N, 3) object positions
+        self.objects_handles, self.objects_distances = scene.lookup(self.obejcts_names)
+        self.grid = objectGrid(self.objects_distances, self.range)
+
+    def setPositions(self, positions):
+        self.objects_distances = positions
+        self.grid = objectGrid(self.objects_distances, self.range)
+
+    def applyAction(self, x, y, z, team_id=0):
+        seen = self.seen.setdefault(team_id, set())
+#         print("Seen=",seen)
+        index_min, squared_distance = self.grid.nearest_within(x, y, z, self.range)
+        if index_min is not None and not(int(index_min) in seen):
+            self.logAction(x, y, z, index_min, pow(squared_distance, 0.5), self.success_score)
+            seen.add(int(index_min))
             return self.success_score
         else:
-            self.logAction(x, y, z, index_min, target_distances[index_min], self.failure_score)
+            if index_min is None:
+                # nothing in range, the log still reports the distance to the nearest object
+                index_min, squared_distance = nearest_object(self.objects_distances, x, y, z)
+            self.logAction(x, y, z, index_min, pow(squared_distance, 0.5), self.failure_score)
             return self.failure_score
 
     def logAction(self, x, y, z, index_min, distance, score):
@@ -84,45 +355,58 @@ class actionClass:
 
 
 class trapClass:
-    def __init__(self, remoteApi, trap, max_range=1.0, penalty=1.0, bandgap_range=0.5, obejcts_names=[]):
-        self.trap_activated = False
+    def __init__(self, remoteApi, trap, max_range=1.0, penalty=1.0, bandgap_range=0.5, obejcts_names=[], scene=None):
+        self.activated = np.zeros(1, dtype=bool)  # hysteresis state of every robot
         self.trap = trap
         self.clientID = remoteApi
         self.range = float(max_range)
         self.penalty = float(penalty)
         self.bandgap_range = float(bandgap_range)
         self.obejcts_names = obejcts_names
-        self.objects_distances = []
-        for i in self.obejcts_names:
-            temp1, oh = vrep.simxGetObjectHandle(self.clientID, i, vrep.simx_opmode_blocking)
-            response = vrep.simxGetObjectPosition(self.clientID, oh, -1, vrep.simx_opmode_blocking)
-            self.objects_distances.append([response[1][0], response[1][1], response[1][2]])
+        if scene is None:
+            scene = sceneObjects(self.clientID)
+        # (N, 3) object positions
+        self.objects_handles, self.objects_distances = scene.lookup(self.obejcts_names)
+        self.grid = objectGrid(self.objects_distances, self.range + self.bandgap_range)
+
+    def setPositions(self, positions):
+        self.objects_distances = positions
+        self.grid = objectGrid(self.objects_distances, self.range + self.bandgap_range)
+
+    @property
+    def trap_activated(self):
+        return bool(self.activated[0])
 
     def checkTrap(self, x, y, z):
-        if (self.trap_activated == False):
-            target_distances = []
-            for i in range(0, len(self.objects_distances)):
-                s = pow(self.objects_distances[i][0] - x, 2) + pow(self.objects_distances[i][1] - y, 2) + pow(
-                    self.objects_distances[i][2] - z, 2)
-                target_distances.append(pow(s, 0.5))
-            index_min = np.argmin(np.array(target_distances))
-            if target_distances[index_min] <= self.range:
-                self.logTrap(x, y, z, index_min, target_distances[index_min])
-                self.trap_activated = True
-                return self.penalty
-            else:
-                return 0
-        else:
-            target_distances = []
-            for i in range(0, len(self.objects_distances)):
-                s = pow(self.objects_distances[i][0] - x, 2) + pow(self.objects_distances[i][1] - y, 2) + pow(
-                    self.objects_distances[i][2] - z, 2)
-                target_distances.append(pow(s, 0.5))
-            index_min = np.argmin(np.array(target_distances))
-            if target_distances[index_min] >= self.range + self.bandgap_range:
-             #   self.logTrap(x, y, z, index_min, target_distances[index_min])
-                self.trap_activated = False
-            return 0
+        return self.checkTraps(np.array([[x, y, z]], dtype=np.float64))[0]
+
+    # penalties of (R, 3) robot positions. a robot gets the penalty when it comes within range of an object and
+    # can only get it again after it left the band-gap range, independently of the other robots
+    def checkTraps(self, points):
+        if (len(self.activated) < len(points)):
+            self.activated = np.concatenate([self.activated, np.zeros(len(points) - len(self.activated), dtype=bool)])
+        activated = self.activated[:len(points)]
+        penalties = np.zeros(len(points))
+
+        outer_range = self.range + self.bandgap_range
+        active = np.flatnonzero(activated)
+        if (len(active) > 0):
+            index, squared_distances = self.grid.nearest_within_many(points[active], outer_range)
+            leaving = (index < 0) | (squared_distances >= outer_range * outer_range)
+        #   self.logTrap(x, y, z, index_min, target_distances[index_min])
+            activated[active[leaving]] = False
+
+        waiting = np.flatnonzero(~activated)
+        waiting = waiting[np.isin(waiting, active, invert=True)]
+        if (len(waiting) > 0):
+            index, squared_distances = self.grid.nearest_within_many(points[waiting], self.range)
+            for r in np.flatnonzero(index >= 0):
+                x, y, z = points[waiting[r]].tolist()
+                self.logTrap(x, y, z, index[r], pow(float(squared_distances[r]), 0.5))
+            entering = waiting[index >= 0]
+            activated[entering] = True
+            penalties[entering] = self.penalty
+        return penalties
 
     def logTrap(self, x, y, z, index_min, distance):
           print("TRAP: ",self.trap," Passed point : ",x, y, z,"---- Distance from center of trap: ",distance,"---- Recieved score: ",self.penalty)
@@ -133,56 +417,299 @@ class trapClass:
 #         print(distance)
 
 
+# follows objects that move during the game (pushed victims, animated hazards). the absolute positions of all
+# scene objects are streamed, each update() is one buffered simxGetObjectGroupData read, and the position
+# arrays and grids of the action or trap classes are only rebuilt when one of their objects moved
+class objectTracker:
+
+    def __init__(self, remoteApi, classes, tolerance=1e-4):
+        self.clientID = remoteApi
+        self.classes = list(classes)
+        self.tolerance = tolerance
+        handles = [np.asarray(c.objects_handles, dtype=np.int32) for c in self.classes]
+        self.handles = np.unique(np.concatenate(handles)) if handles else np.empty(0, dtype=np.int32)
+        self.rows = [np.searchsorted(self.handles, h) for h in handles]
+        self.positions = np.zeros((len(self.handles), 3))
+        for c, rows in zip(self.classes, self.rows):
+            self.positions[rows] = c.objects_distances
+        self.last_data = None
+        vrep.simxGetObjectGroupDataNumpy(self.clientID, vrep.sim_appobj_object_type, 3, vrep.simx_opmode_streaming)
+
+    # refreshes the moved objects, returns whether anything changed
+    def update(self):
+        returnCode, handles, intData, floatData, stringData = vrep.simxGetObjectGroupDataNumpy(
+            self.clientID, vrep.sim_appobj_object_type, 3, vrep.simx_opmode_buffer)
+        if (returnCode != 0 or len(handles) == 0):
+            return False
+        if (self.last_data is not None and np.array_equal(floatData, self.last_data)):
+            return False  # the same reply as last cycle
+        self.last_data = floatData
+        index, found = group_rows(handles, self.handles)
+        positions = np.where(found[:, None], floatData.reshape(-1, 3)[index], self.positions)
+        moved = (np.abs(positions - self.positions) > self.tolerance).any(axis=1)
+        if (not moved.any()):
+            return False
+        self.positions[moved] = positions[moved]
+        for c, rows in zip(self.classes, self.rows):
+            if (moved[rows].any()):
+                c.setPositions(self.positions[rows])
+        return True
+
+
+# remembers the last value sent to every actuator and drops writes that would not change it. writes made
+# between begin() and commit() go out together in one simxPauseCommunication window
+class actuatorClass:
+    instances = weakref.WeakSet()
+
+    def __init__(self, remoteApi, sent=None):
+        actuatorClass.instances.add(self)
+        self.clientID = remoteApi
+        # the actuatorClass of every lane that drives the same robot shares this dict
+        self.sent = sent if sent is not None else {}
+        self.pending = {}
+        self.batching = False
+
+    def write(self, key, value, send):
+        if (key in self.sent and self.sent[key] == value):
+            self.pending.pop(key, None)
+        else:
+            self.pending[key] = (value, send)
+        if (not self.batching):
+            self.commit()
+
+    def begin(self):
+        self.batching = True
+
+    def commit(self):
+        self.batching = False
+        if (not self.pending):
+            return 0
+        pending, self.pending = self.pending, {}
+        if (len(pending) > 1):
+            vrep.simxPauseCommunication(self.clientID, True)
+        for key, (value, send) in pending.items():
+            # a oneshot write returns simx_return_novalue_flag when it is queued. only writes that went out
+            # are remembered, so a failed one is sent again next time
+            returnCode = send(value)
+            if ((returnCode & ~vrep.simx_return_novalue_flag) == 0):
+                self.sent[key] = value
+            else:
+                self.sent.pop(key, None)
+        if (len(pending) > 1):
+            vrep.simxPauseCommunication(self.clientID, False)
+        return len(pending)
+
+    def reset(self):
+        # forget what was sent, so the next writes go out even if they repeat the last values
+        self.sent.clear()
+
+
+def resetActuators():
+    # after a simulation start, stop or mode change the joints and LEDs may no longer hold the values that were
+    # sent, so every actuator cache starts over
+    for actuators in list(actuatorClass.instances):
+        actuators.reset()
+
+
+# the game loop and the Scratch thread score through the same actionClass and trapClass objects, each over its
+# own lane. this lock keeps a victim or a trap from being counted by both at once
+scoring_lock = threading.Lock()
+
+
+def checkTrapsFor(traps_dict, tracker, points):
+    # total penalty of the robots at (R, 3) points over every trap
+    if (not traps_dict):
+        return 0
+    penalty = 0
+    with scoring_lock:
+        if (tracker != None):
+            tracker.update()
+        for t in traps_dict.keys():
+            trap_penalty = traps_dict.get(t).checkTraps(points).sum()
+            if (trap_penalty != 0):
+                penalty += float(trap_penalty)
+    return penalty
+
+
+def stack_frames(frames):
+    # (robots, height, width, 3) camera frames, black for a robot whose frame is missing (None) or differs in
+    # size from the first one
+    shapes = [frame.shape for frame in frames if frame is not None]
+    if (not shapes):
+        return np.zeros((len(frames), 0, 0, 3), dtype=np.uint8)
+    return np.stack([frame if frame is not None and frame.shape == shapes[0] else np.zeros(shapes[0], dtype=np.uint8)
+                     for frame in frames])
+
+
+def group_rows(handles, wanted):
+
+    # row of every wanted handle in the handles returned by simxGetObjectGroupData, and whether it was there.
+    # wanted can have any shape
+    if len(handles) == 0:
+        return np.zeros(np.shape(wanted), dtype=int), np.zeros(np.shape(wanted), dtype=bool)
+    order = np.argsort(handles)
+    index = order[np.searchsorted(handles, wanted, sorter=order).clip(0, len(handles) - 1)]
+    return index, handles[index] == wanted
+
+
+def read_proximity_bank(clientID, sensors):
+    # detection flags and distances of the given proximity sensors (any shape), from the streamed
+    # simxGetObjectGroupData read that precompute starts
+    returnCode, handles, intData, floatData, stringData = vrep.simxGetObjectGroupDataNumpy(
+        clientID, vrep.sim_object_proximitysensor_type, 13, vrep.simx_opmode_buffer)
+    if (returnCode != 0 or len(handles) == 0):
+        return np.zeros(sensors.shape, dtype=bool), np.zeros(sensors.shape)
+    index, found = group_rows(handles, sensors)
+    points = floatData.reshape(-1, 6)[index, 0:3].astype(np.float64)
+    detected = found & (intData.reshape(-1, 2)[index, 0] > 0)
+    distances = np.where(detected, np.sqrt((points * points).sum(axis=-1)), 0.0)
+    return detected, distances
+
+
 class robotApi:
 
     def __init__(self, remoteApi, trapConfig=None, robot_base='ePuck', robot_namespace="ePuck_",
                  robot_motors={"left": 'leftJoint', "right": 'rightJoint', "radius": 0.02},
                  proximity_sensor={"num": 8, "name": 'proxSensor'}, camera={"name": 'camera', "joint": None},
-                 color_sensor={"num": 1, "name": 'lightSensor'}, gps_enabled=True):
+                 color_sensor={"num": 1, "name": 'lightSensor'}, gps_enabled=True, robot_suffix="",
+                 actuators=None, scene=None, cache=None, track_objects=False, snapshot=False):
         self.gps_enabled = gps_enabled
         self.clientID = remoteApi
-        temp1, self.left = vrep.simxGetObjectHandle(self.clientID, robot_namespace + robot_motors["left"],
-                                                    vrep.simx_opmode_blocking)
-        temp2, self.right = vrep.simxGetObjectHandle(self.clientID, robot_namespace + robot_motors["right"],
-                                                     vrep.simx_opmode_blocking)
+        self.cache = cache
+        self.left = self.__getHandle__(robot_namespace + robot_motors["left"] + robot_suffix)
+        self.right = self.__getHandle__(robot_namespace + robot_motors["right"] + robot_suffix)
         self.wheel_radius = robot_motors["radius"]
-        temp3, self.robot_base = vrep.simxGetObjectHandle(self.clientID, robot_base, vrep.simx_opmode_blocking)
-        self.robot_width = self.__getRobotWidth__()
-        temp4, self.camera = vrep.simxGetObjectHandle(self.clientID, robot_namespace + camera["name"],
-                                                      vrep.simx_opmode_blocking)
+        self.robot_base = self.__getHandle__(robot_base + robot_suffix)
+        if (cache != None):
+            self.robot_width = cache.get("width:" + robot_base + robot_suffix, self.__getRobotWidth__)
+        else:
+            self.robot_width = self.__getRobotWidth__()
+        self.camera = self.__getHandle__(robot_namespace + camera["name"] + robot_suffix)
         if (camera["joint"]):
-            temp, self.camera_joint = vrep.simxGetObjectHandle(self.clientID, robot_namespace + camera["joint"],
-                                                               vrep.simx_opmode_blocking)
+            self.camera_joint = self.__getHandle__(robot_namespace + camera["joint"] + robot_suffix)
         else:
             self.camera_joint = None
 
         self.proxSensors = []
         for i in range(1, proximity_sensor["num"] + 1):
-            temp, sensor = vrep.simxGetObjectHandle(self.clientID, robot_namespace + proximity_sensor["name"] + str(i),
-                                                    vrep.simx_opmode_blocking)
+            sensor = self.__getHandle__(robot_namespace + proximity_sensor["name"] + str(i) + robot_suffix)
             self.proxSensors.append(sensor)
 
         self.colorSensors = []
         for i in ['', '_l', '_r']:
-            temp, sensor = vrep.simxGetObjectHandle(self.clientID, robot_namespace + color_sensor["name"] + str(i),
-                                                    vrep.simx_opmode_blocking)
+            sensor = self.__getHandle__(robot_namespace + color_sensor["name"] + str(i) + robot_suffix)
             self.colorSensors.append(sensor)
+        # read the average colour from the aux packet of simxReadVisionSensor instead of the sensor image
+        self.color_from_aux = color_sensor.get("aux", False)
+        self.color_image_streams = set()
+
+        self.led_call = vrep.PreparedScriptFunction('Simplus_monitor' + robot_suffix, vrep.sim_scripttype_childscript,
+                                                    'remote_led_change', intCount=1)
+        self.led_colors = {"red": (21002, 'red'), "green": (21003, 'green'), "blue": (21004, 'blue')}
+        # a fleet shares one actuatorClass between its robots, so all their writes go out in one batch
+        self.actuators = actuators if actuators is not None else actuatorClass(self.clientID)
+
+        # published every simulation step by simplus_snapshot.lua. in snapshot mode it replaces the camera,
+        # colour, proximity and orientation streams, which only start if the signal never shows up
+        self.snapshot_signal = robot_namespace + 'snapshot' + robot_suffix
+        self.snapshot_mode = snapshot
+        self.sensor_streams = False
 
         self.traps_dict = None
         if (trapConfig != None):
             self.traps_dict = {}
-            self.parseConfig(trapConfig)
+            self.parseConfig(trapConfig, scene)
+        self.tracker = None
+        if (track_objects and self.traps_dict):
+            self.tracker = objectTracker(self.clientID, self.traps_dict.values())
+
+    def onLane(self, remoteApi):
+        # the same robot over another connection. trap state and the last actuator values stay shared with
+        # this robotApi, so a robot that is driven and scored from two lanes is still one robot. call
+        # precompute on the copy to start its streams
+        other = copy.copy(self)
+        other.clientID = remoteApi
+        other.snapshot_mode = False
+        other.sensor_streams = False
+        other.color_from_aux = False
+        other.color_image_streams = set()
+        other.actuators = actuatorClass(remoteApi, sent=self.actuators.sent)
+        # a prepared call holds its lock while it waits for the reply, so every lane gets its own
+        other.led_call = self.led_call.clone()
+        if (self.tracker != None):
+            other.tracker = objectTracker(remoteApi, self.traps_dict.values())
+        return other
+
+
+    def __getHandle__(self, name):
+        if (self.cache != None):
+            handle = self.cache.handle(name)
+            return handle if handle is not None else 0
+        temp, handle = vrep.simxGetObjectHandle(self.clientID, name, vrep.simx_opmode_blocking)
+        return handle
 
     def precompute(self):
-        vrep.simxGetVisionSensorImage(self.clientID, self.camera, 0,vrep.simx_opmode_streaming)
         vrep.simxGetObjectPosition(self.clientID, self.right, self.robot_base,vrep.simx_opmode_streaming)
         vrep.simxGetObjectPosition(self.clientID, self.left, self.robot_base, vrep.simx_opmode_streaming) 
         vrep.simxGetObjectPosition(self.clientID, self.robot_base, -1,vrep.simx_opmode_streaming)    
+        if (self.snapshot_mode):
+            self.startSnapshot()
+        else:
+            self.startSensorStreams()
+
+    def startSensorStreams(self):
+        if (self.sensor_streams):
+            return
+        self.sensor_streams = True
         vrep.simxGetObjectOrientation(self.clientID, self.robot_base, -1,vrep.simx_opmode_streaming)  
         vrep.simxGetVisionSensorImage(self.clientID, self.camera, 0,vrep.simx_opmode_streaming)
-        vrep.simxGetVisionSensorImage(self.clientID,self.colorSensors[0], 0,vrep.simx_opmode_streaming)
-        vrep.simxGetVisionSensorImage(self.clientID,self.colorSensors[1], 0,vrep.simx_opmode_streaming)
-        vrep.simxGetVisionSensorImage(self.clientID,self.colorSensors[2], 0,vrep.simx_opmode_streaming)
+        vrep.simxGetObjectGroupDataNumpy(self.clientID, vrep.sim_object_proximitysensor_type, 13,
+                                         vrep.simx_opmode_streaming)
+        if (self.color_from_aux):
+            for sensor in self.colorSensors:
+                vrep.simxReadVisionSensor(self.clientID, sensor, vrep.simx_opmode_streaming)
+        else:
+            for i in range(len(self.colorSensors)):
+                self.__streamColorImage__(i)
+
+    def __streamColorImage__(self, sensor_index):
+        # in aux mode a colour sensor image is only streamed once its aux packet failed to arrive
+        if (sensor_index not in self.color_image_streams):
+            self.color_image_streams.add(sensor_index)
+            vrep.simxGetVisionSensorImage(self.clientID, self.colorSensors[sensor_index], 0,
+                                          vrep.simx_opmode_streaming)
+
+    def startSnapshot(self):
+        vrep.simxGetStringSignal(self.clientID, self.snapshot_signal, vrep.simx_opmode_streaming)
+        vrep.simxGetPingTime(self.clientID)  # one round trip, so a missing signal is not mistaken for a late one
+
+    def snapshot(self):
+        # every reading of getCameraImage, getColorSensor, getProximitySensor and getRobotPose from one
+        # streamed string signal, see simplus_snapshot.lua for the layout
+        returnCode, signal = vrep.simxGetStringSignal(self.clientID, self.snapshot_signal, vrep.simx_opmode_buffer)
+        if (returnCode != 0 or len(signal) < 20):
+            if (self.snapshot_mode and not self.sensor_streams):
+                # no snapshot helper in the scene: stream the sensors one by one from now on, and wait one
+                # round trip so their first values are there for the fallback reads
+                self.startSensorStreams()
+                vrep.simxGetPingTime(self.clientID)
+            return None
+        version, res_x, res_y, prox_num, color_num = [int(v) for v in np.frombuffer(signal, '<f4', count=5)]
+        float_count = 5 + 6 + 2 * prox_num + 3 * color_num
+        if (version != 1 or len(signal) != float_count * 4 + res_x * res_y * 3):
+            return None
+        data = np.frombuffer(signal, '<f4', count=float_count)
+        pose = data[5:11].astype(np.float64)
+        detected = data[11:11 + prox_num] != 0
+        distances = data[11 + prox_num:11 + 2 * prox_num].astype(np.float64)
+        colors = data[11 + 2 * prox_num:float_count].astype(np.uint8).reshape(color_num, 3)
+        image = np.frombuffer(signal, np.uint8, offset=float_count * 4).reshape(res_y, res_x, 3)
+
+        pose[3:] = (pose[3:] + math.pi / 2) * 180 / math.pi
+        if (not self.gps_enabled):
+            pose[:3] = 0
+        return {"camera": [image, res_x, res_y], "colors": colors, "detected": detected, "distances": distances,
+                "pose": pose}
         
     def __getRobotWidth__(self):
         response_right = vrep.simxGetObjectPosition(self.clientID, self.right, self.robot_base,
@@ -200,68 +727,31 @@ class robotApi:
         return position
 
     def checkAllTraps(self):
-        penalty = 0
-        pose = self.getRobotXYZ()
+        return checkTrapsFor(self.traps_dict, self.tracker, np.array([self.getRobotXYZ()], dtype=np.float64))
 
-        for t in self.traps_dict.keys():
-            penalty += self.traps_dict.get(t).checkTrap(pose[0],pose[1],pose[2])
+    def startTrapStreams(self):
+        # only the base position checkAllTraps reads, for a copy on another lane that only scores the robot
+        vrep.simxGetObjectPosition(self.clientID, self.robot_base, -1, vrep.simx_opmode_streaming)
+        vrep.simxGetPingTime(self.clientID)  # one round trip, so the first check has a position
 
-        return penalty
 
     def setLED(self, color):
+        led_code, led_name = self.led_colors.get(color, (21001, ''))
+        self.actuators.write(('led', self.robot_base), led_code, self.__sendLED__)
+        return led_name
 
-        if (color == "red"):
-            returnCode, outInts, outFloats, outStrings, outBuffer = vrep.simxCallScriptFunction(self.clientID,
-                                                                                                'Simplus_monitor',
-                                                                                                vrep.sim_scripttype_childscript,
-                                                                                                'remote_led_change',
-                                                                                                [21002], [], [],
-                                                                                                bytearray(),
-                                                                                                vrep.simx_opmode_oneshot)
-            if (returnCode == 0):
-                return 'red'
-            else:
-                return -1
-        if (color == "green"):
-            returnCode, outInts, outFloats, outStrings, outBuffer = vrep.simxCallScriptFunction(self.clientID,
-                                                                                                'Simplus_monitor',
-                                                                                                vrep.sim_scripttype_childscript,
-                                                                                                'remote_led_change',
-                                                                                                [21003], [], [],
-                                                                                                bytearray(),
-                                                                                                vrep.simx_opmode_oneshot)
-            if (returnCode == 0):
-                return 'green'
-            else:
-                return -1
-        if (color == "blue"):
-            returnCode, outInts, outFloats, outStrings, outBuffer = vrep.simxCallScriptFunction(self.clientID,
-                                                                                                'Simplus_monitor',
-                                                                                                vrep.sim_scripttype_childscript,
-                                                                                                'remote_led_change',
-                                                                                                [21004], [], [],
-                                                                                                bytearray(),
-                                                                                                vrep.simx_opmode_oneshot)
-            if (returnCode == 0):
-                return 'blue'
-            else:
-                return -1
-        else:
-            returnCode, outInts, outFloats, outStrings, outBuffer = vrep.simxCallScriptFunction(self.clientID,
-                                                                                                'Simplus_monitor',
-                                                                                                vrep.sim_scripttype_childscript,
-                                                                                                'remote_led_change',
-                                                                                                [21001], [], [],
-                                                                                                bytearray(),
-                                                                                                vrep.simx_opmode_oneshot)
-            if (returnCode == 0):
-                return ''
-            else:
-                return -1
+    def __sendLED__(self, led_code):
+        return self.led_call(self.clientID, [led_code], [], [], bytearray(), vrep.simx_opmode_oneshot)[0]
+
+    def __sendRight__(self, rotation):
+        return vrep.simxSetJointTargetVelocity(self.clientID, self.right, rotation, vrep.simx_opmode_oneshot)
+
+    def __sendLeft__(self, rotation):
+        return vrep.simxSetJointTargetVelocity(self.clientID, self.left, rotation, vrep.simx_opmode_oneshot)
 
     def getCameraImage(self):
-        returnCode, image_resolution, image_array = vrep.simxGetVisionSensorImage(self.clientID, self.camera, 0,
-                                                                                  vrep.simx_opmode_buffer)
+        returnCode, image_resolution, image_array = vrep.simxGetVisionSensorImageNumpy(self.clientID, self.camera, 0,
+                                                                                       vrep.simx_opmode_buffer)
         if (returnCode == 0 or returnCode == 1  ):
             return [image_array, image_resolution[0], image_resolution[1]]
         else:
@@ -269,16 +759,39 @@ class robotApi:
 
     def getColorSensor(self, sensor_index=0):
         if (sensor_index >= len(self.colorSensors)): return -1
-        returnCode, image_resolution, image_array = vrep.simxGetVisionSensorImage(self.clientID,
-                                                                                  self.colorSensors[sensor_index], 0,
-                                                                                  vrep.simx_opmode_buffer)
+        self.__streamColorImage__(sensor_index)
+        returnCode, image_resolution, image_array = vrep.simxGetVisionSensorImageNumpy(self.clientID,
+                                                                                       self.colorSensors[sensor_index], 0,
+                                                                                       vrep.simx_opmode_buffer)
         if (returnCode == 0 or returnCode == 1  ):
-            image_array = (np.array(image_array, dtype=np.uint8))
-            return image_array[24:27]
+            return image_array.reshape(-1)[24:27]
         else:
             print( returnCode, image_resolution, image_array)
             return -1
 
+    def getColorSensors(self):
+        # colour of every colour sensor as a (sensors, 3) uint8 array. with color_from_aux it is the average
+        # colour of the first aux packet (values 11 to 13 are the mean red, green and blue in [0, 1]), a few
+        # floats per sensor instead of the whole image. the image path is the fallback: its stream starts when
+        # an aux read comes back empty and stops again once the aux packets arrive
+        colors = np.zeros((len(self.colorSensors), 3), dtype=np.uint8)
+        for i in range(len(self.colorSensors)):
+            color = None
+            if (self.color_from_aux):
+                returnCode, detectionState, auxPackets = vrep.simxReadVisionSensor(self.clientID, self.colorSensors[i],
+                                                                                    vrep.simx_opmode_buffer)
+                if (returnCode == 0 and len(auxPackets) > 0 and len(auxPackets[0]) >= 14):
+                    color = np.round(np.clip(auxPackets[0][11:14], 0, 1) * 255)
+                    if (i in self.color_image_streams):
+                        self.color_image_streams.discard(i)
+                        vrep.simxGetVisionSensorImage(self.clientID, self.colorSensors[i], 0,
+                                                      vrep.simx_opmode_discontinue)
+            if (color is None):
+                color = self.getColorSensor(i)
+            if (isinstance(color, np.ndarray) and len(color) == 3):
+                colors[i] = color
+        return colors
+
     def getProximitySensor(self, sensor_index=0):
 
         returnCode, detectionState, detectedPoint, detectedObjectHandle, detectedSurfaceNormalVector = vrep.simxReadProximitySensor(
@@ -292,6 +805,11 @@ class robotApi:
             print(returnCode,detectionState,detectedPoint )
             return -1
 
+    def getProximitySensors(self):
+        # detection flags and distances of all proximity sensors, from one streamed simxGetObjectGroupData
+        # read (per sensor: detection state and object handle, then detected point and surface normal)
+        return read_proximity_bank(self.clientID, np.array(self.proxSensors))
+
     def getRobotPose(self):
         returnCode_pose, position = vrep.simxGetObjectPosition(self.clientID, self.robot_base, -1,
                                                                vrep.simx_opmode_buffer)
@@ -310,19 +828,20 @@ class robotApi:
     def setRobotSpeed(self, linear=0.0, angular=0.0):
         right_rotation = (linear + angular * self.robot_width / 2) / self.wheel_radius
         left_rotation = (linear - angular * self.robot_width / 2) / self.wheel_radius
-        vrep.simxPauseCommunication(self.clientID, True)
-        vrep.simxSetJointTargetVelocity(self.clientID, self.right, right_rotation, vrep.simx_opmode_oneshot)
-        vrep.simxSetJointTargetVelocity(self.clientID, self.left, left_rotation, vrep.simx_opmode_oneshot)
-        vrep.simxPauseCommunication(self.clientID, False)
+        self.setJointSpeed(right_rotation, left_rotation)
         
     def setJointSpeed(self,right_rotation,left_rotation):
-        vrep.simxPauseCommunication(self.clientID,True)
-        vrep.simxSetJointTargetVelocity(self.clientID,self.right,right_rotation,vrep.simx_opmode_oneshot)
-        vrep.simxSetJointTargetVelocity(self.clientID,self.left,left_rotation,vrep.simx_opmode_oneshot)
-        vrep.simxPauseCommunication(self.clientID,False)
+        batching = self.actuators.batching
+        self.actuators.begin()
+        self.actuators.write(('joint', self.right), right_rotation, self.__sendRight__)
+        self.actuators.write(('joint', self.left), left_rotation, self.__sendLeft__)
+        if (not batching):
+            self.actuators.commit()
 
 
-    def parseConfig(self, config_file):
+    def parseConfig(self, config_file, scene=None):
+        if scene is None:
+            scene = sceneObjects(self.clientID, self.cache)
         with open(config_file, 'r') as fp:
             for line in fp:
                 ls = line.split(';')
@@ -336,20 +855,125 @@ class robotApi:
                             temp.append(ob[i] + str(j))
                     ob_indexed.extend(temp)
                 tc = trapClass(remoteApi=self.clientID, trap=ls[0], max_range=ls[3], bandgap_range=ls[4], penalty=ls[5],
-                               obejcts_names=ob_indexed)
+                               obejcts_names=ob_indexed, scene=scene)
                 self.traps_dict.update({ls[0]: tc})
 
 
+# several robots of the same model, named like V-REP names copies (no suffix, then '#0', '#1', ...). their
+# proximity sensors and base poses come from shared group data reads and every reading is a (robots, ...)
+# array, so each extra robot only adds its camera and colour sensor buffer reads to a cycle
+class RobotFleet:
+
+    def __init__(self, remoteApi, robots=1, trapConfig=None, robot_base='ePuck_base', cache=None, snapshot=False,
+                 **kwargs):
+        self.clientID = remoteApi
+        self.suffixes = [''] + ['#' + str(i) for i in range(robots - 1)]
+        self.actuators = actuatorClass(self.clientID)
+        # with snapshot, every robot is observed from its own snapshot signal, one streamed read per robot
+        self.snapshot_mode = snapshot
+        scene = sceneObjects(self.clientID, cache) if trapConfig != None else None
+        # only the first robot parses the traps, their state arrays cover the whole fleet
+        self.robots = [robotApi(self.clientID, trapConfig=trapConfig if suffix == '' else None, robot_base=robot_base,
+                                robot_suffix=suffix, actuators=self.actuators, scene=scene, cache=cache,
+                                snapshot=snapshot, **kwargs)
+                       for suffix in self.suffixes]
+
+        self.traps_dict = self.robots[0].traps_dict
+        self.tracker = self.robots[0].tracker
+        self.proxSensors = np.array([robot.proxSensors for robot in self.robots])
+        self.robot_bases = np.array([robot.robot_base for robot in self.robots])
+        self.gps_enabled = np.array([robot.gps_enabled for robot in self.robots])
+
+    def precompute(self):
+        for robot in self.robots:
+            robot.precompute()
+
+    def getCameraImages(self):
+        images = [robot.getCameraImage() for robot in self.robots]
+        return stack_frames([image[0] if isinstance(image, list) else None for image in images])
+
+
+    def getColorSensors(self):
+        return np.stack([robot.getColorSensors() for robot in self.robots])
+
+    def getProximitySensors(self):
+        return read_proximity_bank(self.clientID, self.proxSensors)
+
+    def getRobotPoses(self):
+        # getRobotPose of every robot. the base poses are streamed per robot: a group read would carry the
+        # pose of every object in the scene
+        poses = np.zeros((len(self.robots), 6))
+        for r, robot in enumerate(self.robots):
+            pose = robot.getRobotPose()
+            if (pose is not None):
+                poses[r] = pose
+        return poses
+
+    def observe(self):
+        states = [robot.snapshot() for robot in self.robots] if self.snapshot_mode else [None]
+        if (all(state is not None for state in states)):
+            return {"camera": stack_frames([state["camera"][0] for state in states]),
+                    "colors": np.stack([state["colors"] for state in states]),
+                    "detected": np.stack([state["detected"] for state in states]),
+                    "distances": np.stack([state["distances"] for state in states]),
+                    "pose": np.stack([state["pose"] for state in states])}
+        detected, distances = self.getProximitySensors()
+        return {"camera": self.getCameraImages(), "colors": self.getColorSensors(), "detected": detected,
+                "distances": distances, "pose": self.getRobotPoses()}
+
+    def getRobotPositions(self):
+        # (robots, 3) absolute base positions, whether or not gps is enabled
+        return np.array([robot.getRobotXYZ() for robot in self.robots], dtype=np.float64)
+
+
+    def checkAllTraps(self):
+        # one pass over the traps for all robots, each robot keeps its own trap state
+        return checkTrapsFor(self.traps_dict, self.tracker, self.getRobotPositions())
+
+    def startTrapStreams(self):
+        for robot in self.robots:
+            vrep.simxGetObjectPosition(self.clientID, robot.robot_base, -1, vrep.simx_opmode_streaming)
+        vrep.simxGetPingTime(self.clientID)
+
+
+    def onLane(self, remoteApi):
+        # the same robots over another connection, see robotApi.onLane
+        other = copy.copy(self)
+        other.clientID = remoteApi
+        other.snapshot_mode = False
+        other.actuators = actuatorClass(remoteApi, sent=self.actuators.sent)
+        other.robots = [robot.onLane(remoteApi) for robot in self.robots]
+
+        for robot in other.robots:
+            robot.actuators = other.actuators
+        other.tracker = other.robots[0].tracker
+        return other
+
+
+
 class serverApi:
 
-    def __init__(self, remoteApi, serverConfig=None):
+    def __init__(self, remoteApi, serverConfig=None, cache=None, track_objects=False):
         self.clientID = remoteApi
+        self.cache = cache
+        self.score_call = vrep.PreparedScriptFunction('Game_manager', vrep.sim_scripttype_childscript,
+                                                      'remote_set_score', intCount=1)
+        self.status_call = vrep.PreparedScriptFunction('Game_manager', vrep.sim_scripttype_childscript,
+                                                       'remote_get_sim_status', intCount=1)
+        # integer signal published by simplus_status.lua, streamed once it is first read
+        self.status_signal = 'simplus_status'
+        self.status_streaming = False
         self.actions_dict = None
         if (serverConfig != None):
             self.actions_dict = {}
             self.parseConfig(serverConfig)
+        self.tracker = None
+        if (track_objects and self.actions_dict):
+            self.tracker = objectTracker(self.clientID, self.actions_dict.values())
 
-    def parseConfig(self, config_file):
+    def parseConfig(self, config_file, scene=None):
+        if scene is None:
+            scene = sceneObjects(self.clientID, self.cache)
         with open(config_file, 'r') as fp:
             for line in fp:
                 ls = line.split(';')
@@ -363,33 +987,51 @@ class serverApi:
                             temp.append(ob[i] + str(j))
                     ob_indexed.extend(temp)
                 ac = actionClass(remoteApi=self.clientID, action=ls[0], max_range=float(ls[3]), success_score=float(ls[4]),
-                                 failure_score=float(ls[5]), obejcts_names=ob_indexed)
+                                 failure_score=float(ls[5]), obejcts_names=ob_indexed, scene=scene)
                 self.actions_dict.update({ls[0]: ac})
 
-    def callAction(self, action, x, y, z):
+    def onLane(self, remoteApi):
+        # the same server over another connection, scoring into the same actionClass objects
+        other = copy.copy(self)
+        other.clientID = remoteApi
+        other.status_streaming = False
+        other.score_call = self.score_call.clone()
+        other.status_call = self.status_call.clone()
+        if (self.tracker != None):
+            other.tracker = objectTracker(remoteApi, self.actions_dict.values())
+        return other
+
+    def callAction(self, action, x, y, z, team_id=0):
         if (action in self.actions_dict.keys()):
-            return self.actions_dict.get(action).applyAction(x, y, z)
+            with scoring_lock:
+                if (self.tracker != None):
+                    self.tracker.update()
+                return self.actions_dict.get(action).applyAction(x, y, z, team_id)
         else:
             
             return 0
 
+    def seenObjects(self, action, team_id=0):
+        # names of the objects the team already scored with this action
+        if (action not in self.actions_dict.keys()):
+            return []
+        ac = self.actions_dict.get(action)
+        with scoring_lock:
+            return [ac.obejcts_names[i] for i in sorted(ac.seen.get(team_id, ()))]
+
+    def resetSeen(self, team_id=None):
+        # forget the scored objects of one team, or of every team
+        with scoring_lock:
+            for ac in self.actions_dict.values():
+                if (team_id is None):
+                    ac.seen.clear()
+                else:
+                    ac.seen.pop(team_id, None)
+
     def set_score(self, team_id, team_score,isOneshot=True):
-        if isOneshot:
-           return_code, o_int, o_float, o_string, o_buffer = vrep.simxCallScriptFunction(self.clientID,
-                                                                                      'Game_manager',
-                                                                                      vrep.sim_scripttype_childscript,
-                                                                                      'remote_set_score',
-                                                                                      [team_id], [], [team_score],
-                                                                                      bytearray(),
-                                                                                      vrep.simx_opmode_oneshot)
-        else:
-            return_code, o_int, o_float, o_string, o_buffer = vrep.simxCallScriptFunction(self.clientID,
-                                                                                      'Game_manager',
-                                                                                      vrep.sim_scripttype_childscript,
-                                                                                      'remote_set_score',
-                                                                                      [team_id], [], [team_score],
-                                                                                      bytearray(),
-                                                                                      vrep.simx_opmode_blocking)      
+        operation_mode = vrep.simx_opmode_oneshot if isOneshot else vrep.simx_opmode_blocking
+        return_code, o_int, o_float, o_string, o_buffer = self.score_call(self.clientID, [team_id], [], [team_score],
+                                                                          bytearray(), operation_mode)
         return return_code
 
     def set_name(self, team_name):
@@ -408,27 +1050,52 @@ class serverApi:
             return None
         
     def get_status(self,start=0,isOneshot=False):
-        if isOneshot:
-           return_code, o_int, o_float, o_string, o_buffer = vrep.simxCallScriptFunction(self.clientID,
-                                                                                      'Game_manager',
-                                                                                      vrep.sim_scripttype_childscript,
-                                                                                      'remote_get_sim_status',
-                                                                                      [start], [], [],
-                                                                                      bytearray(),
-                                                                                      vrep.simx_opmode_oneshot)
-        else:
-           return_code, o_int, o_float, o_string, o_buffer = vrep.simxCallScriptFunction(self.clientID,
-                                                                                      'Game_manager',
-                                                                                      vrep.sim_scripttype_childscript,
-                                                                                      'remote_get_sim_status',
-                                                                                      [start], [], [],
-                                                                                      bytearray(),
-                                                                                      vrep.simx_opmode_blocking)
+        operation_mode = vrep.simx_opmode_oneshot if isOneshot else vrep.simx_opmode_blocking
+        return_code, o_int, o_float, o_string, o_buffer = self.status_call(self.clientID, [start], [], [], bytearray(),
+                                                                           operation_mode)
         if len(o_int) >= 1:
             return o_int[0]
         else:
             return None
 
+    def readStatus(self):
+        # run state from the streamed status signal, None until the first value arrives or when the
+        # Game_manager does not publish it. reading the input buffer sends nothing to the simulator
+        if (not self.status_streaming):
+            vrep.simxGetIntegerSignal(self.clientID, self.status_signal, vrep.simx_opmode_streaming)
+            self.status_streaming = True
+        return_code, value = vrep.simxGetIntegerSignal(self.clientID, self.status_signal, vrep.simx_opmode_buffer)
+        if (return_code == vrep.simx_return_ok):
+            return value
+        return None
+
+    def isStarted(self, start=0):
+        if (start):
+            # a start request has to reach the Game_manager until it is acknowledged, so it is sent every time
+            return bool(self.get_status(start))
+        status = self.readStatus()
+
+        if (status is None):
+            status = self.get_status(isOneshot=True)
+        return bool(status)
+
+    def waitForStart(self, synchronous=False, max_delay=0.05, start=0):
+        # returns at once while the game runs. otherwise it polls with a doubling sleep, capped at max_delay
+        # seconds, instead of spinning on script calls. in synchronous mode the simulation only moves when
+        # it is stepped, so it is stepped instead of slept on. with start set, get_status(start) is sent on
+        # every poll until the game answers that it runs
+        delay = 0.001
+        waited = False
+        while (not self.isStarted(start)):
+            waited = True
+            if (not synchronous or self.stepSimulation() == -1):
+                # a step that failed did not move the simulation either, so it is slept on too
+                time.sleep(delay)
+                delay = min(delay * 2, max_delay)
+
+        if (waited):
+            resetActuators()  # the game was stopped or paused, the simulation may have been restarted
+
     def getServerTime(self):
         response = vrep.simxGetServerTimeInMs(vrep.simx_opmode_blocking)
         if (response[0]):
@@ -449,6 +1116,7 @@ class serverApi:
             return -1
 
     def stopSimulation(self):
+        resetActuators()
         response = vrep.simxStopSimulation(self.clientID, operationMode=vrep.simx_opmode_blocking)
         if (response == 0):
             print(response)
@@ -456,6 +1124,7 @@ class serverApi:
             return -1
 
     def startSimulation(self):
+        resetActuators()
         response = vrep.simxStartSimulation(self.clientID, operationMode=vrep.simx_opmode_blocking)
         if (response):
             print("starign simulation")
@@ -472,6 +1141,19 @@ class serverApi:
         else:
             return -1
 
+    def setSynchronous(self, enable=True):
+        # in synchronous mode the simulation only advances when this client calls stepSimulation
+        resetActuators()
+        return vrep.simxSynchronous(self.clientID, enable)
+
+    def stepSimulation(self):
+        # the trigger returns once the step has started, the ping returns once it is done
+        response = vrep.simxSynchronousTrigger(self.clientID)
+        if (response == 0):
+            vrep.simxGetPingTime(self.clientID)
+        else:
+            return -1
+
 
 def show_image(inputimage):
     image_array = (np.array(inputimage[0], dtype=np.uint8))
@@ -492,6 +1174,7 @@ def main():
     time.sleep(0.1)
     ra = vapi.init_robotApi()
 #     #scratch
+#     import simplus_scratch
 #     st=simplus_scratch.ScratchThread(vapi,ra,sa)
 #     st.start()
     #endscratch
@@ -512,9 +1195,7 @@ def main():
     my_team_id = max(r, my_team_id)
     testtime=time.time_ns()
     while True:
-        is_started = sa.get_status(isOneshot=True)
-        while not is_started:
-           is_started = sa.get_status(isOneshot=True)
+        sa.waitForStart()
 
         obstacle = 0
         col0 = ra.getColorSensor(0)
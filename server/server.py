@@ -1,4 +1,6 @@
 from __future__ import print_function
+import argparse
+import asyncio
 import logging
 
 import grpc
@@ -7,28 +9,363 @@ import simplus_pb2
 import simplus_pb2_grpc
 from robotApi import *
 import time
-import array
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 import simplus_scratch
+from simplus_metrics import CycleMetrics, NULL_METRICS
 
 
-def run():
+def robot_observation(image, colors, detected, distances, pos, gps_enabled):
+    return simplus_pb2.Observation(
+        camera=simplus_pb2.Image(w=image[1], h=image[2], raw=image[0].tobytes()),
+        colors=[simplus_pb2.Pixel(r=colors[i][0], g=colors[i][1], b=colors[i][2]) for i in range(3)],
+        distances=[simplus_pb2.Proximity(detected=d, distance=x)
+                   for d, x in zip(detected.tolist(), distances.tolist())],
+        pos=simplus_pb2.Position(x=pos[0], y=pos[1], z=pos[2], roll=pos[3], pitch=pos[4], yaw=pos[5],
+                                 gps_enabled=gps_enabled)
+    )
 
-     vapi = VrepApi()
-     sa = vapi.init_serverApi()
+
+def get_fleet_observations(fleet, cycle, metrics=NULL_METRICS):
+    state = fleet.observe()
+    metrics.lap('fleet')
+    camera = state["camera"]
+    observations = simplus_pb2.Observations(
+        server=simplus_pb2.ServerInfo(time=cycle, server_state='running', my_score=0, opp_score=1),
+        robots=[robot_observation([camera[i], camera.shape[2], camera.shape[1]], state["colors"][i],
+                                  state["detected"][i], state["distances"][i], state["pose"][i].tolist(),
+                                  bool(fleet.gps_enabled[i])) for i in range(len(fleet.robots))]
+    )
+    metrics.lap('encode')
+    return observations
+
+
+def get_observations(ra, cycle, snapshot=False, metrics=NULL_METRICS):
+    # the phases after the message is built (serialization included) are timed as part of the Action call
+    if isinstance(ra, RobotFleet):
+        return get_fleet_observations(ra, cycle, metrics)
+    state = ra.snapshot() if snapshot else None
+    if snapshot:
+        metrics.lap('snapshot')
+    if state is not None:
+        image = state["camera"]
+        colors = state["colors"]
+        detected, distances = state["detected"], state["distances"]
+        pos = state["pose"].tolist()
+    else:
+        image = ra.getCameraImage()
+        metrics.lap('camera')
+
+        colors = ra.getColorSensors()
+        metrics.lap('colors')
+
+        detected, distances = ra.getProximitySensors()
+        metrics.lap('proximity')
+
+        pos = ra.getRobotPose()
+        metrics.lap('pose')
+
+    observations = simplus_pb2.Observations(
+        server=simplus_pb2.ServerInfo(time=cycle, server_state='running', my_score=0, opp_score=1),
+        robots=[robot_observation(image, colors, detected, distances, pos, ra.gps_enabled)]
+    )
+    metrics.lap('encode')
+    return observations
+
+
+def apply_commands(ra, sa, response, team_id=0):
+    score = 0
+    # each command goes to the robot with its id, a single robot is id 0. commands for robots that do not
+    # exist are dropped
+    robots = ra.robots if isinstance(ra, RobotFleet) else [ra]
+    # wheel and LED changes of the whole cycle go out in one batch
+    ra.actuators.begin()
+    for res in response.commands:
+#         print('Robot ' + str(res.id) + ' Command: ' + str(res.linear) + ' ' + str(res.angular) + ' LED: ' + res.LED)
+        if not 0 <= res.id < len(robots):
+            logging.warning("ignoring command for robot %d, there are %d robots", res.id, len(robots))
+            continue
+        robot = robots[res.id]
+        robot.setRobotSpeed(linear=res.linear, angular=res.angular)
+        robot.setLED(color=res.LED)
+        for action in res.actions:
+            score += sa.callAction(action.type, action.x, action.y, action.z, team_id)
+    ra.actuators.commit()
+    return score
+
+
+def start_synchronous(sa):
+    # returns whether the simulation is now stepped by this client. the scene's remote API server has to be
+    # started with the synchronous trigger enabled, otherwise the game runs asynchronously
+    if sa.setSynchronous(True) != 0:
+        logging.warning("the remote API server does not accept synchronous mode, running asynchronously")
+        return False
+    return True
+
+
+def wait_for_start(sa, synchronous=False):
+    # in synchronous mode the simulation is stepped until the game manager reports that the game runs
+    sa.waitForStart(synchronous)
+
+
+class CycleScheduler:
+    # paces a game loop at a fixed cycle rate. every cycle has a deadline on the monotonic clock, one period
+    # after the previous one. a cycle that finishes early sleeps until its deadline; one that overruns by whole
+    # periods skips those deadlines instead of running a burst of short cycles to catch up
+    def __init__(self, rate, clock=time.monotonic, sleep=time.sleep):
+        self.period = 1.0 / rate
+        self.clock = clock
+        self.sleep = sleep
+        self.deadline = None
+        self.started = None
+        self.slack = []  # seconds each cycle finished before its deadline, negative when late
+        self.periods = []  # seconds between the starts of consecutive cycles
+        self.skipped = 0
+
+    def delay(self):
+        # seconds to sleep before the next cycle starts
+        now = self.clock()
+        if self.deadline is None:
+            return 0.0
+        self.slack.append(self.deadline - now)
+        if now - self.deadline >= self.period:
+            missed = int((now - self.deadline) // self.period)
+            self.skipped += missed
+            self.deadline += missed * self.period
+        return max(self.deadline - now, 0.0)
+
+    def begin(self):
+        now = self.clock()
+        if self.deadline is None:
+            self.deadline = now
+        else:
+            self.periods.append(now - self.started)
+        self.started = now
+        self.deadline += self.period
+
+    def wait(self):
+        self.sleep(self.delay())
+        self.begin()
+
+    async def wait_async(self):
+        await asyncio.sleep(self.delay())
+        self.begin()
+
+    def summary(self):
+        if len(self.periods) == 0:
+            return {}
+        periods = np.array(self.periods) * 1000
+        slack = np.array(self.slack) * 1000
+        return {"rate": 1.0 / self.period,
+                "cycles": len(self.periods) + 1,
+                "period_ms": dict(("p%d" % p, float(np.percentile(periods, p))) for p in (50, 90, 99, 100)),
+                "late": int((slack < 0).sum()),
+                "worst_late_ms": float(max(-slack.min(), 0)),
+                "skipped": self.skipped}
+
+    def report(self):
+        summary = self.summary()
+        if summary:
+            print("cycle rate = %.1f Hz, cycles = %d, late = %d, skipped = %d, worst late = %.2f ms"
+                  % (summary["rate"], summary["cycles"], summary["late"], summary["skipped"],
+                     summary["worst_late_ms"]))
+            print("cycle period ms: " + ", ".join("%s=%.2f" % (k, v) for k, v in summary["period_ms"].items()))
+
+
+def play(ra, sa, stub, game_duration, my_team_id, scorer=None, snapshot=False, synchronous=False, rate=None,
+         metrics=NULL_METRICS):
+    if scorer is None:
+        scorer = sa
+    scheduler = CycleScheduler(rate) if rate else None
+    team_score = 0
+    i = 0
+    start_time = time.time()
+    for i in range(game_duration):
+        if scheduler is not None:
+            scheduler.wait()
+        metrics.start()
+        wait_for_start(sa, synchronous)
+        metrics.lap('status')
+
+        observations = get_observations(ra, i, snapshot=snapshot, metrics=metrics)
+        response = stub.Action(observations)
+        metrics.lap('action')
+
+        team_score += apply_commands(ra, sa, response, my_team_id)
+        metrics.lap('actuation')
+
+        team_score += ra.checkAllTraps()
+
+        scorer.set_score(my_team_id, str(team_score))
+        metrics.lap('scoring')
+
+        if synchronous:
+            sa.stepSimulation()
+            metrics.lap('step')
+        metrics.end()
+    if synchronous and game_duration > 0:
+        print("steps per second =", game_duration / (time.time() - start_time))
+    if scheduler is not None:
+        scheduler.report()
+    return i, team_score
+
+
+def play_pipelined(ra, sa, stub, game_duration, my_team_id, scorer=None, snapshot=False, synchronous=False,
+                   rate=None, metrics=NULL_METRICS):
+    # while the player thinks about cycle i, the simulation steps and the observation of cycle i+1 is read
+    # and encoded. the commands of cycle i therefore act on the state the player saw one cycle earlier than
+    # in play. trap checks and score updates run on a worker thread, in cycle order. the action and scoring
+    # phases measure how long the loop waits for the reply and for the previous score update
+    if scorer is None:
+        scorer = sa
+    totals = [0]
+    # the worker checks the traps through its own copy of the robots, on the scorer's connection, so it shares
+    # no prepared call, stream and tracker with the loop even when both use the control connection. the trap
+    # state itself is shared under scoring_lock
+    score_ra = ra.onLane(scorer.clientID)
+    score_ra.startTrapStreams()
+
+    def score(action_score):
+        totals[0] += action_score
+        totals[0] += score_ra.checkAllTraps()
+        scorer.set_score(my_team_id, str(totals[0]))
+
+    scheduler = CycleScheduler(rate) if rate else None
+    i = 0
+    start_time = time.time()
+    scoring = ThreadPoolExecutor(max_workers=1)
+    scored = None
+    try:
+        if game_duration > 0:
+            # the first observation is read before the loop, in a cycle of its own
+            metrics.start()
+            wait_for_start(sa, synchronous)
+            metrics.lap('status')
+            observations = get_observations(ra, 0, snapshot=snapshot, metrics=metrics)
+            metrics.end()
+        for i in range(game_duration):
+            if scheduler is not None:
+                scheduler.wait()
+            metrics.start()
+            call = stub.Action.future(observations)
+
+            if synchronous:
+                sa.stepSimulation()
+                metrics.lap('step')
+            if i + 1 < game_duration:
+                wait_for_start(sa, synchronous)
+                metrics.lap('status')
+                observations = get_observations(ra, i + 1, snapshot=snapshot, metrics=metrics)
+
+            response = call.result()
+            metrics.lap('action')
+            action_score = apply_commands(ra, sa, response, my_team_id)
+            metrics.lap('actuation')
+
+            if scored is not None:
+                scored.result()
+            scored = scoring.submit(score, action_score)
+            metrics.lap('scoring')
+            metrics.end()
+        if scored is not None:
+            scored.result()
+    finally:
+        scoring.shutdown(wait=True)
+    if synchronous and game_duration > 0:
+        print("steps per second =", game_duration / (time.time() - start_time))
+    if scheduler is not None:
+        scheduler.report()
+    return i, totals[0]
+
+
+async def play_async(ra, sa, stub, game_duration, my_team_id, scorer=None, snapshot=False, synchronous=False,
+                     cycle_deadline=0.1, rate=None, metrics=NULL_METRICS):
+    # the same cycle as play, on an asyncio loop with a grpc.aio stub. every cycle has cycle_deadline seconds
+    # from its start, and the player gets what is left after the sensor reads. a reply that misses it is
+    # cancelled and the robots keep their last command. remote API calls block, so they run on one worker
+    # thread, which also keeps them in order on the control lane
+    if scorer is None:
+        scorer = sa
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=1)
+    scheduler = CycleScheduler(rate) if rate else None
+
+    def remote(fn, *args):
+        return loop.run_in_executor(executor, fn, *args)
+
+    team_score = 0
+    late = 0
+    i = 0
+    start_time = time.time()
+    try:
+        for i in range(game_duration):
+            if scheduler is not None:
+                await scheduler.wait_async()
+            metrics.start()
+            deadline = loop.time() + cycle_deadline
+            await remote(wait_for_start, sa, synchronous)
+            metrics.lap('status')
+
+            observations = await remote(get_observations, ra, i, snapshot, metrics)
+
+            try:
+                response = await stub.Action(observations, timeout=max(deadline - loop.time(), 0))
+            except grpc.RpcError as err:
+                if err.code() not in (grpc.StatusCode.DEADLINE_EXCEEDED, grpc.StatusCode.CANCELLED):
+                    raise
+                late += 1
+                response = None
+            metrics.lap('action')
+
+            if response is not None:
+                team_score += await remote(apply_commands, ra, sa, response, my_team_id)
+                metrics.lap('actuation')
+
+            team_score += await remote(ra.checkAllTraps)
+
+            await remote(scorer.set_score, my_team_id, str(team_score))
+            metrics.lap('scoring')
+
+            if synchronous:
+                await remote(sa.stepSimulation)
+                metrics.lap('step')
+            metrics.end()
+    finally:
+        executor.shutdown(wait=True)
+    if late > 0:
+        print("late responses =", late)
+    if synchronous and game_duration > 0:
+        print("steps per second =", game_duration / (time.time() - start_time))
+    if scheduler is not None:
+        scheduler.report()
+    return i, team_score
+
+
+async def play_aio(target, options, ra, sa, game_duration, my_team_id, **kwargs):
+    # grpc.aio needs grpcio 1.32 or later, the blocking loops do not
+    async with grpc.aio.insecure_channel(target=target, options=options) as channel:
+        stub = simplus_pb2_grpc.SimPlusStub(channel)
+        return await play_async(ra, sa, stub, game_duration, my_team_id, **kwargs)
+
+
+def run(snapshot=False, synchronous=False, color_aux=False, robots=1, cache_file=None,
+        track_objects=False, pipeline=False, use_asyncio=False, cycle_deadline=0.1, rate=None, metrics=False,
+        metrics_port=None):
+
+     vapi = VrepApi(lanes=("control", "scratch", "scorer"), cache_file=cache_file)
+     sa = vapi.init_serverApi(track_objects=track_objects)
 #     
-     is_started = False
-     while not is_started:
+     if not sa.get_status(1):
          print("Please click on the play button")
-         is_started = sa.get_status(1)
+         sa.waitForStart(start=1)
 #     # sa.startSimulation()
      print("step1")
      time.sleep(0.1)
-     with grpc.insecure_channel(
-             target='localhost:50051',
-             options=[('grpc.lb_policy_name', 'pick_first'),
-                      ('grpc.enable_retries', 0), ('grpc.keepalive_timeout_ms',
-                                                   10000)]) as channel:
+     target = 'localhost:50051'
+     options = [('grpc.lb_policy_name', 'pick_first'),
+                ('grpc.enable_retries', 0), ('grpc.keepalive_timeout_ms',
+                                             10000)]
+     with grpc.insecure_channel(target=target, options=options) as channel:
       stub = simplus_pb2_grpc.SimPlusStub(channel)
 #       # Timeout in seconds.
       try:
@@ -47,57 +384,48 @@ def run():
         if r is None:
             r=0
         my_team_id = max(r, my_team_id)
-        ra = vapi.init_robotApi()
+        color_sensor = {"num": 1, "name": 'lightSensor', "aux": color_aux}
+        if robots > 1:
+            ra = vapi.init_robotFleet(robots, color_sensor=color_sensor, track_objects=track_objects,
+                                      snapshot=snapshot)
+        else:
+            ra = vapi.init_robotApi(color_sensor=color_sensor, track_objects=track_objects, snapshot=snapshot)
         print("start precompute")
         ra.precompute()
         print("end precompute")
-        st=simplus_scratch.ScratchThread(vapi,ra,sa)
+        # Scratch drives and scores the same robot over its own lane, with the victims and traps it found
+        # shared with the game loop
+        scratch_ra = (ra.robots[0] if isinstance(ra, RobotFleet) else ra).onLane(vapi.lane("scratch"))
+        scratch_ra.precompute()
+        scratch_sa = sa.onLane(vapi.lane("scratch"))
+        st=simplus_scratch.ScratchThread(vapi,scratch_ra,scratch_sa)
         st.start()
         print("Start")
-        team_score = 0
         team_name = response.name
-        for i in range(game_duration):
-            #testtime=time.time_ns()
-            is_started = sa.get_status(isOneshot=True)
-            while not is_started:
-                is_started = sa.get_status(isOneshot=True)
-            a = time.process_time()
-
-            image = ra.getCameraImage()
-            
-            image_array = np.array(image[0], dtype=np.uint8)
-
-            colors = [ra.getColorSensor(i) for i in range(3)]
-
-            proxim = [ra.getProximitySensor(i) for i in range(8)]
-
-            pos = ra.getRobotPose()
-
-            response = stub.Action(
-                simplus_pb2.Observations(
-                    server=simplus_pb2.ServerInfo(time=i, server_state='running', my_score=0, opp_score=1),
-                    robots=[simplus_pb2.Observation(
-                        camera=simplus_pb2.Image(w=image[1], h=image[2], raw=array.array('B', image_array).tobytes()),
-                        colors=[simplus_pb2.Pixel(r=colors[i][0], g=colors[i][1], b=colors[i][2]) for i in range(3)],
-                        distances=[simplus_pb2.Proximity(detected=proxim[i][0], distance=proxim[i][1]) for i in range(8)],
-                        pos=simplus_pb2.Position(x=pos[0], y=pos[1], z=pos[2], roll=pos[3], pitch=pos[4], yaw=pos[5],
-                                                 gps_enabled=ra.gps_enabled)
-                    ) for i in range(1)]
-                )
-            )
-
-            for res in response.commands:
-#                 print('Robot ' + str(res.id) + ' Command: ' + str(res.linear) + ' ' + str(res.angular) + ' LED: ' + res.LED)
-                ra.setRobotSpeed(linear=res.linear, angular=res.angular)
-                ra.setLED(color=res.LED)
-                for action in res.actions:
-                    team_score += sa.callAction(action.type, action.x, action.y, action.z)
-
-            team_score += ra.checkAllTraps()
-
-            sa.set_score(my_team_id, str(team_score))
-            #print("dif time =",1000000000/(time.time_ns()-testtime))
-            #testtime=time.time_ns()
+        scorer = vapi.init_serverApi(serverConfig=None, lane="scorer")
+        cycle_metrics = NULL_METRICS
+        if metrics or metrics_port is not None:
+            cycle_metrics = CycleMetrics()
+            if metrics_port is not None:
+                print("metrics on http://localhost:%d/metrics" % cycle_metrics.serve(metrics_port))
+        if synchronous:
+            synchronous = start_synchronous(sa)
+        try:
+            if use_asyncio:
+                i, team_score = asyncio.run(play_aio(target, options, ra, sa, game_duration, my_team_id,
+                                                     scorer=scorer, snapshot=snapshot, synchronous=synchronous,
+                                                     cycle_deadline=cycle_deadline, rate=rate,
+                                                     metrics=cycle_metrics))
+            else:
+                game = play_pipelined if pipeline else play
+                i, team_score = game(ra, sa, stub, game_duration, my_team_id, scorer=scorer, snapshot=snapshot,
+                                     synchronous=synchronous, rate=rate, metrics=cycle_metrics)
+        finally:
+            # a simulation left in synchronous mode stops advancing, also when the game ends with an error
+            if synchronous:
+                sa.setSynchronous(False)
+        if cycle_metrics is not NULL_METRICS:
+            cycle_metrics.report()
         response = stub.End(
             simplus_pb2.Ending(server=simplus_pb2.ServerInfo(time=i, server_state='running', my_score=0, opp_score=1)))
         print('END IS: ' + response.message)
@@ -109,8 +437,9 @@ def run():
           if r is None:
               r=0
           my_team_id = max(r, 0)
-          ra = vapi.init_robotApi()
-          st=simplus_scratch.ScratchThread(vapi,ra,sa)
+          ra = vapi.init_robotApi(lane="scratch", track_objects=track_objects)
+          ra.precompute()
+          st=simplus_scratch.ScratchThread(vapi,ra,sa.onLane(vapi.lane("scratch")))
           st.start()
           print("Start")
           team_score = 0
@@ -118,12 +447,40 @@ def run():
           counter=0
           while True: 
 
-             while not is_started:
-                  is_started = sa.get_status() 
+             sa.waitForStart()
              time.sleep(0.25)
              counter += 1
              if (counter > 1000): break
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--snapshot', action='store_true',
+                        help='read all sensors from the signal published by simplus_snapshot.lua')
+    parser.add_argument('--synchronous', action='store_true',
+                        help='step the simulation once per game cycle with simxSynchronousTrigger')
+    parser.add_argument('--color-aux', action='store_true',
+                        help='read the colour sensors from their average colour aux packet instead of their images')
+    parser.add_argument('--robots', type=int, default=1,
+                        help='number of team robots, named like V-REP copies of the first one')
+    parser.add_argument('--cache', default=None, metavar='FILE',
+                        help='keep robot widths in FILE between starts with the same scene. off by default')
+    parser.add_argument('--track-objects', action='store_true',
+                        help='follow victims and traps that move during the game, not just their start positions')
+    parser.add_argument('--pipeline', action='store_true',
+                        help='read the next observation while the player computes the current commands')
+    parser.add_argument('--asyncio', action='store_true',
+                        help='run the game loop on asyncio and grpc.aio, with a deadline for every cycle')
+    parser.add_argument('--cycle-deadline', type=float, default=100,
+                        help='milliseconds a cycle may take with --asyncio before the player reply is dropped')
+    parser.add_argument('--rate', type=float, default=None,
+                        help='game cycles per second. by default every cycle starts as soon as the previous one ends')
+    parser.add_argument('--metrics', action='store_true',
+                        help='time every phase of the game cycle and print a summary at the end of the match')
+    parser.add_argument('--metrics-port', type=int, default=None,
+                        help='also serve the cycle timings in the Prometheus text format on this local port')
+    args = parser.parse_args()
     logging.basicConfig()
-    run()
+    run(snapshot=args.snapshot, synchronous=args.synchronous, color_aux=args.color_aux, robots=args.robots,
+        cache_file=args.cache, track_objects=args.track_objects, pipeline=args.pipeline, use_asyncio=args.asyncio,
+        cycle_deadline=args.cycle_deadline / 1000.0, rate=args.rate, metrics=args.metrics,
+        metrics_port=args.metrics_port)
@@ -0,0 +1,152 @@
+#Timing of the phases of the server game cycle.
+#The game loop calls start() at the top of a cycle, lap(phase) after each phase and end() at the bottom. Every
+#lap lands in a fixed-bucket histogram, so recording costs one clock read and one bisect. The histograms can be
+#served in the Prometheus text format with serve(port) and printed as a table with report() after the match.
+#The HTTP thread reads them under the same lock the loop records under, so a scrape never sees half a lap.
+
+import bisect
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+# bucket upper bounds in seconds, six steps a decade from 10 us to 10 s
+BUCKETS = [float('%g' % (m * 10.0 ** e)) for e in range(-5, 1) for m in (1, 1.5, 2, 3, 5, 7)] + [10.0]
+
+PHASES = ['status', 'snapshot', 'camera', 'colors', 'proximity', 'pose', 'fleet', 'encode', 'action', 'actuation',
+          'scoring', 'step']
+
+
+class Histogram:
+    def __init__(self, bounds=BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # the last bucket is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q):
+        # interpolated inside the bucket that holds the q-th value, like Prometheus histogram_quantile
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for bound, count in zip(self.bounds, self.counts):
+            if count > 0 and seen + count >= rank:
+                return min(lower + (bound - lower) * (rank - seen) / count, self.max)
+            seen += count
+            lower = bound
+        return self.max
+
+
+class CycleMetrics:
+    def __init__(self, phases=PHASES, clock=time.perf_counter):
+        self.clock = clock
+        self.phases = dict((phase, Histogram()) for phase in phases)
+        self.cycle = Histogram()
+        self.started = None
+        self.last = None
+        self.server = None
+        self.lock = threading.Lock()
+
+    def start(self):
+        self.started = self.last = self.clock()
+
+    def lap(self, phase):
+        # time since the previous lap, or since start, goes to phase
+        now = self.clock()
+        with self.lock:
+            self.phases[phase].observe(now - self.last)
+        self.last = now
+
+    def end(self):
+        self.last = self.clock()
+        with self.lock:
+            self.cycle.observe(self.last - self.started)
+
+    def prometheus(self):
+        lines = ['# HELP simplus_cycle_phase_seconds Time spent in each phase of the server game cycle.',
+                 '# TYPE simplus_cycle_phase_seconds histogram']
+        with self.lock:
+            for phase, histogram in self.phases.items():
+                lines += self.histogram_lines('simplus_cycle_phase_seconds', histogram, 'phase="%s",' % phase)
+            lines += ['# HELP simplus_cycle_seconds Time from the start to the end of a server game cycle.',
+                      '# TYPE simplus_cycle_seconds histogram']
+            lines += self.histogram_lines('simplus_cycle_seconds', self.cycle, '')
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def histogram_lines(name, histogram, labels):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(histogram.bounds + ['+Inf'], histogram.counts):
+            cumulative += count
+            lines.append('%s_bucket{%sle="%s"} %d' % (name, labels, bound if bound == '+Inf' else repr(bound),
+                                                      cumulative))
+        labels = '{' + labels.rstrip(',') + '}' if labels else ''
+        lines.append('%s_sum%s %r' % (name, labels, histogram.sum))
+        lines.append('%s_count%s %d' % (name, labels, histogram.count))
+        return lines
+
+    def serve(self, port, host='localhost'):
+        # answers every GET with the Prometheus text, from a daemon thread
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = metrics.prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = HTTPServer((host, port), Handler)
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        return self.server.server_address[1]
+
+    def shutdown(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def report(self):
+        # per phase: how often it ran, its mean and bucketed percentiles in ms, and its share of the cycle time
+        if self.cycle.count == 0:
+            return
+        print("%-10s %8s %9s %9s %9s %9s %9s %6s" % ("phase", "count", "mean ms", "p50 ms", "p90 ms", "p99 ms",
+                                                     "max ms", "share"))
+        rows = [(phase, histogram) for phase, histogram in self.phases.items() if histogram.count > 0]
+        for phase, histogram in rows + [('cycle', self.cycle)]:
+            print("%-10s %8d %9.3f %9.3f %9.3f %9.3f %9.3f %5.1f%%" % (
+                phase, histogram.count, histogram.sum / histogram.count * 1e3, histogram.quantile(0.5) * 1e3,
+                histogram.quantile(0.9) * 1e3, histogram.quantile(0.99) * 1e3, histogram.max * 1e3,
+                histogram.sum / self.cycle.sum * 100))
+
+
+class NullMetrics:
+    # stands in for CycleMetrics when the loop is not instrumented
+    def start(self):
+        pass
+
+    def lap(self, phase):
+        pass
+
+    def end(self):
+        pass
+
+
+NULL_METRICS = NullMetrics()
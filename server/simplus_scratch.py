@@ -62,10 +62,10 @@ class ScratchApi(Bottle):
             response.headers["Set-Cookie"]= 'SameSite=None;Secure'
             number=request.GET.get('number', '').strip()
         #     print(number)
-            proximity=self.rapi.getProximitySensor(int(number))
+            detected,distances=self.rapi.getProximitySensors()
             value=100000
-            if(proximity[0]==True):
-                value=proximity[1]
+            if(detected[int(number)]):
+                value=float(distances[int(number)])
             print(value)
             return str(value);
 
@@ -165,8 +165,7 @@ class ScratchApi(Bottle):
             print("get_sim_status");
             self.team_score += self.rapi.checkAllTraps()
             self.sapi.set_score(1, str(self.team_score))
-            is_started = False
-            is_started = self.sapi.get_status()
+            is_started = self.sapi.isStarted()
             value=1
             if not is_started:
                 value=-1
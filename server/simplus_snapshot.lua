@@ -0,0 +1,75 @@
+-- Simplus sensor snapshot
+-- Packs every reading the server sends to the player into one string signal, so robotApi.snapshot() gets
+-- the whole observation with a single streamed read instead of a dozen remote API calls.
+-- Add it to the e-puck child script: call simplus_snapshot_init('ePuck_') from sysCall_init and
+-- simplus_snapshot_publish() from sysCall_sensing. In a copy of the robot the script has the copy's '#n' name
+-- suffix, and the helper reads that copy's base and sensors. The base is '<namespace>base' unless baseName is given.
+--
+-- Signal '<namespace>snapshot' (with the '#n' name suffix for copies of the robot), little-endian:
+--   float32 header  : version, camera resolution x, camera resolution y, proximity sensor count, colour sensor count
+--   float32 pose    : x, y, z, alpha, beta, gamma (absolute, radians)
+--   float32 proximity detected flags (0/1), then proximity distances (0 when nothing is detected)
+--   float32 colour  : r, g, b of pixel 8 of each colour sensor
+--   uint8   camera  : resolution x * resolution y * 3 bytes, as returned by sim.getVisionSensorCharImage
+
+simplus_snapshot = {}
+
+-- handle of the object named name in the same copy of the robot as this script
+function simplus_snapshot_handle(name)
+    local suffix = sim.getNameSuffix(nil)
+    if suffix >= 0 then
+        return sim.getObjectHandle(name .. '#' .. suffix)
+    end
+    return sim.getObjectHandle(name .. '#')
+end
+
+function simplus_snapshot_init(namespace, proximityCount, baseName)
+    proximityCount = proximityCount or 8
+    baseName = baseName or namespace .. 'base'
+    local suffix = sim.getNameSuffix(nil)
+    simplus_snapshot.signal = namespace .. 'snapshot'
+    if suffix >= 0 then
+        simplus_snapshot.signal = simplus_snapshot.signal .. '#' .. suffix
+    end
+    simplus_snapshot.base = simplus_snapshot_handle(baseName)
+    simplus_snapshot.camera = simplus_snapshot_handle(namespace .. 'camera')
+    simplus_snapshot.proximity = {}
+    for i = 1, proximityCount do
+        simplus_snapshot.proximity[i] = simplus_snapshot_handle(namespace .. 'proxSensor' .. i)
+    end
+    simplus_snapshot.colors = {}
+    for i, side in ipairs({'', '_l', '_r'}) do
+        simplus_snapshot.colors[i] = simplus_snapshot_handle(namespace .. 'lightSensor' .. side)
+    end
+end
+
+function simplus_snapshot_publish()
+    local s = simplus_snapshot
+    local image, resX, resY = sim.getVisionSensorCharImage(s.camera)
+    local data = {1, resX, resY, #s.proximity, #s.colors}
+
+    local position = sim.getObjectPosition(s.base, -1)
+    local orientation = sim.getObjectOrientation(s.base, -1)
+    for i = 1, 3 do data[#data + 1] = position[i] end
+    for i = 1, 3 do data[#data + 1] = orientation[i] end
+
+    local distances = {}
+    for i = 1, #s.proximity do
+        local result, distance = sim.readProximitySensor(s.proximity[i])
+        if result > 0 then
+            data[#data + 1] = 1
+            distances[i] = distance
+        else
+            data[#data + 1] = 0
+            distances[i] = 0
+        end
+    end
+    for i = 1, #s.proximity do data[#data + 1] = distances[i] end
+
+    for i = 1, #s.colors do
+        local pixels = sim.getVisionSensorCharImage(s.colors[i])
+        for j = 25, 27 do data[#data + 1] = string.byte(pixels, j) end
+    end
+
+    sim.setStringSignal(s.signal, sim.packFloatTable(data) .. image)
+end
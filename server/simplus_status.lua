@@ -0,0 +1,23 @@
+-- Simplus game status signal
+-- Publishes the game run state as an integer signal, so serverApi.waitForStart() can read it from the stream
+-- that the remote API keeps in its input buffer instead of calling remote_get_sim_status over and over.
+-- Add it to the Game_manager child script: call simplus_status_publish(started) from sysCall_sensing, with
+-- started true while the game runs, and simplus_status_clear() from sysCall_cleanup.
+--
+-- Signal 'simplus_status': 1 while the game runs, 0 otherwise. When it is missing the server falls back to
+-- remote_get_sim_status.
+
+simplus_status = {signal = 'simplus_status', value = nil}
+
+function simplus_status_publish(started)
+    local value = started and 1 or 0
+    if value ~= simplus_status.value then
+        sim.setIntegerSignal(simplus_status.signal, value)
+        simplus_status.value = value
+    end
+end
+
+function simplus_status_clear()
+    sim.clearIntegerSignal(simplus_status.signal)
+    simplus_status.value = nil
+end
@@ -1,145 +1,206 @@
 import platform
-import struct
 import sys
 import os
+import threading
 import ctypes as ct
+import numpy as np
 from vrepConst import *
 
 #load library
+#the library and the ctypes prototypes below are only bound on first use, so importing this module is cheap
 libsimx = None
-try:
-    file_extension = '.so'
-    if platform.system() =='cli':
-        file_extension = '.dll'
-    elif platform.system() =='Windows':
-        file_extension = '.dll'
-    elif platform.system() == 'Darwin':
-        file_extension = '.dylib'
-    else:
-        file_extension = '.so'
-    libfullpath = os.path.join(os.path.dirname(__file__), 'remoteApi' + file_extension)
-    libsimx = ct.CDLL(libfullpath)
-except:
-    libfullpath = os.path.join(os.path.dirname(__file__), 'remoteApi32.dll')
-    libsimx = ct.CDLL(libfullpath)
-    '''
-    print ('----------------------------------------------------')
-    print ('The remoteApi library could not be loaded. Make sure')
-    print ('it is located in the same folder as "vrep.py", or')
-    print ('appropriately adjust the file "vrep.py"')
-    print ('----------------------------------------------------')
-    print ('')
-    '''
+_bindLock = threading.Lock()
+
+def _loadLibrary():
+    global libsimx
+    with _bindLock:
+        if libsimx is not None:
+            return libsimx
+        try:
+            file_extension = '.so'
+            if platform.system() =='cli':
+                file_extension = '.dll'
+            elif platform.system() =='Windows':
+                file_extension = '.dll'
+            elif platform.system() == 'Darwin':
+                file_extension = '.dylib'
+            else:
+                file_extension = '.so'
+            libfullpath = os.path.join(os.path.dirname(__file__), 'remoteApi' + file_extension)
+            libsimx = ct.CDLL(libfullpath)
+        except:
+            libfullpath = os.path.join(os.path.dirname(__file__), 'remoteApi32.dll')
+            libsimx = ct.CDLL(libfullpath)
+            '''
+            print ('----------------------------------------------------')
+            print ('The remoteApi library could not be loaded. Make sure')
+            print ('it is located in the same folder as "vrep.py", or')
+            print ('appropriately adjust the file "vrep.py"')
+            print ('----------------------------------------------------')
+            print ('')
+            '''
+        return libsimx
+
+class _LazyPrototype(object):
+    '''
+    Placeholder for a ctypes prototype. The first call loads the library, builds the real prototype and
+    replaces the placeholder in the module globals, so later calls go straight to ctypes
+    '''
+
+    def __init__(self, functionName, restype, *argtypes):
+        self.functionName = functionName
+        self.restype = restype
+        self.argtypes = argtypes
+
+    def bind(self):
+        prototype = ct.CFUNCTYPE(self.restype, *self.argtypes)((self.functionName, _loadLibrary()))
+        globals()['c_' + self.functionName[len('simx'):]] = prototype
+        return prototype
+
+    def __call__(self, *args):
+        return self.bind()(*args)
+
+def simxBindRemoteApi():
+    '''
+    Loads the remoteApi library and binds every prototype now instead of on first use
+    '''
+    for name, prototype in list(globals().items()):
+        if isinstance(prototype, _LazyPrototype):
+            prototype.bind()
+    return libsimx
 
 #ctypes wrapper prototypes
-c_GetJointPosition          = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxGetJointPosition", libsimx))
-c_SetJointPosition          = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_float, ct.c_int32)(("simxSetJointPosition", libsimx))
-c_GetJointMatrix            = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxGetJointMatrix", libsimx))
-c_SetSphericalJointMatrix   = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxSetSphericalJointMatrix", libsimx))
-c_SetJointTargetVelocity    = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_float, ct.c_int32)(("simxSetJointTargetVelocity", libsimx))
-c_SetJointTargetPosition    = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_float, ct.c_int32)(("simxSetJointTargetPosition", libsimx))
-c_GetJointForce             = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxGetJointForce", libsimx))
-c_SetJointForce             = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_float, ct.c_int32)(("simxSetJointForce", libsimx))
-c_ReadForceSensor           = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_ubyte), ct.POINTER(ct.c_float), ct.POINTER(ct.c_float), ct.c_int32)(("simxReadForceSensor", libsimx))
-c_BreakForceSensor          = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32)(("simxBreakForceSensor", libsimx))
-c_ReadVisionSensor          = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_ubyte), ct.POINTER(ct.POINTER(ct.c_float)), ct.POINTER(ct.POINTER(ct.c_int32)), ct.c_int32)(("simxReadVisionSensor", libsimx))
-c_GetObjectHandle           = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetObjectHandle", libsimx))
-c_GetVisionSensorImage      = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_byte)), ct.c_ubyte, ct.c_int32)(("simxGetVisionSensorImage", libsimx))
-c_SetVisionSensorImage      = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_byte), ct.c_int32, ct.c_ubyte, ct.c_int32)(("simxSetVisionSensorImage", libsimx))
-c_GetVisionSensorDepthBuffer= ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_float)), ct.c_int32)(("simxGetVisionSensorDepthBuffer", libsimx))
-c_GetObjectChild            = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetObjectChild", libsimx))
-c_GetObjectParent           = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetObjectParent", libsimx))
-c_ReadProximitySensor       = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_ubyte), ct.POINTER(ct.c_float), ct.POINTER(ct.c_int32), ct.POINTER(ct.c_float), ct.c_int32)(("simxReadProximitySensor", libsimx))
-c_LoadModel                 = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_ubyte, ct.POINTER(ct.c_int32), ct.c_int32)(("simxLoadModel", libsimx))
-c_LoadUI                    = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_ubyte, ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_int32)), ct.c_int32)(("simxLoadUI", libsimx))
-c_LoadScene                 =  ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_ubyte, ct.c_int32)(("simxLoadScene", libsimx))
-c_StartSimulation           = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32)(("simxStartSimulation", libsimx))
-c_PauseSimulation           = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32)(("simxPauseSimulation", libsimx))
-c_StopSimulation            = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32)(("simxStopSimulation", libsimx))
-c_GetUIHandle               = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetUIHandle", libsimx))
-c_GetUISlider               = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetUISlider", libsimx))
-c_SetUISlider               = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32)(("simxSetUISlider", libsimx))
-c_GetUIEventButton          = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetUIEventButton", libsimx))
-c_GetUIButtonProperty       = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetUIButtonProperty", libsimx))
-c_SetUIButtonProperty       = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32)(("simxSetUIButtonProperty", libsimx))
-c_AddStatusbarMessage       = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32)(("simxAddStatusbarMessage", libsimx))
-c_AuxiliaryConsoleOpen      = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.POINTER(ct.c_int32), ct.POINTER(ct.c_float), ct.POINTER(ct.c_float), ct.POINTER(ct.c_int32), ct.c_int32)(("simxAuxiliaryConsoleOpen", libsimx))
-c_AuxiliaryConsoleClose     = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32)(("simxAuxiliaryConsoleClose", libsimx))
-c_AuxiliaryConsolePrint     = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32)(("simxAuxiliaryConsolePrint", libsimx))
-c_AuxiliaryConsoleShow      = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_ubyte, ct.c_int32)(("simxAuxiliaryConsoleShow", libsimx))
-c_GetObjectOrientation      = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxGetObjectOrientation", libsimx))
-c_GetObjectQuaternion       = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxGetObjectQuaternion", libsimx))
-c_GetObjectPosition         = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxGetObjectPosition", libsimx))
-c_SetObjectOrientation      = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxSetObjectOrientation", libsimx))
-c_SetObjectQuaternion       = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxSetObjectQuaternion", libsimx))
-c_SetObjectPosition         = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxSetObjectPosition", libsimx))
-c_SetObjectParent           = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.c_ubyte, ct.c_int32)(("simxSetObjectParent", libsimx))
-c_SetUIButtonLabel          = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_char), ct.c_int32)(("simxSetUIButtonLabel", libsimx))
-c_GetLastErrors             = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_char)), ct.c_int32)(("simxGetLastErrors", libsimx))
-c_GetArrayParameter         = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxGetArrayParameter", libsimx))
-c_SetArrayParameter         = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxSetArrayParameter", libsimx))
-c_GetBooleanParameter       = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_ubyte), ct.c_int32)(("simxGetBooleanParameter", libsimx))
-c_SetBooleanParameter       = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_ubyte, ct.c_int32)(("simxSetBooleanParameter", libsimx))
-c_GetIntegerParameter       = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetIntegerParameter", libsimx))
-c_SetIntegerParameter       = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32)(("simxSetIntegerParameter", libsimx))
-c_GetFloatingParameter      = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxGetFloatingParameter", libsimx))
-c_SetFloatingParameter      = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_float, ct.c_int32)(("simxSetFloatingParameter", libsimx))
-c_GetStringParameter        = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.POINTER(ct.c_char)), ct.c_int32)(("simxGetStringParameter", libsimx))
-c_GetCollisionHandle        = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetCollisionHandle", libsimx))
-c_GetDistanceHandle         = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetDistanceHandle", libsimx))
-c_GetCollectionHandle       = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetCollectionHandle", libsimx))
-c_ReadCollision             = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_ubyte), ct.c_int32)(("simxReadCollision", libsimx))
-c_ReadDistance              = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxReadDistance", libsimx))
-c_RemoveObject              = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32)(("simxRemoveObject", libsimx))
-c_RemoveModel               = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32)(("simxRemoveModel", libsimx))
-c_RemoveUI                  = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32)(("simxRemoveUI", libsimx))
-c_CloseScene                = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32)(("simxCloseScene", libsimx))
-c_GetObjects                = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_int32)), ct.c_int32)(("simxGetObjects", libsimx))
-c_DisplayDialog             = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_char), ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_float), ct.POINTER(ct.c_float), ct.POINTER(ct.c_int32), ct.POINTER(ct.c_int32), ct.c_int32)(("simxDisplayDialog", libsimx))
-c_EndDialog                 = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32)(("simxEndDialog", libsimx))
-c_GetDialogInput            = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.POINTER(ct.c_char)), ct.c_int32)(("simxGetDialogInput", libsimx))
-c_GetDialogResult           = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetDialogResult", libsimx))
-c_CopyPasteObjects          = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32, ct.POINTER(ct.POINTER(ct.c_int32)), ct.POINTER(ct.c_int32), ct.c_int32)(("simxCopyPasteObjects", libsimx))
-c_GetObjectSelection        = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.POINTER(ct.c_int32)), ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetObjectSelection", libsimx))
-c_SetObjectSelection        = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32, ct.c_int32)(("simxSetObjectSelection", libsimx))
-c_ClearFloatSignal          = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32)(("simxClearFloatSignal", libsimx))
-c_ClearIntegerSignal        = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32)(("simxClearIntegerSignal", libsimx))
-c_ClearStringSignal         = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32)(("simxClearStringSignal", libsimx))
-c_GetFloatSignal            = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_float), ct.c_int32)(("simxGetFloatSignal", libsimx))
-c_GetIntegerSignal          = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetIntegerSignal", libsimx))
-c_GetStringSignal           = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.POINTER(ct.c_ubyte)), ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetStringSignal", libsimx))
-c_SetFloatSignal            = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_float, ct.c_int32)(("simxSetFloatSignal", libsimx))
-c_SetIntegerSignal          = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32, ct.c_int32)(("simxSetIntegerSignal", libsimx))
-c_SetStringSignal           = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_ubyte), ct.c_int32, ct.c_int32)(("simxSetStringSignal", libsimx))
-c_AppendStringSignal        = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_ubyte), ct.c_int32, ct.c_int32)(("simxAppendStringSignal", libsimx))
-c_WriteStringStream         = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_ubyte), ct.c_int32, ct.c_int32)(("simxWriteStringStream", libsimx))
-c_GetObjectFloatParameter   = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)(("simxGetObjectFloatParameter", libsimx))
-c_SetObjectFloatParameter   = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.c_float, ct.c_int32)(("simxSetObjectFloatParameter", libsimx))
-c_GetObjectIntParameter     = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetObjectIntParameter", libsimx))
-c_SetObjectIntParameter     = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32)(("simxSetObjectIntParameter", libsimx))
-c_GetModelProperty          = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetModelProperty", libsimx))
-c_SetModelProperty          = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32)(("simxSetModelProperty", libsimx))
-c_Start                     = ct.CFUNCTYPE(ct.c_int32,ct.POINTER(ct.c_char), ct.c_int32, ct.c_ubyte, ct.c_ubyte, ct.c_int32, ct.c_int32)(("simxStart", libsimx))
-c_Finish                    = ct.CFUNCTYPE(None, ct.c_int32)(("simxFinish", libsimx))
-c_GetPingTime               = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_int32))(("simxGetPingTime", libsimx))
-c_GetLastCmdTime            = ct.CFUNCTYPE(ct.c_int32,ct.c_int32)(("simxGetLastCmdTime", libsimx))
-c_SynchronousTrigger        = ct.CFUNCTYPE(ct.c_int32,ct.c_int32)(("simxSynchronousTrigger", libsimx))
-c_Synchronous               = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_ubyte)(("simxSynchronous", libsimx))
-c_PauseCommunication        = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_ubyte)(("simxPauseCommunication", libsimx))
-c_GetInMessageInfo          = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32))(("simxGetInMessageInfo", libsimx))
-c_GetOutMessageInfo         = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32))(("simxGetOutMessageInfo", libsimx))
-c_GetConnectionId           = ct.CFUNCTYPE(ct.c_int32,ct.c_int32)(("simxGetConnectionId", libsimx))
-c_CreateBuffer              = ct.CFUNCTYPE(ct.POINTER(ct.c_ubyte), ct.c_int32)(("simxCreateBuffer", libsimx))
-c_ReleaseBuffer             = ct.CFUNCTYPE(None, ct.c_void_p)(("simxReleaseBuffer", libsimx))
-c_TransferFile              = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_char), ct.c_int32, ct.c_int32)(("simxTransferFile", libsimx))
-c_EraseFile                 = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32)(("simxEraseFile", libsimx))
-c_GetAndClearStringSignal   = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.POINTER(ct.c_ubyte)), ct.POINTER(ct.c_int32), ct.c_int32)(("simxGetAndClearStringSignal", libsimx))
-c_ReadStringStream          = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.POINTER(ct.c_ubyte)), ct.POINTER(ct.c_int32), ct.c_int32)(("simxReadStringStream", libsimx))
-c_CreateDummy               = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_float, ct.POINTER(ct.c_ubyte), ct.POINTER(ct.c_int32), ct.c_int32)(("simxCreateDummy", libsimx))
-c_Query                     = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_ubyte), ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.POINTER(ct.c_ubyte)), ct.POINTER(ct.c_int32), ct.c_int32)(("simxQuery", libsimx))
-c_GetObjectGroupData        = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_int32)), ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_int32)), ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_float)), ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_char)), ct.c_int32)(("simxGetObjectGroupData", libsimx))
-c_GetObjectVelocity         = ct.CFUNCTYPE(ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.POINTER(ct.c_float), ct.c_int32)(("simxGetObjectVelocity", libsimx))
-c_CallScriptFunction        = ct.CFUNCTYPE(ct.c_int32,ct.c_int32,ct.POINTER(ct.c_char),ct.c_int32,ct.POINTER(ct.c_char),ct.c_int32,ct.POINTER(ct.c_int32),ct.c_int32,ct.POINTER(ct.c_float),ct.c_int32,ct.POINTER(ct.c_char),ct.c_int32,ct.POINTER(ct.c_ubyte),ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_int32)),ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_float)),ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_char)),ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_ubyte)),ct.c_int32)(("simxCallScriptFunction", libsimx))
+c_GetJointPosition          = _LazyPrototype("simxGetJointPosition", ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)
+c_SetJointPosition          = _LazyPrototype("simxSetJointPosition", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_float, ct.c_int32)
+c_GetJointMatrix            = _LazyPrototype("simxGetJointMatrix", ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)
+c_SetSphericalJointMatrix   = _LazyPrototype("simxSetSphericalJointMatrix", ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)
+c_SetJointTargetVelocity    = _LazyPrototype("simxSetJointTargetVelocity", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_float, ct.c_int32)
+c_SetJointTargetPosition    = _LazyPrototype("simxSetJointTargetPosition", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_float, ct.c_int32)
+c_GetJointForce             = _LazyPrototype("simxGetJointForce", ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)
+c_SetJointForce             = _LazyPrototype("simxSetJointForce", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_float, ct.c_int32)
+c_ReadForceSensor           = _LazyPrototype("simxReadForceSensor", ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_ubyte), ct.POINTER(ct.c_float), ct.POINTER(ct.c_float), ct.c_int32)
+c_BreakForceSensor          = _LazyPrototype("simxBreakForceSensor", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32)
+c_ReadVisionSensor          = _LazyPrototype("simxReadVisionSensor", ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_ubyte), ct.POINTER(ct.POINTER(ct.c_float)), ct.POINTER(ct.POINTER(ct.c_int32)), ct.c_int32)
+c_GetObjectHandle           = _LazyPrototype("simxGetObjectHandle", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_int32), ct.c_int32)
+c_GetVisionSensorImage      = _LazyPrototype("simxGetVisionSensorImage", ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_byte)), ct.c_ubyte, ct.c_int32)
+c_SetVisionSensorImage      = _LazyPrototype("simxSetVisionSensorImage", ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_byte), ct.c_int32, ct.c_ubyte, ct.c_int32)
+c_GetVisionSensorDepthBuffer= _LazyPrototype("simxGetVisionSensorDepthBuffer", ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_float)), ct.c_int32)
+c_GetObjectChild            = _LazyPrototype("simxGetObjectChild", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32)
+c_GetObjectParent           = _LazyPrototype("simxGetObjectParent", ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32)
+c_ReadProximitySensor       = _LazyPrototype("simxReadProximitySensor", ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_ubyte), ct.POINTER(ct.c_float), ct.POINTER(ct.c_int32), ct.POINTER(ct.c_float), ct.c_int32)
+c_LoadModel                 = _LazyPrototype("simxLoadModel", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_ubyte, ct.POINTER(ct.c_int32), ct.c_int32)
+c_LoadUI                    = _LazyPrototype("simxLoadUI", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_ubyte, ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_int32)), ct.c_int32)
+c_LoadScene                 = _LazyPrototype("simxLoadScene", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_ubyte, ct.c_int32)
+c_StartSimulation           = _LazyPrototype("simxStartSimulation", ct.c_int32,ct.c_int32, ct.c_int32)
+c_PauseSimulation           = _LazyPrototype("simxPauseSimulation", ct.c_int32,ct.c_int32, ct.c_int32)
+c_StopSimulation            = _LazyPrototype("simxStopSimulation", ct.c_int32,ct.c_int32, ct.c_int32)
+c_GetUIHandle               = _LazyPrototype("simxGetUIHandle", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_int32), ct.c_int32)
+c_GetUISlider               = _LazyPrototype("simxGetUISlider", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32)
+c_SetUISlider               = _LazyPrototype("simxSetUISlider", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32)
+c_GetUIEventButton          = _LazyPrototype("simxGetUIEventButton", ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.POINTER(ct.c_int32), ct.c_int32)
+c_GetUIButtonProperty       = _LazyPrototype("simxGetUIButtonProperty", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32)
+c_SetUIButtonProperty       = _LazyPrototype("simxSetUIButtonProperty", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32)
+c_AddStatusbarMessage       = _LazyPrototype("simxAddStatusbarMessage", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32)
+c_AuxiliaryConsoleOpen      = _LazyPrototype("simxAuxiliaryConsoleOpen", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.POINTER(ct.c_int32), ct.POINTER(ct.c_float), ct.POINTER(ct.c_float), ct.POINTER(ct.c_int32), ct.c_int32)
+c_AuxiliaryConsoleClose     = _LazyPrototype("simxAuxiliaryConsoleClose", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32)
+c_AuxiliaryConsolePrint     = _LazyPrototype("simxAuxiliaryConsolePrint", ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32)
+c_AuxiliaryConsoleShow      = _LazyPrototype("simxAuxiliaryConsoleShow", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_ubyte, ct.c_int32)
+c_GetObjectOrientation      = _LazyPrototype("simxGetObjectOrientation", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)
+c_GetObjectQuaternion       = _LazyPrototype("simxGetObjectQuaternion", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)
+c_GetObjectPosition         = _LazyPrototype("simxGetObjectPosition", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)
+c_SetObjectOrientation      = _LazyPrototype("simxSetObjectOrientation", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)
+c_SetObjectQuaternion       = _LazyPrototype("simxSetObjectQuaternion", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)
+c_SetObjectPosition         = _LazyPrototype("simxSetObjectPosition", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)
+c_SetObjectParent           = _LazyPrototype("simxSetObjectParent", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.c_ubyte, ct.c_int32)
+c_SetUIButtonLabel          = _LazyPrototype("simxSetUIButtonLabel", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_char), ct.c_int32)
+c_GetLastErrors             = _LazyPrototype("simxGetLastErrors", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_char)), ct.c_int32)
+c_GetArrayParameter         = _LazyPrototype("simxGetArrayParameter", ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)
+c_SetArrayParameter         = _LazyPrototype("simxSetArrayParameter", ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)
+c_GetBooleanParameter       = _LazyPrototype("simxGetBooleanParameter", ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_ubyte), ct.c_int32)
+c_SetBooleanParameter       = _LazyPrototype("simxSetBooleanParameter", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_ubyte, ct.c_int32)
+c_GetIntegerParameter       = _LazyPrototype("simxGetIntegerParameter", ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32)
+c_SetIntegerParameter       = _LazyPrototype("simxSetIntegerParameter", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32)
+c_GetFloatingParameter      = _LazyPrototype("simxGetFloatingParameter", ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)
+c_SetFloatingParameter      = _LazyPrototype("simxSetFloatingParameter", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_float, ct.c_int32)
+c_GetStringParameter        = _LazyPrototype("simxGetStringParameter", ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.POINTER(ct.c_char)), ct.c_int32)
+c_GetCollisionHandle        = _LazyPrototype("simxGetCollisionHandle", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_int32), ct.c_int32)
+c_GetDistanceHandle         = _LazyPrototype("simxGetDistanceHandle", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_int32), ct.c_int32)
+c_GetCollectionHandle       = _LazyPrototype("simxGetCollectionHandle", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_int32), ct.c_int32)
+c_ReadCollision             = _LazyPrototype("simxReadCollision", ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_ubyte), ct.c_int32)
+c_ReadDistance              = _LazyPrototype("simxReadDistance", ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)
+c_RemoveObject              = _LazyPrototype("simxRemoveObject", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32)
+c_RemoveModel               = _LazyPrototype("simxRemoveModel", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32)
+c_RemoveUI                  = _LazyPrototype("simxRemoveUI", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32)
+c_CloseScene                = _LazyPrototype("simxCloseScene", ct.c_int32,ct.c_int32, ct.c_int32)
+c_GetObjects                = _LazyPrototype("simxGetObjects", ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_int32)), ct.c_int32)
+c_DisplayDialog             = _LazyPrototype("simxDisplayDialog", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_char), ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_float), ct.POINTER(ct.c_float), ct.POINTER(ct.c_int32), ct.POINTER(ct.c_int32), ct.c_int32)
+c_EndDialog                 = _LazyPrototype("simxEndDialog", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32)
+c_GetDialogInput            = _LazyPrototype("simxGetDialogInput", ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.POINTER(ct.c_char)), ct.c_int32)
+c_GetDialogResult           = _LazyPrototype("simxGetDialogResult", ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32)
+c_CopyPasteObjects          = _LazyPrototype("simxCopyPasteObjects", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32, ct.POINTER(ct.POINTER(ct.c_int32)), ct.POINTER(ct.c_int32), ct.c_int32)
+c_GetObjectSelection        = _LazyPrototype("simxGetObjectSelection", ct.c_int32,ct.c_int32, ct.POINTER(ct.POINTER(ct.c_int32)), ct.POINTER(ct.c_int32), ct.c_int32)
+c_SetObjectSelection        = _LazyPrototype("simxSetObjectSelection", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32, ct.c_int32)
+c_ClearFloatSignal          = _LazyPrototype("simxClearFloatSignal", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32)
+c_ClearIntegerSignal        = _LazyPrototype("simxClearIntegerSignal", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32)
+c_ClearStringSignal         = _LazyPrototype("simxClearStringSignal", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32)
+c_GetFloatSignal            = _LazyPrototype("simxGetFloatSignal", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_float), ct.c_int32)
+c_GetIntegerSignal          = _LazyPrototype("simxGetIntegerSignal", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_int32), ct.c_int32)
+c_GetStringSignal           = _LazyPrototype("simxGetStringSignal", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.POINTER(ct.c_ubyte)), ct.POINTER(ct.c_int32), ct.c_int32)
+c_SetFloatSignal            = _LazyPrototype("simxSetFloatSignal", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_float, ct.c_int32)
+c_SetIntegerSignal          = _LazyPrototype("simxSetIntegerSignal", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32, ct.c_int32)
+c_SetStringSignal           = _LazyPrototype("simxSetStringSignal", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_ubyte), ct.c_int32, ct.c_int32)
+c_AppendStringSignal        = _LazyPrototype("simxAppendStringSignal", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_ubyte), ct.c_int32, ct.c_int32)
+c_WriteStringStream         = _LazyPrototype("simxWriteStringStream", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_ubyte), ct.c_int32, ct.c_int32)
+c_GetObjectFloatParameter   = _LazyPrototype("simxGetObjectFloatParameter", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.c_int32)
+c_SetObjectFloatParameter   = _LazyPrototype("simxSetObjectFloatParameter", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.c_float, ct.c_int32)
+c_GetObjectIntParameter     = _LazyPrototype("simxGetObjectIntParameter", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32)
+c_SetObjectIntParameter     = _LazyPrototype("simxSetObjectIntParameter", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32)
+c_GetModelProperty          = _LazyPrototype("simxGetModelProperty", ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.c_int32)
+c_SetModelProperty          = _LazyPrototype("simxSetModelProperty", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32)
+c_Start                     = _LazyPrototype("simxStart", ct.c_int32,ct.POINTER(ct.c_char), ct.c_int32, ct.c_ubyte, ct.c_ubyte, ct.c_int32, ct.c_int32)
+c_Finish                    = _LazyPrototype("simxFinish", None, ct.c_int32)
+c_GetPingTime               = _LazyPrototype("simxGetPingTime", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_int32))
+c_GetLastCmdTime            = _LazyPrototype("simxGetLastCmdTime", ct.c_int32,ct.c_int32)
+c_SynchronousTrigger        = _LazyPrototype("simxSynchronousTrigger", ct.c_int32,ct.c_int32)
+c_Synchronous               = _LazyPrototype("simxSynchronous", ct.c_int32,ct.c_int32, ct.c_ubyte)
+c_PauseCommunication        = _LazyPrototype("simxPauseCommunication", ct.c_int32,ct.c_int32, ct.c_ubyte)
+c_GetInMessageInfo          = _LazyPrototype("simxGetInMessageInfo", ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32))
+c_GetOutMessageInfo         = _LazyPrototype("simxGetOutMessageInfo", ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32))
+c_GetConnectionId           = _LazyPrototype("simxGetConnectionId", ct.c_int32,ct.c_int32)
+c_CreateBuffer              = _LazyPrototype("simxCreateBuffer", ct.POINTER(ct.c_ubyte), ct.c_int32)
+c_ReleaseBuffer             = _LazyPrototype("simxReleaseBuffer", None, ct.c_void_p)
+c_TransferFile              = _LazyPrototype("simxTransferFile", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_char), ct.c_int32, ct.c_int32)
+c_EraseFile                 = _LazyPrototype("simxEraseFile", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.c_int32)
+c_GetAndClearStringSignal   = _LazyPrototype("simxGetAndClearStringSignal", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.POINTER(ct.c_ubyte)), ct.POINTER(ct.c_int32), ct.c_int32)
+c_ReadStringStream          = _LazyPrototype("simxReadStringStream", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.POINTER(ct.c_ubyte)), ct.POINTER(ct.c_int32), ct.c_int32)
+c_CreateDummy               = _LazyPrototype("simxCreateDummy", ct.c_int32,ct.c_int32, ct.c_float, ct.POINTER(ct.c_ubyte), ct.POINTER(ct.c_int32), ct.c_int32)
+c_Query                     = _LazyPrototype("simxQuery", ct.c_int32,ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.c_ubyte), ct.c_int32, ct.POINTER(ct.c_char), ct.POINTER(ct.POINTER(ct.c_ubyte)), ct.POINTER(ct.c_int32), ct.c_int32)
+c_GetObjectGroupData        = _LazyPrototype("simxGetObjectGroupData", ct.c_int32,ct.c_int32, ct.c_int32, ct.c_int32, ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_int32)), ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_int32)), ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_float)), ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_char)), ct.c_int32)
+c_GetObjectVelocity         = _LazyPrototype("simxGetObjectVelocity", ct.c_int32,ct.c_int32, ct.c_int32, ct.POINTER(ct.c_float), ct.POINTER(ct.c_float), ct.c_int32)
+c_CallScriptFunction        = _LazyPrototype("simxCallScriptFunction", ct.c_int32,ct.c_int32,ct.POINTER(ct.c_char),ct.c_int32,ct.POINTER(ct.c_char),ct.c_int32,ct.POINTER(ct.c_int32),ct.c_int32,ct.POINTER(ct.c_float),ct.c_int32,ct.POINTER(ct.c_char),ct.c_int32,ct.POINTER(ct.c_ubyte),ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_int32)),ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_float)),ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_char)),ct.POINTER(ct.c_int32), ct.POINTER(ct.POINTER(ct.c_ubyte)),ct.c_int32)
+
+#helpers to copy C output buffers in bulk
+def _unpackStrings(stringDataP, count):
+    '''
+    Reads count consecutive null-terminated utf-8 strings, one C-level copy per string
+    '''
+    strings = []
+    address = ct.cast(stringDataP, ct.c_void_p).value
+    for i in range(count):
+        a = ct.string_at(address)
+        address += len(a) + 1 #skip null
+        if sys.version_info[0] == 3:
+            a=str(a,'utf-8')
+        strings.append(a)
+    return strings
+
+def _unpackBuffer(bufferP, size):
+    '''
+    Copies size bytes of a C buffer into a bytearray in a single step
+    '''
+    if size <= 0:
+        return bytearray()
+    return bytearray(ct.cast(bufferP, ct.POINTER(ct.c_ubyte*size)).contents)
 
 #API functions
 def simxGetJointPosition(clientID, jointHandle, operationMode):
@@ -274,7 +335,7 @@ def simxGetVisionSensorImage(clientID, sensorHandle, options, operationMode):
     resolution = (ct.c_int*2)()
     c_image  = ct.POINTER(ct.c_byte)()
     bytesPerPixel = 3
-    if (options and 1) != 0:
+    if (options & 1) != 0:
         bytesPerPixel = 1
     ret = c_GetVisionSensorImage(clientID, sensorHandle, resolution, ct.byref(c_image), options, operationMode)
 
@@ -288,6 +349,29 @@ def simxGetVisionSensorImage(clientID, sensorHandle, options, operationMode):
             reso.append(resolution[i])
     return ret, reso, image
 
+def simxGetVisionSensorImageNumpy(clientID, sensorHandle, options, operationMode):
+    '''
+    Same as simxGetVisionSensorImage, but the image is returned as a (resolutionY, resolutionX, bytesPerPixel)
+    uint8 numpy array, copied out of the C buffer in a single step
+    '''
+
+    resolution = (ct.c_int*2)()
+    c_image  = ct.POINTER(ct.c_byte)()
+    bytesPerPixel = 3
+    if (options & 1) != 0:
+        bytesPerPixel = 1
+    ret = c_GetVisionSensorImage(clientID, sensorHandle, resolution, ct.byref(c_image), options, operationMode)
+
+    reso = []
+    image = np.empty((0, 0, bytesPerPixel), dtype=np.uint8)
+    if (ret == 0):
+        reso = [resolution[0], resolution[1]]
+        size = resolution[0] * resolution[1] * bytesPerPixel
+        if size > 0:
+            c_pixels = ct.cast(c_image, ct.POINTER(ct.c_ubyte))
+            image = np.ctypeslib.as_array(c_pixels, shape=(size,)).reshape(resolution[1], resolution[0], bytesPerPixel).copy()
+    return ret, reso, image
+
 def simxSetVisionSensorImage(clientID, sensorHandle, image, options, operationMode):
     '''
     Please have a look at the function description/documentation in the V-REP user manual
@@ -959,8 +1043,7 @@ def simxGetStringSignal(clientID, signalName, operationMode):
 
     a = bytearray()
     if ret == 0:
-        for i in range(signalLength.value):
-            a.append(signalValue[i])
+        a = _unpackBuffer(signalValue, signalLength.value)
     if sys.version_info[0] != 3:
         a=str(a)
 
@@ -979,8 +1062,7 @@ def simxGetAndClearStringSignal(clientID, signalName, operationMode):
 
     a = bytearray()
     if ret == 0:
-        for i in range(signalLength.value):
-            a.append(signalValue[i])
+        a = _unpackBuffer(signalValue, signalLength.value)
     if sys.version_info[0] != 3:
         a=str(a)
 
@@ -999,8 +1081,7 @@ def simxReadStringStream(clientID, signalName, operationMode):
 
     a = bytearray()
     if ret == 0:
-        for i in range(signalLength.value):
-            a.append(signalValue[i])
+        a = _unpackBuffer(signalValue, signalLength.value)
     if sys.version_info[0] != 3:
         a=str(a)
 
@@ -1034,10 +1115,10 @@ def simxSetStringSignal(clientID, signalName, signalValue, operationMode):
         if type(signalName) is str:
             signalName=signalName.encode('utf-8')
         if type(signalValue) is bytearray:
-            sigV  = (ct.c_ubyte*len(signalValue))(*signalValue)
+            sigV  = (ct.c_ubyte*len(signalValue)).from_buffer_copy(signalValue)
         if type(signalValue) is str:
             signalValue=signalValue.encode('utf-8')
-            sigV  = (ct.c_ubyte*len(signalValue))(*signalValue)
+            sigV  = (ct.c_ubyte*len(signalValue)).from_buffer_copy(signalValue)
     else:
         if type(signalValue) is bytearray:
             sigV = (ct.c_ubyte*len(signalValue))(*signalValue)
@@ -1057,10 +1138,10 @@ def simxAppendStringSignal(clientID, signalName, signalValue, operationMode):
         if type(signalName) is str:
             signalName=signalName.encode('utf-8')
         if type(signalValue) is bytearray:
-            sigV  = (ct.c_ubyte*len(signalValue))(*signalValue)
+            sigV  = (ct.c_ubyte*len(signalValue)).from_buffer_copy(signalValue)
         if type(signalValue) is str:
             signalValue=signalValue.encode('utf-8')
-            sigV  = (ct.c_ubyte*len(signalValue))(*signalValue)
+            sigV  = (ct.c_ubyte*len(signalValue)).from_buffer_copy(signalValue)
     else:
         if type(signalValue) is bytearray:
             sigV = (ct.c_ubyte*len(signalValue))(*signalValue)
@@ -1080,10 +1161,10 @@ def simxWriteStringStream(clientID, signalName, signalValue, operationMode):
         if type(signalName) is str:
             signalName=signalName.encode('utf-8')
         if type(signalValue) is bytearray:
-            sigV  = (ct.c_ubyte*len(signalValue))(*signalValue)
+            sigV  = (ct.c_ubyte*len(signalValue)).from_buffer_copy(signalValue)
         if type(signalValue) is str:
             signalValue=signalValue.encode('utf-8')
-            sigV  = (ct.c_ubyte*len(signalValue))(*signalValue)
+            sigV  = (ct.c_ubyte*len(signalValue)).from_buffer_copy(signalValue)
     else:
         if type(signalValue) is bytearray:
             sigV = (ct.c_ubyte*len(signalValue))(*signalValue)
@@ -1268,10 +1349,10 @@ def simxQuery(clientID, signalName, signalValue, retSignalName, timeOutInMs):
         if type(retSignalName) is str:
             retSignalName=retSignalName.encode('utf-8')
         if type(signalValue) is bytearray:
-            sigV  = (ct.c_ubyte*len(signalValue))(*signalValue)
+            sigV  = (ct.c_ubyte*len(signalValue)).from_buffer_copy(signalValue)
         if type(signalValue) is str:
             signalValue=signalValue.encode('utf-8')
-            sigV  = (ct.c_ubyte*len(signalValue))(*signalValue)
+            sigV  = (ct.c_ubyte*len(signalValue)).from_buffer_copy(signalValue)
     else:
         if type(signalValue) is bytearray:
             sigV = (ct.c_ubyte*len(signalValue))(*signalValue)
@@ -1284,8 +1365,7 @@ def simxQuery(clientID, signalName, signalValue, retSignalName, timeOutInMs):
 
     a = bytearray()
     if ret == 0:
-        for i in range(retSignalLength.value):
-            a.append(retSignalValue[i])
+        a = _unpackBuffer(retSignalValue, retSignalLength.value)
     if sys.version_info[0] != 3:
         a=str(a)
 
@@ -1311,27 +1391,40 @@ def simxGetObjectGroupData(clientID, objectType, dataType, operationMode):
     ret = c_GetObjectGroupData(clientID, objectType, dataType, ct.byref(handlesC), ct.byref(handlesP), ct.byref(intDataC), ct.byref(intDataP), ct.byref(floatDataC), ct.byref(floatDataP), ct.byref(stringDataC), ct.byref(stringDataP), operationMode)
 
     if ret == 0:
-        for i in range(handlesC.value):
-            handles.append(handlesP[i])
-        for i in range(intDataC.value):
-            intData.append(intDataP[i])
-        for i in range(floatDataC.value):
-            floatData.append(floatDataP[i])
-        s = 0
-        for i in range(stringDataC.value):
-            a = bytearray()
-            while stringDataP[s] != b'\0':
-                if sys.version_info[0] == 3:
-                    a.append(int.from_bytes(stringDataP[s],'big'))
-                else:
-                    a.append(stringDataP[s])
-                s += 1
-            s += 1 #skip null
-            if sys.version_info[0] == 3:
-                a=str(a,'utf-8')
-            else:
-                a=str(a)
-            stringData.append(a)
+        handles = handlesP[:handlesC.value]
+        intData = intDataP[:intDataC.value]
+        floatData = floatDataP[:floatDataC.value]
+        stringData = _unpackStrings(stringDataP, stringDataC.value)
+
+    return ret, handles, intData, floatData, stringData
+
+def simxGetObjectGroupDataNumpy(clientID, objectType, dataType, operationMode):
+    '''
+    Same as simxGetObjectGroupData, but handles, intData and floatData are returned as numpy arrays
+    '''
+
+    handlesC = ct.c_int()
+    handlesP = ct.POINTER(ct.c_int)()
+    intDataC = ct.c_int()
+    intDataP = ct.POINTER(ct.c_int)()
+    floatDataC = ct.c_int()
+    floatDataP = ct.POINTER(ct.c_float)()
+    stringDataC = ct.c_int()
+    stringDataP = ct.POINTER(ct.c_char)()
+    ret = c_GetObjectGroupData(clientID, objectType, dataType, ct.byref(handlesC), ct.byref(handlesP), ct.byref(intDataC), ct.byref(intDataP), ct.byref(floatDataC), ct.byref(floatDataP), ct.byref(stringDataC), ct.byref(stringDataP), operationMode)
+
+    handles = np.empty(0, dtype=np.int32)
+    intData = np.empty(0, dtype=np.int32)
+    floatData = np.empty(0, dtype=np.float32)
+    stringData = []
+    if ret == 0:
+        if handlesC.value > 0:
+            handles = np.ctypeslib.as_array(handlesP, shape=(handlesC.value,)).astype(np.int32)
+        if intDataC.value > 0:
+            intData = np.ctypeslib.as_array(intDataP, shape=(intDataC.value,)).astype(np.int32)
+        if floatDataC.value > 0:
+            floatData = np.ctypeslib.as_array(floatDataP, shape=(floatDataC.value,)).astype(np.float32)
+        stringData = _unpackStrings(stringDataP, stringDataC.value)
 
     return ret, handles, intData, floatData, stringData
 
@@ -1347,10 +1440,10 @@ def simxCallScriptFunction(clientID, scriptDescription, options, functionName, i
         if type(functionName) is str:
             functionName=functionName.encode('utf-8')
         if type(inputBuffer) is bytearray:
-            inputBufferV  = (ct.c_ubyte*len(inputBuffer))(*inputBuffer)
+            inputBufferV  = (ct.c_ubyte*len(inputBuffer)).from_buffer_copy(inputBuffer)
         if type(inputBuffer) is str:
             inputBuffer=inputBuffer.encode('utf-8')
-            inputBufferV  = (ct.c_ubyte*len(inputBuffer))(*inputBuffer)
+            inputBufferV  = (ct.c_ubyte*len(inputBuffer)).from_buffer_copy(inputBuffer)
     else:
         if type(inputBuffer) is bytearray:
             inputBufferV = (ct.c_ubyte*len(inputBuffer))(*inputBuffer)
@@ -1390,32 +1483,116 @@ def simxCallScriptFunction(clientID, scriptDescription, options, functionName, i
     ret = c_CallScriptFunction(clientID,scriptDescription,options,functionName,len(inputInts),c_inInts,len(inputFloats),c_inFloats,len(inputStrings),c_inStrings,len(inputBuffer),inputBufferV,ct.byref(intDataC),ct.byref(intDataP),ct.byref(floatDataC),ct.byref(floatDataP),ct.byref(stringDataC),ct.byref(stringDataP),ct.byref(bufferS),ct.byref(bufferP),operationMode)
 
     if ret == 0:
-        for i in range(intDataC.value):
-            intDataOut.append(intDataP[i])
-        for i in range(floatDataC.value):
-            floatDataOut.append(floatDataP[i])
-        s = 0
-        for i in range(stringDataC.value):
-            a = bytearray()
-            while stringDataP[s] != b'\0':
-                if sys.version_info[0] == 3:
-                    a.append(int.from_bytes(stringDataP[s],'big'))
-                else:
-                    a.append(stringDataP[s])
-                s += 1
-            s += 1 #skip null
-            if sys.version_info[0] == 3:
-                a=str(a,'utf-8')
-            else:
-                a=str(a)
-            stringDataOut.append(a)
-        for i in range(bufferS.value):
-            bufferOut.append(bufferP[i])
+        intDataOut = intDataP[:intDataC.value]
+        floatDataOut = floatDataP[:floatDataC.value]
+        stringDataOut = _unpackStrings(stringDataP, stringDataC.value)
+        bufferOut = _unpackBuffer(bufferP, bufferS.value)
     if sys.version_info[0] != 3:
         bufferOut=str(bufferOut)
 
     return ret, intDataOut, floatDataOut, stringDataOut, bufferOut
 
+class PreparedScriptFunction(object):
+    '''
+    simxCallScriptFunction bound to one script function. The script and function names are encoded once,
+    the ctypes input and output buffers are kept between calls and only the arguments that changed are
+    rewritten. Calls are serialized, so one instance can be shared between threads, but then a blocking call
+    holds up every other thread that calls it. Give each connection its own instance with clone().
+    '''
+
+    def __init__(self, scriptDescription, options, functionName, intCount=0, floatCount=0):
+        if (sys.version_info[0] == 3) and (type(scriptDescription) is str):
+            scriptDescription=scriptDescription.encode('utf-8')
+        if (sys.version_info[0] == 3) and (type(functionName) is str):
+            functionName=functionName.encode('utf-8')
+        self.scriptDescription = scriptDescription
+        self.options = options
+        self.functionName = functionName
+        self.lock = threading.Lock()
+
+        self._allocInts(intCount)
+        self._allocFloats(floatCount)
+        self.inputStrings = None
+        self.c_inStrings = (ct.c_char*0)()
+        self.inputBuffer = None
+        self.c_inBuffer = ct.cast((ct.c_ubyte*0)(), ct.POINTER(ct.c_ubyte))
+
+        self.intDataC = ct.c_int()
+        self.intDataP = ct.POINTER(ct.c_int)()
+        self.floatDataC = ct.c_int()
+        self.floatDataP = ct.POINTER(ct.c_float)()
+        self.stringDataC = ct.c_int()
+        self.stringDataP = ct.POINTER(ct.c_char)()
+        self.bufferS = ct.c_int()
+        self.bufferP = ct.POINTER(ct.c_ubyte)()
+        self.outputs = [ct.byref(self.intDataC), ct.byref(self.intDataP), ct.byref(self.floatDataC),
+                        ct.byref(self.floatDataP), ct.byref(self.stringDataC), ct.byref(self.stringDataP),
+                        ct.byref(self.bufferS), ct.byref(self.bufferP)]
+
+    def clone(self):
+        '''
+        A new instance bound to the same script function, with its own buffers and lock
+        '''
+        return PreparedScriptFunction(self.scriptDescription, self.options, self.functionName, len(self.c_inInts),
+                                      len(self.c_inFloats))
+
+    def _allocInts(self, count):
+        self.c_inInts = (ct.c_int*count)()
+        self.c_inIntsP = ct.cast(self.c_inInts, ct.POINTER(ct.c_int)) # IronPython needs this
+
+    def _allocFloats(self, count):
+        self.c_inFloats = (ct.c_float*count)()
+        self.c_inFloatsP = ct.cast(self.c_inFloats, ct.POINTER(ct.c_float)) # IronPython needs this
+
+    def _setInputs(self, inputInts, inputFloats, inputStrings, inputBuffer):
+        if len(inputInts) > len(self.c_inInts):
+            self._allocInts(len(inputInts))
+        self.c_inInts[:len(inputInts)] = inputInts
+        if len(inputFloats) > len(self.c_inFloats):
+            self._allocFloats(len(inputFloats))
+        self.c_inFloats[:len(inputFloats)] = inputFloats
+
+        inputStrings = tuple(inputStrings)
+        if inputStrings != self.inputStrings:
+            concatStr=''.encode('utf-8')
+            for a in inputStrings:
+                if type(a) is str:
+                    a=a.encode('utf-8')
+                concatStr=concatStr+a+b'\0'
+            self.c_inStrings = (ct.c_char*len(concatStr))(*concatStr)
+            self.inputStrings = inputStrings
+
+        if type(inputBuffer) is str:
+            inputBuffer=inputBuffer.encode('utf-8')
+        inputBuffer = bytes(inputBuffer)
+        if inputBuffer != self.inputBuffer:
+            c_inBuffer = (ct.c_ubyte*len(inputBuffer)).from_buffer_copy(inputBuffer)
+            self.c_inBuffer = ct.cast(c_inBuffer, ct.POINTER(ct.c_ubyte)) # IronPython needs this
+            self.inputBuffer = inputBuffer
+
+    def __call__(self, clientID, inputInts, inputFloats, inputStrings, inputBuffer, operationMode):
+        with self.lock:
+            self._setInputs(inputInts, inputFloats, inputStrings, inputBuffer)
+            ret = c_CallScriptFunction(clientID, self.scriptDescription, self.options, self.functionName,
+                                       len(inputInts), self.c_inIntsP, len(inputFloats), self.c_inFloatsP,
+                                       len(inputStrings), self.c_inStrings,
+                                       len(self.inputBuffer), self.c_inBuffer,
+                                       *(self.outputs + [operationMode]))
+
+            intDataOut =[]
+            floatDataOut =[]
+            stringDataOut =[]
+            bufferOut =bytearray()
+            if ret == 0:
+                intDataOut = self.intDataP[:self.intDataC.value]
+                floatDataOut = self.floatDataP[:self.floatDataC.value]
+                stringDataOut = _unpackStrings(self.stringDataP, self.stringDataC.value)
+                bufferOut = _unpackBuffer(self.bufferP, self.bufferS.value)
+        if sys.version_info[0] != 3:
+            bufferOut=str(bufferOut)
+
+        return ret, intDataOut, floatDataOut, stringDataOut, bufferOut
+
 def simxGetObjectVelocity(clientID, objectHandle, operationMode):
     '''
     Please have a look at the function description/documentation in the V-REP user manual
@@ -1434,49 +1611,47 @@ def simxGetObjectVelocity(clientID, objectHandle, operationMode):
 def simxPackInts(intList):
     '''
     Please have a look at the function description/documentation in the V-REP user manual
+    Also accepts array.array and numpy arrays, which are packed in a single step
     '''
 
+    s=np.asarray(intList, dtype='<i4').tobytes()
     if sys.version_info[0] == 3:
-        s=bytes()
-        for i in range(len(intList)):
-            s=s+struct.pack('<i',intList[i])
         s=bytearray(s)
-    else:
-        s=''
-        for i in range(len(intList)):
-            s+=struct.pack('<i',intList[i])
     return s
 
 def simxUnpackInts(intsPackedInString):
     '''
     Please have a look at the function description/documentation in the V-REP user manual
     '''
-    b=[]
-    for i in range(int(len(intsPackedInString)/4)):
-        b.append(struct.unpack('<i',intsPackedInString[4*i:4*(i+1)])[0])
-    return b
+    return simxUnpackIntsNumpy(intsPackedInString).tolist()
+
+def simxUnpackIntsNumpy(intsPackedInString):
+    '''
+    Same as simxUnpackInts, but returns an int32 numpy array that shares memory with the packed string.
+    Trailing bytes that do not make a whole value are ignored, like simxUnpackInts always did
+    '''
+    return np.frombuffer(intsPackedInString, dtype='<i4', count=len(intsPackedInString) // 4)
 
 def simxPackFloats(floatList):
     '''
     Please have a look at the function description/documentation in the V-REP user manual
+    Also accepts array.array and numpy arrays, which are packed in a single step
     '''
 
+    s=np.asarray(floatList, dtype='<f4').tobytes()
     if sys.version_info[0] == 3:
-        s=bytes()
-        for i in range(len(floatList)):
-            s=s+struct.pack('<f',floatList[i])
         s=bytearray(s)
-    else:
-        s=''
-        for i in range(len(floatList)):
-            s+=struct.pack('<f',floatList[i])
     return s
 
 def simxUnpackFloats(floatsPackedInString):
     '''
     Please have a look at the function description/documentation in the V-REP user manual
     '''
-    b=[]
-    for i in range(int(len(floatsPackedInString)/4)):
-        b.append(struct.unpack('<f',floatsPackedInString[4*i:4*(i+1)])[0])
-    return b
+    return simxUnpackFloatsNumpy(floatsPackedInString).tolist()
+
+def simxUnpackFloatsNumpy(floatsPackedInString):
+    '''
+    Same as simxUnpackFloats, but returns a float32 numpy array that shares memory with the packed string.
+    Trailing bytes that do not make a whole value are ignored, like simxUnpackFloats always did
+    '''
+    return np.frombuffer(floatsPackedInString, dtype='<f4', count=len(floatsPackedInString) // 4)
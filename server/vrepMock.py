@@ -0,0 +1,475 @@
+#In-process stand-in for vrep.py. It answers the remote API calls used by robotApi and serverApi from a
+#scripted in-memory scene, so the server loop can run and be profiled without a V-REP instance.
+#Select it with SIMPLUS_REMOTE_API=mock before importing robotApi, and set SIMPLUS_MOCK_LATENCY_MS to add
+#a simulated round trip to every blocking call.
+
+import math
+import os
+import threading
+import time
+import numpy as np
+from vrepConst import *
+
+
+class MockRobot:
+    def __init__(self, scene, robot_namespace, robot_base, suffix, camera_resolution, color_resolution,
+                 proximity_num, offset):
+        self.base = scene.add_object(robot_base + suffix, [0.0, offset, 0.02])
+        self.left = scene.add_object(robot_namespace + 'leftJoint' + suffix, [0.0, offset + 0.026, 0.02])
+        self.right = scene.add_object(robot_namespace + 'rightJoint' + suffix, [0.0, offset - 0.026, 0.02])
+        self.camera = scene.add_vision_sensor(robot_namespace + 'camera' + suffix, camera_resolution)
+        self.color_sensors = [scene.add_vision_sensor(robot_namespace + 'lightSensor' + side + suffix, color_resolution)
+                              for side in ['', '_l', '_r']]
+        self.proximity = [scene.add_proximity_sensor(robot_namespace + 'proxSensor' + str(i) + suffix)
+                          for i in range(1, proximity_num + 1)]
+        self.snapshot_signal = robot_namespace + 'snapshot' + suffix
+        self.led = 21001
+
+
+class MockScene:
+    def __init__(self, robot_namespace="ePuck_", robot_base='ePuck_base', camera_resolution=(64, 64),
+                 color_resolution=(4, 4), proximity_num=8, game_duration=1000, seed=0, robots=1):
+        self.lock = threading.Lock()
+        self.random = np.random.RandomState(seed)
+        self.names = {}
+        self.positions = []
+        self.orientations = []
+        self.velocities = {}
+        self.vision_sensors = {}
+        self.proximity_sensors = {}
+        self.script_functions = {}
+        self.replies = {}
+        self.running = True
+        self.step_count = 0
+        self.dt = 0.05
+        self.scores = {}
+        self.synchronous = False
+        self.string_signals = {}
+        self.integer_signals = {}
+        self.scene_path = 'simplus_mock.ttt'
+        self.game_duration = game_duration
+        self.wheel_radius = 0.02
+        self.robot_width = 0.052
+
+        # copies of the robot model are named like V-REP names them: no suffix, then '#0', '#1', ...
+        self.robots = []
+        for i, suffix in enumerate([''] + ['#' + str(j) for j in range(robots - 1)]):
+            robot = MockRobot(self, robot_namespace, robot_base, suffix, camera_resolution, color_resolution,
+                              proximity_num, 0.2 * i)
+            self.robots.append(robot)
+            self.add_script_function('Simplus_monitor' + suffix, 'remote_led_change',
+                                     lambda ints, floats, strings, buffer, robot=robot:
+                                     self.remote_led_change(robot, ints))
+
+        self.add_script_function('Game_manager', 'remote_get_sim_status', self.remote_get_sim_status)
+        self.add_script_function('Game_manager', 'remote_set_score', self.remote_set_score)
+        self.add_script_function('Game_manager', 'remote_get_name', self.remote_get_name)
+
+    def add_object(self, name, position, orientation=(0.0, 0.0, 0.0)):
+        handle = len(self.positions) + 1
+        self.names[name] = handle
+        self.positions.append(np.array(position, dtype=np.float64))
+        self.orientations.append(np.array(orientation, dtype=np.float64))
+        return handle
+
+    def add_vision_sensor(self, name, resolution):
+        handle = self.add_object(name, [0.0, 0.0, 0.02])
+        self.vision_sensors[handle] = np.zeros((resolution[1], resolution[0], 3), dtype=np.uint8)
+        return handle
+
+    def add_proximity_sensor(self, name):
+        handle = self.add_object(name, [0.0, 0.0, 0.02])
+        self.proximity_sensors[handle] = None
+        return handle
+
+    def add_script_function(self, script, function, callback):
+        self.script_functions[(script, function)] = callback
+
+    def add_config_objects(self, config_file, area=2.0):
+        # places every object named in a server or trap config file at a random spot of the arena
+        with open(config_file, 'r') as fp:
+            for line in fp:
+                ls = line.split(';')
+                ob = ls[1].split(',')
+                ix = ls[2].split(',')
+                for i in range(0, len(ob)):
+                    names = [ob[i]] + [ob[i] + str(j) for j in range(0, int(ix[i]) - 1)]
+                    for name in names:
+                        if name not in self.names:
+                            position = self.random.uniform(-area / 2, area / 2, 3) * [1, 1, 0]
+                            self.add_object(name, position)
+
+    def step(self):
+        # differential drive kinematics for the robot bases, then refresh the sensor readings
+        with self.lock:
+            self.step_count += 1
+            for robot in self.robots:
+                left_speed = self.velocities.get(robot.left, 0.0) * self.wheel_radius
+                right_speed = self.velocities.get(robot.right, 0.0) * self.wheel_radius
+                linear = (left_speed + right_speed) / 2
+                angular = (right_speed - left_speed) / self.robot_width
+                yaw = self.orientations[robot.base - 1][2] + angular * self.dt
+                self.orientations[robot.base - 1][2] = yaw
+                self.positions[robot.base - 1] += [linear * math.cos(yaw) * self.dt,
+                                                   linear * math.sin(yaw) * self.dt, 0.0]
+
+                frame = self.vision_sensors[robot.camera]
+                frame[:] = (np.arange(frame.size, dtype=np.int64).reshape(frame.shape) + self.step_count) % 256
+                floor = self.floor_color(robot)
+                for handle in robot.color_sensors:
+                    self.vision_sensors[handle][:] = floor
+                for i, handle in enumerate(robot.proximity):
+                    distance = 0.02 + 0.01 * ((self.step_count + i) % 5)
+                    self.proximity_sensors[handle] = distance if (self.step_count + i) % 3 == 0 else None
+                self.publish_snapshot(robot)
+            self.publish_status()
+
+    def publish_snapshot(self, robot):
+        # same layout as simplus_snapshot_publish in simplus_snapshot.lua
+        frame = self.vision_sensors[robot.camera]
+        distances = [self.proximity_sensors[handle] for handle in robot.proximity]
+        header = [1, frame.shape[1], frame.shape[0], len(robot.proximity), len(robot.color_sensors)]
+        pose = list(self.positions[robot.base - 1]) + list(self.orientations[robot.base - 1])
+        detected = [0 if distance is None else 1 for distance in distances]
+        distances = [0 if distance is None else distance for distance in distances]
+        colors = [self.vision_sensors[handle].reshape(-1)[24:27] for handle in robot.color_sensors]
+        data = np.concatenate([header, pose, detected, distances] + colors).astype('<f4')
+        self.string_signals[robot.snapshot_signal] = bytearray(data.tobytes() + frame.tobytes())
+
+    def publish_status(self):
+        # same signal as simplus_status_publish in simplus_status.lua
+        self.integer_signals['simplus_status'] = 1 if self.running else 0
+
+    def floor_color(self, robot):
+        position = self.positions[robot.base - 1]
+        for name, color in [('Checkpoint_black', 0), ('Checkpoint_silver', 160)]:
+            for object_name, handle in self.names.items():
+                if object_name.startswith(name) and np.linalg.norm(self.positions[handle - 1] - position) < 0.08:
+                    return color
+        return 255
+
+    def remote_get_sim_status(self, ints, floats, strings, buffer):
+        if not self.synchronous:
+            self.step()
+        return [1 if self.running else 0], [], [], bytearray()
+
+    def remote_set_score(self, ints, floats, strings, buffer):
+        self.scores[ints[0]] = strings[0]
+        return [], [], [], bytearray()
+
+    def remote_get_name(self, ints, floats, strings, buffer):
+        return [0, self.game_duration], [], [], bytearray()
+
+    def remote_led_change(self, robot, ints):
+        robot.led = ints[0]
+        return [], [], [], bytearray()
+
+
+scene = MockScene()
+for config_file in ['serverconfig.txt', 'trapconfig.txt']:
+    config_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), config_file)
+    if os.path.exists(config_path):
+        scene.add_config_objects(config_path)
+scene.step()
+
+latency = float(os.environ.get('SIMPLUS_MOCK_LATENCY_MS', '0')) / 1000.0
+connections = []
+streams = set()
+replied = set()
+
+
+def configure(new_scene=None, latency_ms=None):
+    global scene, latency
+    if new_scene is not None:
+        scene = new_scene
+    if latency_ms is not None:
+        latency = latency_ms / 1000.0
+
+
+def _roundTrip(operationMode, command):
+    # blocking calls wait for the simulated round trip. like the real API, streamed commands return
+    # simx_return_novalue_flag until their first reply is in the input buffer
+    if operationMode == simx_opmode_blocking:
+        if latency > 0:
+            time.sleep(latency)
+        return simx_return_ok
+    if operationMode == simx_opmode_streaming:
+        first = command not in streams
+        streams.add(command)
+        return simx_return_novalue_flag if first else simx_return_ok
+    if operationMode == simx_opmode_buffer:
+        return simx_return_ok if command in streams else simx_return_novalue_flag
+    if operationMode == simx_opmode_discontinue:
+        streams.discard(command)
+        return simx_return_novalue_flag
+    # oneshot reads return the reply of the previous identical command, so only the first one comes back empty
+    first = command not in replied
+    replied.add(command)
+    return simx_return_novalue_flag if first else simx_return_ok
+
+
+def simxBindRemoteApi():
+    return None
+
+
+def simxStart(connectionAddress, connectionPort, waitUntilConnected, doNotReconnectOnceDisconnected, timeOutInMs,
+              commThreadCycleInMs):
+    connections.append(connectionPort)
+    return len(connections) - 1
+
+
+def simxFinish(clientID):
+    return None
+
+
+def simxGetPingTime(clientID):
+    if latency > 0:
+        time.sleep(latency)
+    return simx_return_ok, int(latency * 1000)
+
+
+def simxSynchronous(clientID, enable):
+    scene.synchronous = bool(enable)
+    return _roundTrip(simx_opmode_blocking, ('synchronous',))
+
+
+def simxSynchronousTrigger(clientID):
+    if scene.synchronous and scene.running:
+        scene.step()
+    return _roundTrip(simx_opmode_blocking, ('trigger',))
+
+
+def simxGetStringParameter(clientID, paramIdentifier, operationMode):
+    ret = _roundTrip(operationMode, ('string parameter', paramIdentifier))
+    if paramIdentifier != sim_stringparam_scene_path_and_name:
+        return simx_return_remote_error_flag, ''
+    return ret, scene.scene_path
+
+
+def simxPauseCommunication(clientID, enable):
+    return simx_return_ok
+
+
+def simxGetObjectHandle(clientID, objectName, operationMode):
+    if type(objectName) is bytes:
+        objectName = objectName.decode('utf-8')
+    ret = _roundTrip(operationMode, ('handle', objectName))
+    handle = scene.names.get(objectName)
+    if handle is None:
+        return simx_return_remote_error_flag, 0
+    return ret, handle
+
+
+def simxGetObjectPosition(clientID, objectHandle, relativeToObjectHandle, operationMode):
+    ret = _roundTrip(operationMode, ('position', objectHandle, relativeToObjectHandle))
+    if ret != simx_return_ok:
+        return ret, [0.0, 0.0, 0.0]
+    with scene.lock:
+        position = scene.positions[objectHandle - 1]
+        if relativeToObjectHandle != -1:
+            position = position - scene.positions[relativeToObjectHandle - 1]
+        return ret, [float(p) for p in np.asarray(position, dtype=np.float32)]
+
+
+def simxGetObjectOrientation(clientID, objectHandle, relativeToObjectHandle, operationMode):
+    ret = _roundTrip(operationMode, ('orientation', objectHandle, relativeToObjectHandle))
+    if ret != simx_return_ok:
+        return ret, [0.0, 0.0, 0.0]
+    with scene.lock:
+        return ret, [float(a) for a in np.asarray(scene.orientations[objectHandle - 1], dtype=np.float32)]
+
+
+def simxGetObjectGroupData(clientID, objectType, dataType, operationMode):
+    ret, handles, intData, floatData, stringData = simxGetObjectGroupDataNumpy(clientID, objectType, dataType,
+                                                                               operationMode)
+    return ret, handles.tolist(), intData.tolist(), floatData.tolist(), stringData
+
+
+def simxGetObjectGroupDataNumpy(clientID, objectType, dataType, operationMode):
+    ret = _roundTrip(operationMode, ('group', objectType, dataType))
+    handles = np.empty(0, dtype=np.int32)
+    intData = np.empty(0, dtype=np.int32)
+    floatData = np.empty(0, dtype=np.float32)
+    stringData = []
+    if ret == simx_return_ok:
+        with scene.lock:
+            if objectType == sim_object_proximitysensor_type:
+                handles = sorted(scene.proximity_sensors.keys())
+            elif objectType == sim_object_visionsensor_type:
+                handles = sorted(scene.vision_sensors.keys())
+            else:
+                handles = sorted(scene.names.values())
+            handles = np.array(handles, dtype=np.int32)
+            if dataType == 0:
+                by_handle = dict((handle, name) for name, handle in scene.names.items())
+                stringData = [by_handle[handle] for handle in handles]
+            elif dataType == 3:
+                floatData = np.array([scene.positions[handle - 1] for handle in handles], dtype=np.float32).reshape(-1)
+            elif dataType == 5:
+                floatData = np.array([scene.orientations[handle - 1] for handle in handles],
+                                     dtype=np.float32).reshape(-1)
+            elif dataType == 13:
+                distances = [scene.proximity_sensors[handle] for handle in handles]
+                intData = np.array([[0, 0] if distance is None else [1, 0] for distance in distances],
+                                   dtype=np.int32).reshape(-1)
+                floatData = np.array([[0.0] * 6 if distance is None else [0.0, 0.0, distance, 0.0, 0.0, 1.0]
+                                      for distance in distances], dtype=np.float32).reshape(-1)
+    return ret, handles, intData, floatData, stringData
+
+
+def simxGetVisionSensorImage(clientID, sensorHandle, options, operationMode):
+    ret, reso, image = simxGetVisionSensorImageNumpy(clientID, sensorHandle, options, operationMode)
+    # the C buffer holds signed bytes
+    return ret, reso, image.reshape(-1).view(np.int8).tolist()
+
+
+def simxGetVisionSensorImageNumpy(clientID, sensorHandle, options, operationMode):
+    ret = _roundTrip(operationMode, ('image', sensorHandle, options))
+    if ret != simx_return_ok:
+        return ret, [], np.empty((0, 0, 3), dtype=np.uint8)
+    with scene.lock:
+        image = scene.vision_sensors[sensorHandle].copy()
+    return ret, [image.shape[1], image.shape[0]], image
+
+
+def simxReadVisionSensor(clientID, sensorHandle, operationMode):
+    # one aux packet of 15 values: minimum, maximum and average of intensity, red, green, blue and depth
+    ret = _roundTrip(operationMode, ('read vision', sensorHandle))
+    if ret != simx_return_ok:
+        return ret, False, []
+    with scene.lock:
+        rgb = scene.vision_sensors[sensorHandle].reshape(-1, 3) / 255.0
+    values = np.column_stack([rgb.mean(axis=1), rgb, np.ones(len(rgb))])
+    packet = np.concatenate([values.min(axis=0), values.max(axis=0), values.mean(axis=0)]).astype(np.float32)
+    return ret, False, [packet.tolist()]
+
+
+def simxReadProximitySensor(clientID, sensorHandle, operationMode):
+    ret = _roundTrip(operationMode, ('proximity', sensorHandle))
+    with scene.lock:
+        distance = scene.proximity_sensors.get(sensorHandle)
+    if ret != simx_return_ok or distance is None:
+        return ret, False, [0.0, 0.0, 0.0], 0, [0.0, 0.0, 0.0]
+    return ret, True, [0.0, 0.0, float(np.float32(distance))], 0, [0.0, 0.0, 1.0]
+
+
+def simxSetJointTargetVelocity(clientID, jointHandle, targetVelocity, operationMode):
+    with scene.lock:
+        scene.velocities[jointHandle] = targetVelocity
+    return _roundTrip(operationMode, ('velocity', jointHandle))
+
+
+def simxStartSimulation(clientID, operationMode):
+    scene.running = True
+    scene.publish_status()
+    return _roundTrip(operationMode, ('start',))
+
+
+def simxStopSimulation(clientID, operationMode):
+    scene.running = False
+    scene.publish_status()
+    return _roundTrip(operationMode, ('stop',))
+
+
+def simxPauseSimulation(clientID, operationMode):
+    scene.running = False
+    scene.publish_status()
+    return _roundTrip(operationMode, ('pause',))
+
+
+def simxGetIntegerSignal(clientID, signalName, operationMode):
+    if type(signalName) is bytes:
+        signalName = signalName.decode('utf-8')
+    ret = _roundTrip(operationMode, ('integer signal', signalName))
+    if signalName == 'simplus_status' and ret == simx_return_ok and not scene.synchronous:
+        # the scene advances once per status check, like it does for remote_get_sim_status
+        scene.step()
+    with scene.lock:
+        value = scene.integer_signals.get(signalName)
+    if ret != simx_return_ok or value is None:
+        return ret | simx_return_novalue_flag, 0
+    return ret, value
+
+
+def simxSetIntegerSignal(clientID, signalName, signalValue, operationMode):
+    if type(signalName) is bytes:
+        signalName = signalName.decode('utf-8')
+    with scene.lock:
+        scene.integer_signals[signalName] = int(signalValue)
+    return _roundTrip(operationMode, ('set integer signal', signalName))
+
+
+def simxClearIntegerSignal(clientID, signalName, operationMode):
+    if type(signalName) is bytes:
+        signalName = signalName.decode('utf-8')
+    with scene.lock:
+        scene.integer_signals.pop(signalName, None)
+    return _roundTrip(operationMode, ('clear integer signal', signalName))
+
+
+def simxGetStringSignal(clientID, signalName, operationMode):
+    if type(signalName) is bytes:
+        signalName = signalName.decode('utf-8')
+    ret = _roundTrip(operationMode, ('signal', signalName))
+    with scene.lock:
+        value = scene.string_signals.get(signalName)
+    if ret != simx_return_ok or value is None:
+        return ret | simx_return_novalue_flag, bytearray()
+    return ret, bytearray(value)
+
+
+def simxSetStringSignal(clientID, signalName, signalValue, operationMode):
+    if type(signalName) is bytes:
+        signalName = signalName.decode('utf-8')
+    with scene.lock:
+        scene.string_signals[signalName] = bytearray(signalValue)
+    return _roundTrip(operationMode, ('set signal', signalName))
+
+
+def simxClearStringSignal(clientID, signalName, operationMode):
+    if type(signalName) is bytes:
+        signalName = signalName.decode('utf-8')
+    with scene.lock:
+        scene.string_signals.pop(signalName, None)
+    return _roundTrip(operationMode, ('clear signal', signalName))
+
+
+def simxCallScriptFunction(clientID, scriptDescription, options, functionName, inputInts, inputFloats, inputStrings,
+                           inputBuffer, operationMode):
+    if type(scriptDescription) is bytes:
+        scriptDescription = scriptDescription.decode('utf-8')
+    if type(functionName) is bytes:
+        functionName = functionName.decode('utf-8')
+    callback = scene.script_functions.get((scriptDescription, functionName))
+    if callback is None:
+        return simx_return_remote_error_flag, [], [], [], bytearray()
+    reply = callback(list(inputInts), list(inputFloats), list(inputStrings), bytearray(inputBuffer))
+    if operationMode == simx_opmode_oneshot:
+        # a oneshot call does not wait, it returns the reply of the previous identical call if there is one
+        previous = scene.replies.get((scriptDescription, functionName))
+        scene.replies[(scriptDescription, functionName)] = reply
+        if previous is None:
+            return simx_return_novalue_flag, [], [], [], bytearray()
+        return (simx_return_ok,) + tuple(previous)
+    _roundTrip(operationMode, ('script', scriptDescription, functionName))
+    return (simx_return_ok,) + tuple(reply)
+
+
+class PreparedScriptFunction(object):
+    # like vrep.PreparedScriptFunction, calls on one instance wait for each other
+    def __init__(self, scriptDescription, options, functionName, intCount=0, floatCount=0):
+        self.scriptDescription = scriptDescription
+        self.options = options
+        self.functionName = functionName
+        self.intCount = intCount
+        self.floatCount = floatCount
+        self.lock = threading.Lock()
+
+    def clone(self):
+        return PreparedScriptFunction(self.scriptDescription, self.options, self.functionName, self.intCount,
+                                      self.floatCount)
+
+    def __call__(self, clientID, inputInts, inputFloats, inputStrings, inputBuffer, operationMode):
+        with self.lock:
+            return simxCallScriptFunction(clientID, self.scriptDescription, self.options, self.functionName,
+                                          inputInts, inputFloats, inputStrings, inputBuffer, operationMode)
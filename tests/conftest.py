@@ -0,0 +1,76 @@
+import os
+import sys
+
+import pytest
+
+SERVER_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'server')
+
+# the server modules import each other by name and pick the remote API when robotApi is first imported, so
+# the mock has to be selected before any test module imports them
+sys.path.insert(0, SERVER_DIR)
+os.environ['SIMPLUS_REMOTE_API'] = 'mock'
+os.environ.setdefault('PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION', 'python')
+
+
+class FakeScene:
+    # stands in for sceneObjects, with object i at positions[i]
+    def __init__(self, positions):
+        self.positions = positions
+
+    def lookup(self, names):
+        return list(range(len(names))), self.positions
+
+
+@pytest.fixture
+def mock_scene(monkeypatch):
+    # a fresh vrepMock scene with the objects of both config files, and the config files in the working directory
+    import vrepMock
+    monkeypatch.chdir(SERVER_DIR)
+    scene = vrepMock.MockScene()
+    for config_file in ['serverconfig.txt', 'trapconfig.txt']:
+        scene.add_config_objects(config_file)
+    scene.step()
+    vrepMock.configure(new_scene=scene, latency_ms=0)
+    vrepMock.streams.clear()
+    vrepMock.replied.clear()
+    return scene
+
+
+@pytest.fixture
+def vapi(mock_scene):
+    import robotApi
+    return robotApi.VrepApi()
+
+
+class FakeUnaryCall:
+    # a unary stub method: call it to block, or call .future to get the reply on a worker thread like grpc does
+    def __init__(self, respond):
+        self.respond = respond
+        self.executor = None
+
+    def __call__(self, request, timeout=None):
+        return self.respond(request)
+
+    def future(self, request, timeout=None):
+        if self.executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self.executor = ThreadPoolExecutor(max_workers=1)
+        return self.executor.submit(self.respond, request)
+
+
+class FakeStub:
+    # a player that drives forward, turns, and reports a victim at the origin every tenth cycle
+    def __init__(self):
+        import simplus_pb2
+        self.pb = simplus_pb2
+        self.cycle = 0
+        self.observations = []
+        self.Action = FakeUnaryCall(self.action)
+
+    def action(self, observations):
+        self.observations.append(observations)
+        self.cycle += 1
+        pb = self.pb
+        actions = [pb.Action(x=0.0, y=0.0, z=0.0, type='find_victim')] if self.cycle % 10 == 0 else []
+        return pb.Commands(commands=[pb.Command(id=0, linear=0.05, angular=0.1 * (self.cycle % 3 - 1),
+                                                LED=['red', 'green', 'blue', ''][self.cycle % 4], actions=actions)])
@@ -0,0 +1,77 @@
+import robotApi
+import vrepMock
+
+
+def recorder(returnCodes=None):
+    # a send function that records its values and returns the next return code, ok by default
+    sent = []
+    returnCodes = list(returnCodes or [])
+
+    def send(value):
+        sent.append(value)
+        return returnCodes.pop(0) if returnCodes else vrepMock.simx_return_ok
+
+    return send, sent
+
+
+def test_repeated_writes_are_sent_once(mock_scene):
+    actuators = robotApi.actuatorClass(0)
+    send, sent = recorder()
+    for value in [1.0, 1.0, 2.0, 2.0, 1.0]:
+        actuators.write(('joint', 1), value, send)
+    assert sent == [1.0, 2.0, 1.0]
+
+
+def test_batch_keeps_the_last_value_and_pauses_once(mock_scene, monkeypatch):
+    pauses = []
+    monkeypatch.setattr(vrepMock, 'simxPauseCommunication',
+                        lambda clientID, enable: pauses.append(enable) or vrepMock.simx_return_ok)
+    actuators = robotApi.actuatorClass(0)
+    left, left_sent = recorder()
+    right, right_sent = recorder()
+    actuators.begin()
+    actuators.write(('joint', 1), 1.0, left)
+    actuators.write(('joint', 1), 3.0, left)
+    actuators.write(('joint', 2), 2.0, right)
+    assert left_sent == [] and right_sent == []
+    assert actuators.commit() == 2
+    assert left_sent == [3.0] and right_sent == [2.0]
+    assert pauses == [True, False]
+
+
+def test_queued_oneshot_writes_count_as_sent(mock_scene):
+    actuators = robotApi.actuatorClass(0)
+    send, sent = recorder([vrepMock.simx_return_novalue_flag])
+    actuators.write(('led', 1), 21002, send)
+    actuators.write(('led', 1), 21002, send)
+    assert sent == [21002]
+
+
+def test_failed_writes_are_sent_again(mock_scene):
+    actuators = robotApi.actuatorClass(0)
+    send, sent = recorder([vrepMock.simx_return_remote_error_flag,
+                           vrepMock.simx_return_novalue_flag | vrepMock.simx_return_timeout_flag])
+    for i in range(4):
+        actuators.write(('joint', 1), 1.0, send)
+    assert sent == [1.0, 1.0, 1.0]
+
+
+def test_reset_sends_the_next_write(mock_scene):
+    actuators = robotApi.actuatorClass(0)
+    send, sent = recorder()
+    actuators.write(('joint', 1), 1.0, send)
+    actuators.reset()
+    actuators.write(('joint', 1), 1.0, send)
+    assert sent == [1.0, 1.0]
+
+
+def test_simulation_restarts_reset_every_actuator(vapi):
+    ra = vapi.init_robotApi()
+    sa = vapi.init_serverApi()
+    ra.setRobotSpeed(0.05, 0.0)
+    assert ra.actuators.sent
+    sa.stopSimulation()
+    assert not ra.actuators.sent
+    ra.setRobotSpeed(0.05, 0.0)
+    sa.setSynchronous(False)
+    assert not ra.actuators.sent
@@ -0,0 +1,66 @@
+import json
+import os
+
+import pytest
+
+import robotApi
+import vrepMock
+
+
+@pytest.fixture
+def cache_file(mock_scene, tmp_path):
+    return str(tmp_path / 'simplus_cache.json')
+
+
+@pytest.fixture
+def handle_calls(monkeypatch):
+    # names passed to simxGetObjectHandle
+    calls = []
+    get_handle = vrepMock.simxGetObjectHandle
+
+    def counted(clientID, objectName, operationMode):
+        calls.append(objectName)
+        return get_handle(clientID, objectName, operationMode)
+    monkeypatch.setattr(vrepMock, 'simxGetObjectHandle', counted)
+    return calls
+
+
+def start(cache_file):
+    vapi = robotApi.VrepApi(cache_file=cache_file)
+    return vapi, vapi.init_robotApi()
+
+
+def test_cold_cache_keeps_only_the_robot_width(cache_file, handle_calls):
+    vapi, ra = start(cache_file)
+    assert not vapi.cache.hit
+    assert handle_calls == []  # every handle came from the bulk read
+    with open(cache_file) as fp:
+        stored = json.load(fp)
+    assert list(stored["entries"]) == ['width:ePuck_base']
+    assert stored["entries"]['width:ePuck_base'] == ra.robot_width
+
+
+def test_warm_cache_reads_the_width_from_the_file(cache_file, monkeypatch):
+    start(cache_file)
+    monkeypatch.setattr(robotApi.robotApi, '__getRobotWidth__', lambda self: pytest.fail("width measured again"))
+    vapi, ra = start(cache_file)
+    assert vapi.cache.hit
+    assert ra.robot_base == vapi.cache.index['ePuck_base']
+
+
+def test_changed_scene_invalidates_the_cache(cache_file, mock_scene):
+    start(cache_file)
+    mock_scene.add_object('new_victim', (0.5, 0.5, 0.0))
+    vapi, ra = start(cache_file)
+    assert not vapi.cache.hit
+    assert vapi.cache.handle('new_victim') == mock_scene.names['new_victim']
+
+
+def test_unsaved_scene_resolves_handles_without_a_file(cache_file, mock_scene, handle_calls):
+    mock_scene.scene_path = ''
+    vapi, ra = start(cache_file)
+    assert vapi.cache.key is None
+    assert handle_calls == []
+    assert ra.robot_base == mock_scene.names['ePuck_base']
+    vapi.save_cache()
+    assert not os.path.exists(cache_file)
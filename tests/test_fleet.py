@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+import robotApi
+import server
+import simplus_pb2
+import vrepMock
+
+
+@pytest.fixture
+def fleet_scene(mock_scene):
+    # the scene of mock_scene with two robots
+    scene = vrepMock.MockScene(robots=2)
+    for config_file in ['serverconfig.txt', 'trapconfig.txt']:
+        scene.add_config_objects(config_file)
+    scene.step()
+    vrepMock.configure(new_scene=scene)
+    return scene
+
+
+def fleet(snapshot=False):
+    fleet = robotApi.VrepApi().init_robotFleet(2, snapshot=snapshot)
+    fleet.precompute()
+    return fleet
+
+
+def test_fleet_observe_matches_the_robot_reads(vapi, fleet_scene):
+    sensors = fleet()
+    vapi.init_serverApi().get_status()
+    state = sensors.observe()
+    for i, robot in enumerate(sensors.robots):
+        assert np.array_equal(state["camera"][i].ravel(), np.asarray(robot.getCameraImage()[0]).ravel())
+        assert state["colors"][i].tolist() == np.asarray(robot.getColorSensors()).tolist()
+        assert np.allclose(state["pose"][i], robot.getRobotPose())
+        assert np.allclose(state["pose"][i][:3], fleet_scene.positions[fleet_scene.robots[i].base - 1])
+
+
+def test_fleet_snapshot_matches_the_sensor_reads(vapi, fleet_scene):
+    sensors = fleet()
+    snapshots = fleet(snapshot=True)
+    vapi.init_serverApi().get_status()
+    expected = sensors.observe()
+    state = snapshots.observe()
+    assert [robot.snapshot_signal for robot in snapshots.robots] == ['ePuck_snapshot', 'ePuck_snapshot#0']
+    assert not any(robot.sensor_streams for robot in snapshots.robots)
+    assert expected.keys() == state.keys()
+    for key in expected:
+        assert np.allclose(state[key], expected[key]), key
+
+
+def test_commands_for_unknown_robots_are_dropped(vapi, mock_scene, caplog):
+    ra = vapi.init_robotApi()
+    sa = vapi.init_serverApi()
+    ra.precompute()
+    vrepMock.replied.clear()
+    response = simplus_pb2.Commands(commands=[simplus_pb2.Command(id=5, linear=0.05, angular=0.1, LED='red')])
+    assert server.apply_commands(ra, sa, response) == 0
+    assert "ignoring command for robot 5" in caplog.text
+    assert not any(command[0] in ('joint velocity', 'signal') for command in vrepMock.replied)
@@ -0,0 +1,74 @@
+import threading
+import time
+
+import robotApi
+import vrepMock
+
+
+def run_together(*functions):
+    threads = [threading.Thread(target=function) for function in functions]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def test_lanes_do_not_share_prepared_calls(mock_scene):
+    vapi = robotApi.VrepApi(lanes=("control", "scratch"))
+    ra = vapi.init_robotApi()
+    sa = vapi.init_serverApi()
+    scratch_ra = ra.onLane(vapi.lane("scratch"))
+    scratch_sa = sa.onLane(vapi.lane("scratch"))
+    assert scratch_ra.clientID != ra.clientID
+    assert scratch_ra.led_call is not ra.led_call
+    assert scratch_sa.status_call is not sa.status_call and scratch_sa.score_call is not sa.score_call
+
+
+def test_blocking_calls_on_two_lanes_do_not_wait_for_each_other(mock_scene):
+    vapi = robotApi.VrepApi(lanes=("control", "scratch"))
+    sa = vapi.init_serverApi()
+    scratch_sa = sa.onLane(vapi.lane("scratch"))
+    vrepMock.configure(latency_ms=100)
+    try:
+        elapsed = run_together(sa.get_status, scratch_sa.get_status)
+        # both calls share one instance: 200 ms, one after the other
+        shared = run_together(sa.get_status, lambda: sa.status_call(scratch_sa.clientID, [0], [], [], bytearray(),
+                                                                    vrepMock.simx_opmode_blocking))
+    finally:
+        vrepMock.configure(latency_ms=0)
+    assert shared >= 0.2
+    assert elapsed < 0.18
+
+
+def test_scratch_lane_shares_the_game_state(mock_scene, monkeypatch):
+    vapi = robotApi.VrepApi(lanes=("control", "scratch"))
+    ra = vapi.init_robotApi()
+    sa = vapi.init_serverApi()
+    scratch_ra = ra.onLane(vapi.lane("scratch"))
+    scratch_sa = sa.onLane(vapi.lane("scratch"))
+
+    # a victim found over one lane is a duplicate over the other
+    victim = sa.actions_dict['find_victim']
+    x, y, z = victim.objects_distances[0].tolist()
+    assert scratch_sa.callAction('find_victim', x, y, z) == victim.success_score
+    assert sa.callAction('find_victim', x, y, z) == victim.failure_score
+    assert sa.seenObjects('find_victim') == scratch_sa.seenObjects('find_victim')
+
+    # both lanes check the same traps
+    assert scratch_ra.traps_dict is ra.traps_dict
+
+    # a wheel speed written over one lane is not written again over the other
+    writes = []
+    original = vrepMock.simxSetJointTargetVelocity
+
+    def counted(clientID, *args):
+        writes.append(clientID)
+        return original(clientID, *args)
+
+    monkeypatch.setattr(vrepMock, 'simxSetJointTargetVelocity', counted)
+    scratch_ra.setRobotSpeed(0.05, 0.0)
+    ra.setRobotSpeed(0.05, 0.0)
+    ra.setRobotSpeed(0.0, 0.0)
+    assert writes == [scratch_ra.clientID] * 2 + [ra.clientID] * 2
@@ -0,0 +1,81 @@
+import asyncio
+
+import grpc
+import pytest
+
+import robotApi
+import server
+import vrepMock
+from conftest import FakeStub
+
+
+def new_game(mock_scene):
+    # the robots and the game manager of a fresh copy of the scene, so every loop starts from the same state
+    scene = vrepMock.MockScene()
+    for config_file in ['serverconfig.txt', 'trapconfig.txt']:
+        scene.add_config_objects(config_file)
+    scene.step()
+    vrepMock.configure(new_scene=scene)
+    vapi = robotApi.VrepApi(lanes=("control", "scorer"))
+    ra = vapi.init_robotApi()
+    sa = vapi.init_serverApi()
+    ra.precompute()
+    return scene, ra, sa, vapi.init_serverApi(lane="scorer")
+
+
+@pytest.mark.parametrize("synchronous", [False, True])
+@pytest.mark.parametrize("own_lane", [False, True])
+def test_pipelined_totals_match_play(mock_scene, synchronous, own_lane):
+    totals = []
+    for play in [server.play, server.play_pipelined]:
+        scene, ra, sa, scorer = new_game(mock_scene)
+        scorer = scorer if own_lane else None
+        if synchronous:
+            sa.setSynchronous(True)
+        i, team_score = play(ra, sa, FakeStub(), 30, 0, scorer=scorer, synchronous=synchronous)
+        sa.setSynchronous(False)
+        assert i == 29
+        assert scene.scores[0] == str(team_score)
+        totals.append(team_score)
+    assert totals[0] == totals[1] != 0
+
+
+class AsyncStub(FakeStub):
+    # FakeStub behind a grpc.aio style stub, where Action is a coroutine. cycles listed in late miss their deadline
+    def __init__(self, late=()):
+        FakeStub.__init__(self)
+        self.late = set(late)
+        self.Action = self.action_async
+
+    async def action_async(self, observations, timeout=None):
+        reply = self.action(observations)
+        if self.cycle in self.late:
+            raise grpc.aio.AioRpcError(grpc.StatusCode.DEADLINE_EXCEEDED)
+        return reply
+
+
+@pytest.mark.parametrize("synchronous", [False, True])
+def test_async_totals_match_play(mock_scene, synchronous):
+    totals = []
+    for play in [server.play, lambda *args, **kwargs: asyncio.run(server.play_async(*args, **kwargs))]:
+        scene, ra, sa, scorer = new_game(mock_scene)
+        if synchronous:
+            sa.setSynchronous(True)
+        stub = AsyncStub() if play is not server.play else FakeStub()
+        i, team_score = play(ra, sa, stub, 30, 0, scorer=scorer, synchronous=synchronous)
+        sa.setSynchronous(False)
+        assert i == 29
+        assert scene.scores[0] == str(team_score)
+        totals.append(team_score)
+    assert totals[0] == totals[1] != 0
+
+
+def test_late_replies_are_dropped(mock_scene):
+    scene, ra, sa, scorer = new_game(mock_scene)
+    stub = AsyncStub(late=range(1, 31))
+    i, team_score = asyncio.run(server.play_async(ra, sa, stub, 30, 0, scorer=scorer))
+    assert i == 29
+    assert len(stub.observations) == 30
+    # no command went out, so no victim was reported and the robot never moved
+    assert team_score == 0
+    assert ra.actuators.sent == {}
@@ -0,0 +1,87 @@
+import threading
+import urllib.request
+
+import server
+from conftest import FakeStub
+from simplus_metrics import CycleMetrics, Histogram
+
+
+class FakeClock:
+    def __init__(self, step):
+        self.now = 0.0
+        self.step = step
+
+    def __call__(self):
+        self.now += self.step
+        return self.now
+
+
+def test_endpoint_serves_the_histograms():
+    metrics = CycleMetrics(clock=FakeClock(0.0025))
+    for i in range(3):
+        metrics.start()
+        metrics.lap('status')
+        metrics.lap('action')
+        metrics.end()
+    port = metrics.serve(0)
+    try:
+        text = urllib.request.urlopen("http://localhost:%d/metrics" % port).read().decode('utf-8')
+    finally:
+        metrics.shutdown()
+    lines = text.splitlines()
+    assert '# TYPE simplus_cycle_phase_seconds histogram' in lines
+    assert 'simplus_cycle_phase_seconds_bucket{phase="status",le="0.002"} 0' in lines
+    assert 'simplus_cycle_phase_seconds_bucket{phase="status",le="0.003"} 3' in lines
+    assert 'simplus_cycle_phase_seconds_bucket{phase="status",le="+Inf"} 3' in lines
+    assert 'simplus_cycle_phase_seconds_count{phase="status"} 3' in lines
+    assert 'simplus_cycle_phase_seconds_count{phase="step"} 0' in lines
+    assert 'simplus_cycle_seconds_count 3' in lines
+    total = [line for line in lines if line.startswith('simplus_cycle_seconds_sum ')][0]
+    assert abs(float(total.split()[1]) - 3 * 0.0075) < 1e-9
+
+
+def test_scrapes_see_whole_laps():
+    # every lap adds one to a bucket and one to the count, a scrape in between must never see only one of them
+    metrics = CycleMetrics(clock=FakeClock(0.002))
+    done = threading.Event()
+
+    def record():
+        while not done.is_set():
+            metrics.start()
+            metrics.lap('status')
+            metrics.end()
+    thread = threading.Thread(target=record)
+    thread.start()
+    try:
+        for i in range(200):
+            lines = metrics.prometheus().splitlines()
+            buckets = [int(line.split()[1]) for line in lines
+                       if line.startswith('simplus_cycle_phase_seconds_bucket{phase="status",le="+Inf"}')]
+            counts = [int(line.split()[1]) for line in lines
+                      if line.startswith('simplus_cycle_phase_seconds_count{phase="status"}')]
+            assert buckets == counts
+    finally:
+        done.set()
+        thread.join()
+
+
+def test_pipelined_loop_times_the_first_observation(vapi):
+    ra = vapi.init_robotApi()
+    sa = vapi.init_serverApi()
+    ra.precompute()
+    metrics = CycleMetrics()
+    server.play_pipelined(ra, sa, FakeStub(), 5, 0, metrics=metrics)
+    # one cycle before the loop reads the first observation, the others read the next one
+    assert metrics.phases['status'].count == 5
+    assert metrics.phases['camera'].count == 5
+    assert metrics.phases['action'].count == 5
+    assert metrics.cycle.count == 6
+
+
+def test_histogram_buckets():
+    histogram = Histogram(bounds=[0.001, 0.01])
+    for value in [0.0005, 0.001, 0.005, 1.0]:
+        histogram.observe(value)
+    assert histogram.counts == [2, 1, 1]
+    assert histogram.count == 4
+    assert histogram.max == 1.0
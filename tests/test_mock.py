@@ -0,0 +1,28 @@
+import numpy as np
+
+import vrepMock
+
+
+def test_streamed_reads_have_no_value_until_the_first_reply(mock_scene):
+    handle = mock_scene.robots[0].base
+    assert vrepMock.simxGetObjectPosition(0, handle, -1, vrepMock.simx_opmode_buffer)[0] == \
+        vrepMock.simx_return_novalue_flag
+    assert vrepMock.simxGetObjectPosition(0, handle, -1, vrepMock.simx_opmode_streaming)[0] == \
+        vrepMock.simx_return_novalue_flag
+    returnCode, position = vrepMock.simxGetObjectPosition(0, handle, -1, vrepMock.simx_opmode_buffer)
+    assert returnCode == vrepMock.simx_return_ok
+    assert np.allclose(position, mock_scene.positions[handle - 1])
+
+
+def test_oneshot_reads_return_the_previous_reply(mock_scene):
+    call = vrepMock.PreparedScriptFunction('Game_manager', vrepMock.sim_scripttype_childscript,
+                                           'remote_get_sim_status', intCount=1)
+    assert call(0, [0], [], [], bytearray(), vrepMock.simx_opmode_oneshot)[0] == vrepMock.simx_return_novalue_flag
+    assert call(0, [0], [], [], bytearray(), vrepMock.simx_opmode_oneshot)[:2] == (vrepMock.simx_return_ok, [1])
+
+
+def test_the_scene_steps_on_status_checks(mock_scene):
+    steps = mock_scene.step_count
+    vrepMock.simxCallScriptFunction(0, 'Game_manager', vrepMock.sim_scripttype_childscript, 'remote_get_sim_status',
+                                    [0], [], [], bytearray(), vrepMock.simx_opmode_blocking)
+    assert mock_scene.step_count == steps + 1
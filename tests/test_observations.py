@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+import robotApi
+import server
+import vrepMock
+
+
+def test_snapshot_matches_sensor_reads(vapi):
+    ra = vapi.init_robotApi()
+    sa = vapi.init_serverApi()
+    ra.precompute()
+    ra.startSnapshot()
+    sa.get_status()
+    assert server.get_observations(ra, 0, snapshot=True) == server.get_observations(ra, 0)
+
+
+def test_snapshot_parsing(vapi, mock_scene):
+    ra = vapi.init_robotApi(snapshot=True)
+    ra.precompute()
+    state = ra.snapshot()
+    robot = mock_scene.robots[0]
+    assert np.array_equal(state["camera"][0], mock_scene.vision_sensors[robot.camera])
+    assert state["camera"][1:] == [64, 64]
+    assert state["colors"].tolist() == [[255, 255, 255]] * 3
+    expected = [mock_scene.proximity_sensors[handle] for handle in robot.proximity]
+    assert state["detected"].tolist() == [distance is not None for distance in expected]
+    assert np.allclose(state["distances"], [0 if distance is None else distance for distance in expected])
+    assert np.allclose(state["pose"][:3], mock_scene.positions[robot.base - 1])
+
+
+def test_snapshot_mode_streams_only_the_signal(vapi):
+    ra = vapi.init_robotApi(snapshot=True)
+    ra.precompute()
+    assert not ra.sensor_streams
+    assert not any(command[0] in ('image', 'read vision') for command in vrepMock.streams)
+
+
+def test_missing_snapshot_falls_back_to_sensor_reads(vapi, mock_scene, monkeypatch):
+    monkeypatch.setattr(mock_scene, 'publish_snapshot', lambda robot: None)
+    mock_scene.string_signals.clear()
+    ra = vapi.init_robotApi(snapshot=True)
+    sa = vapi.init_serverApi()
+    ra.precompute()
+    assert ra.snapshot() is None
+    assert ra.sensor_streams
+    sa.get_status()
+    assert server.get_observations(ra, 0, snapshot=True) == server.get_observations(ra, 0)
+
+
+def test_robot_copy_reads_its_own_snapshot(mock_scene):
+    scene = vrepMock.MockScene(robots=2)
+    scene.step()
+    vrepMock.configure(new_scene=scene)
+    copy = robotApi.robotApi(0, robot_base='ePuck_base', robot_suffix='#0', snapshot=True)
+    copy.precompute()
+    assert copy.snapshot_signal == 'ePuck_snapshot#0'
+    assert np.allclose(copy.snapshot()["pose"][:3], scene.positions[scene.robots[1].base - 1])
+
+
+def image_streams(ra):
+    # colour sensors of ra whose image is streamed
+    return set(command[1] for command in vrepMock.streams if command[0] == 'image' and command[1] in ra.colorSensors)
+
+
+@pytest.fixture
+def aux_robot(vapi):
+    ra = vapi.init_robotApi(color_sensor={"num": 1, "name": 'lightSensor', "aux": True})
+    sa = vapi.init_serverApi()
+    ra.precompute()
+    sa.get_status()
+    return ra
+
+
+def test_aux_colors_match_the_images(aux_robot, mock_scene):
+    assert image_streams(aux_robot) == set()
+    mock_scene.vision_sensors[aux_robot.colorSensors[1]][:] = [10, 160, 200]
+    aux = aux_robot.getColorSensors()
+    assert image_streams(aux_robot) == set()
+    images = np.array([aux_robot.getColorSensor(i) for i in range(3)])
+    assert aux.tolist() == images.tolist() == [[255, 255, 255], [10, 160, 200], [255, 255, 255]]
+
+
+def test_aux_miss_streams_the_image_until_aux_is_back(aux_robot, monkeypatch):
+    read = vrepMock.simxReadVisionSensor
+    monkeypatch.setattr(vrepMock, 'simxReadVisionSensor',
+                        lambda clientID, handle, operationMode: (vrepMock.simx_return_novalue_flag, False, []))
+    aux_robot.getColorSensors()
+    assert image_streams(aux_robot) == set(aux_robot.colorSensors)
+    assert aux_robot.getColorSensors().tolist() == [[255, 255, 255]] * 3
+    monkeypatch.setattr(vrepMock, 'simxReadVisionSensor', read)
+    assert aux_robot.getColorSensors().tolist() == [[255, 255, 255]] * 3
+    assert image_streams(aux_robot) == set()
+    assert aux_robot.color_image_streams == set()
@@ -0,0 +1,61 @@
+import numpy as np
+
+import server
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def run_cycles(scheduler, clock, durations):
+    starts = []
+    for duration in durations:
+        scheduler.wait()
+        starts.append(clock.now)
+        clock.now += duration
+    return starts
+
+
+def test_short_cycles_wait_for_their_deadline():
+    clock = FakeClock()
+    scheduler = server.CycleScheduler(100, clock=clock, sleep=clock.sleep)
+    starts = run_cycles(scheduler, clock, [0.002] * 5)
+    assert np.allclose(np.diff(starts), 0.01)
+    assert scheduler.skipped == 0
+    assert all(slack > 0 for slack in scheduler.slack)
+
+
+def test_overrun_skips_missed_deadlines():
+    # a 35 ms cycle at 100 Hz misses two deadlines, the next cycle starts at the third one
+    clock = FakeClock()
+    scheduler = server.CycleScheduler(100, clock=clock, sleep=clock.sleep)
+    starts = run_cycles(scheduler, clock, [0.002] * 4 + [0.035] + [0.002] * 5)
+    assert scheduler.skipped == 2
+    assert len([slack for slack in scheduler.slack if slack < 0]) == 1
+    assert np.allclose(np.diff(starts), [0.01] * 4 + [0.035, 0.005] + [0.01] * 3)
+
+
+def test_late_cycle_within_one_period_does_not_skip():
+    clock = FakeClock()
+    scheduler = server.CycleScheduler(100, clock=clock, sleep=clock.sleep)
+    starts = run_cycles(scheduler, clock, [0.002, 0.015, 0.002, 0.002])
+    assert scheduler.skipped == 0
+    assert np.allclose(np.diff(starts), [0.01, 0.015, 0.005])
+
+
+def test_summary():
+    clock = FakeClock()
+    scheduler = server.CycleScheduler(100, clock=clock, sleep=clock.sleep)
+    assert scheduler.summary() == {}
+    run_cycles(scheduler, clock, [0.002] * 4 + [0.035] + [0.002] * 5)
+    summary = scheduler.summary()
+    assert summary["cycles"] == 10 and summary["late"] == 1 and summary["skipped"] == 2
+    assert np.isclose(summary["worst_late_ms"], 25.0)
+    assert np.isclose(summary["period_ms"]["p100"], 35.0)
@@ -0,0 +1,120 @@
+import numpy as np
+
+import robotApi
+from conftest import FakeScene
+
+
+def brute_nearest(positions, point):
+    distances = np.sqrt(((positions - point) ** 2).sum(axis=1))
+    return int(np.argmin(distances)), float(distances.min())
+
+
+def test_nearest_object_matches_brute_force():
+    random = np.random.RandomState(0)
+    positions = random.uniform(-1, 1, (200, 3)) * [1, 1, 0.05]
+    for point in random.uniform(-1, 1, (50, 3)):
+        index, squared_distance = robotApi.nearest_object(positions, *point.tolist())
+        expected_index, expected_distance = brute_nearest(positions, point)
+        assert index == expected_index
+        assert np.isclose(np.sqrt(squared_distance), expected_distance)
+
+
+def test_grid_lookup_matches_brute_force():
+    random = np.random.RandomState(1)
+    for count in [1, 10, 1000]:
+        positions = random.uniform(-1, 1, (count, 3)) * [1, 1, 0.05]
+        grid = robotApi.objectGrid(positions, 0.1)
+        points = random.uniform(-1, 1, (100, 3))
+        # some queries right next to an object, so the in range branch is taken
+        points[:10] = positions[random.randint(count, size=10)] + random.normal(0, 0.03, (10, 3))
+        for point in points:
+            expected_index, expected_distance = brute_nearest(positions, point)
+            expected = (expected_index, expected_distance ** 2) if expected_distance <= 0.1 else (None, None)
+            index, squared_distance = grid.nearest_within(*point.tolist(), radius=0.1)
+            assert index == expected[0]
+            if index is not None:
+                assert np.isclose(squared_distance, expected[1])
+        indices, squared_distances = grid.nearest_within_many(points, 0.1)
+        for point, index, squared_distance in zip(points, indices, squared_distances):
+            expected = grid.nearest_within(*point.tolist(), radius=0.1)
+            assert (index if index >= 0 else None) == expected[0]
+
+
+def test_grid_lookup_with_no_objects():
+    grid = robotApi.objectGrid(np.empty((0, 3)), 0.1)
+    assert grid.nearest_within(0.0, 0.0, 0.0, 0.1) == (None, None)
+
+
+def victims(positions):
+    return robotApi.actionClass(remoteApi=0, action='find_victim', max_range=0.1, success_score=5.0,
+                                failure_score=-1.0, obejcts_names=['victim'] * len(positions),
+                                scene=FakeScene(np.array(positions, dtype=np.float64)))
+
+
+def test_action_scores_an_object_once_per_team():
+    action = victims([[0.0, 0.0, 0.0], [1.0, 0.0, 0.0]])
+    assert action.applyAction(0.01, 0.0, 0.0, team_id=0) == 5.0
+    assert action.applyAction(0.0, 0.01, 0.0, team_id=0) == -1.0
+    assert action.applyAction(0.0, 0.0, 0.0, team_id=1) == 5.0
+    assert action.applyAction(1.0, 0.0, 0.0, team_id=0) == 5.0
+    assert action.seen == {0: {0, 1}, 1: {0}}
+
+
+def test_action_out_of_range_fails():
+    action = victims([[0.0, 0.0, 0.0]])
+    assert action.applyAction(0.5, 0.0, 0.0) == -1.0
+    assert action.seen == {0: set()}
+
+
+def test_server_scores_a_scene_victim_once(vapi, mock_scene):
+    sa = vapi.init_serverApi()
+    victim = sa.actions_dict['find_victim']
+    x, y, z = victim.objects_distances[0].tolist()
+    assert sa.callAction('find_victim', x, y, z) == victim.success_score
+    assert sa.callAction('find_victim', x, y, z) == victim.failure_score
+    assert sa.seenObjects('find_victim') == [victim.obejcts_names[0]]
+    sa.resetSeen()
+    assert sa.callAction('find_victim', x, y, z) == victim.success_score
+
+
+def scalar_trap(activated, positions, point, max_range, bandgap_range, penalty):
+    # the trap check of one robot, one object at a time
+    index, distance = brute_nearest(positions, point)
+    if not activated[0]:
+        if distance <= max_range:
+            activated[0] = True
+            return penalty
+        return 0
+    if distance >= max_range + bandgap_range:
+        activated[0] = False
+    return 0
+
+
+def trap(positions):
+    return robotApi.trapClass(remoteApi=0, trap='black', max_range=0.1, bandgap_range=0.05, penalty=-5.0,
+                              obejcts_names=['object'] * len(positions),
+                              scene=FakeScene(np.array(positions, dtype=np.float64)))
+
+
+def test_trap_hysteresis():
+    t = trap([[0.0, 0.0, 0.0]])
+    path = [0.3, 0.09, 0.0, 0.12, 0.09, 0.16, 0.05]
+    penalties = [t.checkTrap(x, 0.0, 0.0) for x in path]
+    # entered, stays latched inside the band gap, is released beyond it and can be caught again
+    assert penalties == [0, -5.0, 0, 0, 0, 0, -5.0]
+
+
+def test_trap_keeps_one_state_per_robot():
+    random = np.random.RandomState(2)
+    for count, robots in [(10, 1), (10, 4), (500, 4)]:
+        positions = random.uniform(-1, 1, (count, 3)) * [1, 1, 0]
+        t = trap(positions)
+        starts = positions[random.randint(count, size=robots)] + [0.05, 0, 0]
+        paths = starts + np.cumsum(random.normal(0, 0.02, (200, robots, 3)) * [1, 1, 0], axis=0)
+        states = [[False] for r in range(robots)]
+        caught = 0
+        for points in paths:
+            expected = [scalar_trap(states[r], positions, points[r], 0.1, 0.05, -5.0) for r in range(robots)]
+            assert t.checkTraps(points).tolist() == expected
+            caught += sum(1 for penalty in expected if penalty)
+        assert caught >= robots
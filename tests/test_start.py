@@ -0,0 +1,56 @@
+import threading
+import time
+
+import pytest
+
+
+@pytest.fixture
+def status_requests(mock_scene):
+    # the ints of every remote_get_sim_status call. the game only starts on the third start request,
+    # as if the first two were lost
+    requests = []
+
+    def get_sim_status(ints, floats, strings, buffer):
+        requests.append(ints)
+        if requests.count([1]) >= 3:
+            mock_scene.running = True
+        return [1 if mock_scene.running else 0], [], [], bytearray()
+
+    mock_scene.running = False
+    mock_scene.publish_status()
+    mock_scene.add_script_function('Game_manager', 'remote_get_sim_status', get_sim_status)
+    return requests
+
+
+def test_start_request_is_sent_until_the_game_runs(vapi, mock_scene, status_requests):
+    sa = vapi.init_serverApi()
+    sa.waitForStart(start=1)
+    assert mock_scene.running
+    assert status_requests == [[1]] * 3
+
+
+def test_running_game_is_read_from_the_status_signal(vapi, mock_scene, status_requests):
+    sa = vapi.init_serverApi()
+    mock_scene.running = True
+    mock_scene.publish_status()
+    sa.readStatus()  # the first read only starts the stream
+    del status_requests[:]
+    for i in range(5):
+        sa.waitForStart()
+    assert status_requests == []
+
+
+def test_wait_for_start_returns_once_the_game_starts(vapi, mock_scene, status_requests):
+    sa = vapi.init_serverApi()
+
+    def start():
+        mock_scene.running = True
+        mock_scene.publish_status()
+    timer = threading.Timer(0.1, start)
+    began = time.monotonic()
+    timer.start()
+    sa.waitForStart()
+    timer.join()
+    assert time.monotonic() - began >= 0.1
+    # the paused game is polled on the status signal, without script calls
+    assert status_requests == []
@@ -0,0 +1,57 @@
+import logging
+import threading
+
+import server
+import vrepMock
+from conftest import FakeStub
+
+
+def test_lockstep_steps_the_scene_once_per_cycle(vapi, mock_scene):
+    ra = vapi.init_robotApi()
+    sa = vapi.init_serverApi()
+    ra.precompute()
+    assert server.start_synchronous(sa)
+    sa.waitForStart(synchronous=True)
+    steps = mock_scene.step_count
+    try:
+        server.play(ra, sa, FakeStub(), 10, 0, synchronous=True)
+    finally:
+        sa.setSynchronous(False)
+    assert mock_scene.step_count == steps + 10
+
+
+def test_status_checks_do_not_step_a_synchronous_scene(vapi, mock_scene):
+    sa = vapi.init_serverApi()
+    sa.setSynchronous(True)
+    steps = mock_scene.step_count
+    for i in range(5):
+        sa.get_status()
+        sa.isStarted()
+    assert mock_scene.step_count == steps
+
+
+def test_refused_synchronous_mode_falls_back_to_asynchronous(vapi, monkeypatch, caplog):
+    sa = vapi.init_serverApi()
+    monkeypatch.setattr(vrepMock, 'simxSynchronous', lambda clientID, enable: vrepMock.simx_return_remote_error_flag)
+    with caplog.at_level(logging.WARNING):
+        assert not server.start_synchronous(sa)
+    assert "asynchronously" in caplog.text
+
+
+def test_wait_for_start_sleeps_when_steps_fail(vapi, monkeypatch):
+    sa = vapi.init_serverApi()
+    triggers = []
+
+    def trigger(clientID):
+        triggers.append(clientID)
+        return vrepMock.simx_return_remote_error_flag
+
+    monkeypatch.setattr(vrepMock, 'simxSynchronousTrigger', trigger)
+    vrepMock.simxPauseSimulation(sa.clientID, vrepMock.simx_opmode_blocking)
+    sa.get_status()
+    timer = threading.Timer(0.2, vrepMock.simxStartSimulation, (sa.clientID, vrepMock.simx_opmode_blocking))
+    timer.start()
+    sa.waitForStart(synchronous=True)
+    timer.join()
+    # a busy loop would try thousands of steps in 200 ms, the doubling sleep about a dozen
+    assert 0 < len(triggers) < 20
@@ -0,0 +1,38 @@
+import numpy as np
+
+
+def push(mock_scene, handle, offset):
+    mock_scene.positions[handle - 1] += offset
+    return mock_scene.positions[handle - 1].tolist()
+
+
+def test_tracked_victim_scores_where_it_moved(vapi, mock_scene):
+    sa = vapi.init_serverApi(track_objects=True)
+    sa.get_status()
+    victim = sa.actions_dict['find_victim']
+    x, y, z = push(mock_scene, int(victim.objects_handles[0]), [0.5, 0.0, 0.0])
+    assert sa.callAction('find_victim', x, y, z) == victim.success_score
+    assert np.allclose(victim.objects_distances[0], [x, y, z])
+    assert sa.seenObjects('find_victim') == [victim.obejcts_names[0]]
+
+
+def test_untracked_victim_keeps_its_start_position(vapi, mock_scene):
+    sa = vapi.init_serverApi()
+    victim = sa.actions_dict['find_victim']
+    start = victim.objects_distances[0].tolist()
+    push(mock_scene, int(victim.objects_handles[0]), [0.5, 0.0, 0.0])
+    assert sa.callAction('find_victim', *start) == victim.success_score
+    assert victim.objects_distances[0].tolist() == start
+
+
+def test_tracked_trap_catches_the_robot_it_moved_to(vapi, mock_scene):
+    ra = vapi.init_robotApi(track_objects=True)
+    sa = vapi.init_serverApi()
+    ra.precompute()
+    sa.get_status()
+    trap = next(iter(ra.traps_dict.values()))
+    robot = ra.getRobotXYZ()
+    handle = int(trap.objects_handles[0])
+    push(mock_scene, handle, np.array(robot) - mock_scene.positions[handle - 1])
+    assert ra.checkAllTraps() == trap.penalty
+    assert ra.tracker.update() is False  # already refreshed by the check
@@ -0,0 +1,169 @@
+import ctypes as ct
+import struct
+
+import numpy as np
+import pytest
+
+import vrep
+
+
+def fake_vision_sensor(resolution_x, resolution_y):
+    # c_GetVisionSensorImage over a fixed buffer that holds three bytes a pixel, whatever the options say
+    pixels = (ct.c_byte * (resolution_x * resolution_y * 3))()
+    values = np.random.RandomState(0).randint(0, 256, len(pixels), dtype=np.uint8)
+    ct.memmove(pixels, values.tobytes(), len(pixels))
+
+    def c_GetVisionSensorImage(clientID, sensorHandle, resolution, c_image, options, operationMode):
+        resolution[0] = resolution_x
+        resolution[1] = resolution_y
+        c_image._obj.contents = ct.c_byte.from_buffer(pixels)
+        return vrep.simx_return_ok
+
+    return c_GetVisionSensorImage, values
+
+
+@pytest.mark.parametrize("options, bytes_per_pixel", [(0, 3), (1, 1), (2, 3), (3, 1)])
+def test_numpy_image_matches_the_list(monkeypatch, options, bytes_per_pixel):
+    fake, values = fake_vision_sensor(16, 8)
+    monkeypatch.setattr(vrep, 'c_GetVisionSensorImage', fake)
+    ret, reso, image_list = vrep.simxGetVisionSensorImage(0, 0, options, vrep.simx_opmode_buffer)
+    ret_numpy, reso_numpy, image = vrep.simxGetVisionSensorImageNumpy(0, 0, options, vrep.simx_opmode_buffer)
+    assert ret == ret_numpy == vrep.simx_return_ok
+    assert reso == reso_numpy == [16, 8]
+    assert len(image_list) == 16 * 8 * bytes_per_pixel
+    assert image.shape == (8, 16, bytes_per_pixel) and image.dtype == np.uint8
+    assert np.array_equal(image.reshape(-1), np.array(image_list, dtype=np.int8).view(np.uint8))
+    assert np.array_equal(image.reshape(-1), values[:16 * 8 * bytes_per_pixel])
+
+
+def test_numpy_image_is_a_copy(monkeypatch):
+    fake, values = fake_vision_sensor(4, 4)
+    monkeypatch.setattr(vrep, 'c_GetVisionSensorImage', fake)
+    first = vrep.simxGetVisionSensorImageNumpy(0, 0, 0, vrep.simx_opmode_buffer)[2]
+    first[:] = 0
+    second = vrep.simxGetVisionSensorImageNumpy(0, 0, 0, vrep.simx_opmode_buffer)[2]
+    assert np.array_equal(second.reshape(-1), values)
+
+
+def test_failed_read_returns_an_empty_image(monkeypatch):
+    monkeypatch.setattr(vrep, 'c_GetVisionSensorImage', lambda *args: vrep.simx_return_novalue_flag)
+    ret, reso, image = vrep.simxGetVisionSensorImageNumpy(0, 0, 0, vrep.simx_opmode_buffer)
+    assert ret == vrep.simx_return_novalue_flag and reso == [] and image.size == 0
+
+
+def fake_script_function(out_ints, out_floats, out_strings, out_buffer, calls=None):
+    # c_CallScriptFunction that answers with the given outputs and records the decoded inputs of every call
+    c_ints = (ct.c_int * (len(out_ints) + 1))(*out_ints)
+    c_floats = (ct.c_float * (len(out_floats) + 1))(*out_floats)
+    blob = b''.join(a.encode('utf-8') + b'\0' for a in out_strings)
+    c_strings = ct.create_string_buffer(blob, len(blob) + 1)
+    c_buffer = (ct.c_ubyte * (len(out_buffer) + 1))(*out_buffer)
+
+    def c_CallScriptFunction(clientID, scriptDescription, options, functionName, inIntCount, inInts, inFloatCount,
+                             inFloats, inStringCount, inStrings, inBufferSize, inBuffer, intDataC, intDataP,
+                             floatDataC, floatDataP, stringDataC, stringDataP, bufferS, bufferP, operationMode):
+        if calls is not None:
+            strings = bytes(inStrings).split(b'\0')[:inStringCount]
+            calls.append((clientID, scriptDescription, options, functionName, inInts[:inIntCount],
+                          inFloats[:inFloatCount], [s.decode('utf-8') for s in strings],
+                          bytes(bytearray(inBuffer[:inBufferSize])), operationMode))
+        intDataC._obj.value = len(out_ints)
+        intDataP._obj.contents = ct.c_int.from_buffer(c_ints)
+        floatDataC._obj.value = len(out_floats)
+        floatDataP._obj.contents = ct.c_float.from_buffer(c_floats)
+        stringDataC._obj.value = len(out_strings)
+        stringDataP._obj.contents = ct.c_char.from_buffer(c_strings)
+        bufferS._obj.value = len(out_buffer)
+        bufferP._obj.contents = ct.c_ubyte.from_buffer(c_buffer)
+        return vrep.simx_return_ok
+
+    return c_CallScriptFunction
+
+
+@pytest.mark.parametrize("size", [0, 1, 300])
+def test_script_call_decodes_every_output(monkeypatch, size):
+    out_ints = list(range(-size, size, 2))
+    out_floats = [i * 0.25 for i in range(size)]
+    out_strings = ['team_%d' % i for i in range(size)] + (['', u'équipe'] if size else [])
+    out_buffer = (bytes(range(256)) * 2)[:size]
+    monkeypatch.setattr(vrep, 'c_CallScriptFunction',
+                        fake_script_function(out_ints, out_floats, out_strings, out_buffer))
+    ret, ints, floats, strings, buffer = vrep.simxCallScriptFunction(
+        0, 'Game_manager', vrep.sim_scripttype_childscript, 'remote_get_sim_status', [], [], [], bytearray(),
+        vrep.simx_opmode_blocking)
+    assert ret == vrep.simx_return_ok
+    assert ints == out_ints
+    assert floats == out_floats
+    assert strings == out_strings
+    assert buffer == bytearray(out_buffer) and type(buffer) is bytearray
+
+
+def test_prepared_call_matches_script_call(monkeypatch):
+    calls = []
+    monkeypatch.setattr(vrep, 'c_CallScriptFunction',
+                        fake_script_function([7, -3], [0.5], ['a', u'é'], b'\x00\xff', calls))
+    prepared = vrep.PreparedScriptFunction('Game_manager', vrep.sim_scripttype_childscript, 'remote_set_score',
+                                           intCount=1)
+    # inputs that grow, shrink and repeat, so the reused buffers are rewritten and kept
+    for ints, floats, strings, buffer in [([1], [], ['12'], bytearray()), ([1, 2, 3], [0.5, 1.5], ['x', 'yz'], b'ab'),
+                                          ([4], [2.5], ['x', 'yz'], b'ab'), ([], [], [], bytearray()),
+                                          ([5], [], [u'ünï'], bytearray(b'\x01'))]:
+        expected = vrep.simxCallScriptFunction(3, 'Game_manager', vrep.sim_scripttype_childscript,
+                                               'remote_set_score', ints, floats, strings, buffer,
+                                               vrep.simx_opmode_blocking)
+        assert prepared(3, ints, floats, strings, buffer, vrep.simx_opmode_blocking) == expected
+        assert calls[-1] == calls[-2]
+        assert calls[-1][4:8] == (ints, floats, strings, bytes(buffer))
+
+
+def test_prepared_call_clone_has_its_own_buffers(monkeypatch):
+    calls = []
+    monkeypatch.setattr(vrep, 'c_CallScriptFunction', fake_script_function([], [], [], b'', calls))
+    prepared = vrep.PreparedScriptFunction('Game_manager', vrep.sim_scripttype_childscript, 'remote_set_score',
+                                           intCount=1)
+    clone = prepared.clone()
+    assert clone.lock is not prepared.lock and clone.c_inInts is not prepared.c_inInts
+    prepared(0, [1], [], ['a'], bytearray(), vrep.simx_opmode_blocking)
+    clone(1, [2], [], ['b'], bytearray(), vrep.simx_opmode_blocking)
+    assert [call[:6] for call in calls] == [(0, b'Game_manager', vrep.sim_scripttype_childscript,
+                                             b'remote_set_score', [1], []),
+                                            (1, b'Game_manager', vrep.sim_scripttype_childscript,
+                                             b'remote_set_score', [2], [])]
+
+
+def struct_pack(values, fmt):
+    return bytearray(b''.join(struct.pack(fmt, value) for value in values))
+
+
+def struct_unpack(packed, fmt):
+    return [struct.unpack(fmt, bytes(packed[4 * i:4 * (i + 1)]))[0] for i in range(len(packed) // 4)]
+
+
+def test_pack_unpack_round_trip():
+    random = np.random.RandomState(3)
+    ints = random.randint(-2 ** 31, 2 ** 31, 1000).tolist() + [-2 ** 31, 2 ** 31 - 1, 0]
+    floats = random.uniform(-10, 10, 1000).astype(np.float32).tolist() + [0.0, -0.0, float('inf')]
+    packed_ints = vrep.simxPackInts(ints)
+    packed_floats = vrep.simxPackFloats(floats)
+    assert packed_ints == struct_pack(ints, '<i') and type(packed_ints) is bytearray
+    assert packed_floats == struct_pack(floats, '<f') and type(packed_floats) is bytearray
+    assert vrep.simxUnpackInts(packed_ints) == ints
+    assert vrep.simxUnpackFloats(packed_floats) == floats
+    assert vrep.simxPackInts(np.array(ints, dtype=np.int32)) == packed_ints
+    assert vrep.simxPackFloats(np.array(floats, dtype=np.float32)) == packed_floats
+    assert np.array_equal(vrep.simxUnpackIntsNumpy(packed_ints), ints)
+    assert np.array_equal(vrep.simxUnpackFloatsNumpy(packed_floats), floats)
+
+
+def test_pack_unpack_empty():
+    assert vrep.simxPackInts([]) == bytearray() and vrep.simxPackFloats([]) == bytearray()
+    assert vrep.simxUnpackInts(b'') == [] and vrep.simxUnpackFloats(bytearray()) == []
+
+
+@pytest.mark.parametrize("extra", [1, 2, 3])
+def test_unpack_ignores_trailing_bytes(extra):
+    # a partial value at the end is dropped, as the struct based unpacking did
+    packed = vrep.simxPackInts([1, 2, 3]) + bytearray(extra)
+    assert vrep.simxUnpackInts(packed) == struct_unpack(packed, '<i') == [1, 2, 3]
+    assert vrep.simxUnpackFloats(packed) == struct_unpack(packed, '<f')
+    assert len(vrep.simxUnpackIntsNumpy(bytes(extra))) == 0